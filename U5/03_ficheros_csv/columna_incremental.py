@@ -0,0 +1,131 @@
+"""
+columna_incremental: Añadir una columna calculada rehaciendo solo lo que cambia
+Lee la entrada en bloques de filas y guarda en un manifiesto junto a la
+salida la suma de comprobación de cada bloque y dónde quedó en la salida.
+En la siguiente ejecución, los bloques cuya suma no ha cambiado se copian
+tal cual de la salida anterior y solo se recalculan los modificados.
+Si la entrada tiene la misma fecha de modificación y tamaño que la vez
+anterior, se da por no cambiada sin leerla y la salida ni se toca; en otro
+caso se lee entera y se comparan las sumas de los bloques.
+"""
+
+import csv
+import hashlib
+import io
+import json
+import os
+import sys
+
+if __name__ == "__main__":
+    # Ejecutado suelto: escritura_atomica está en la carpeta U5
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from escritura_atomica import abrir_atomico  # noqa: E402
+
+TAM_BLOQUE = 10_000  # Filas por bloque
+
+
+class _SinCambios(Exception):
+    """Descarta la salida nueva: tiene los mismos bloques que la anterior"""
+
+
+def _suma_bloque(filas):
+    resumen = hashlib.blake2b(digest_size=16)
+    for fila in filas:
+        resumen.update("\x1f".join(fila).encode("utf-8"))
+        resumen.update(b"\x1e")
+    return resumen.hexdigest()
+
+
+def _bloques(lector, tam_bloque):
+    bloque = []
+    for fila in lector:
+        bloque.append(fila)
+        if len(bloque) == tam_bloque:
+            yield bloque
+            bloque = []
+    if bloque:
+        yield bloque
+
+
+def _leer_manifiesto(ruta):
+    try:
+        with open(ruta, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+
+
+def agregar_columna(entrada, salida, nombre, funcion, version="1", tam_bloque=TAM_BLOQUE,
+                    delimiter=",", encoding="utf-8"):
+    """
+    Escribe salida = entrada + columna 'nombre' con funcion(fila_dict) y
+    devuelve un informe. Cambia version si cambia lo que calcula funcion.
+    """
+    ruta_manifiesto = salida + ".manifiesto.json"
+    anterior = _leer_manifiesto(ruta_manifiesto)
+    estado = os.stat(entrada)
+    fecha_y_tamano = [estado.st_mtime_ns, estado.st_size]  # No es una suma del contenido
+
+    with open(entrada, "r", newline="", encoding=encoding) as archivo:
+        lector = csv.reader(archivo, delimiter=delimiter)
+        cabecera = next(lector, [])
+        firma = {"cabecera": cabecera, "columna": nombre, "version": version, "tam_bloque": tam_bloque,
+                 "delimiter": delimiter, "encoding": encoding}
+        if (anterior is None or anterior["firma"] != firma or not os.path.exists(salida)
+                or os.path.getsize(salida) != anterior["tamano_salida"]):
+            # Sin manifiesto válido, o la salida se ha modificado por fuera: se rehace entera
+            anterior = {"bloques": []}
+        elif anterior.get("fecha_y_tamano_entrada") == fecha_y_tamano:
+            return {"bloques": len(anterior["bloques"]), "recalculados": 0, "sin_cambios": True}
+
+        # Bloques de la salida anterior que se pueden reutilizar, por suma de comprobación
+        reutilizables = {b["suma"]: (b["inicio"], b["fin"]) for b in anterior["bloques"]}
+        bloques, recalculados = [], 0
+        vieja = open(salida, "rb") if reutilizables else None
+        try:
+            with abrir_atomico(salida, "wb") as nueva:
+                texto = io.StringIO()
+                escritor = csv.writer(texto, delimiter=delimiter)
+                escritor.writerow(cabecera + [nombre])
+                nueva.write(texto.getvalue().encode(encoding))
+
+                for bloque in _bloques(lector, tam_bloque):
+                    suma = _suma_bloque(bloque)
+                    inicio = nueva.tell()
+                    if suma in reutilizables:
+                        desde, hasta = reutilizables[suma]
+                        vieja.seek(desde)
+                        nueva.write(vieja.read(hasta - desde))
+                    else:
+                        texto.seek(0)
+                        texto.truncate()
+                        escritor.writerows(fila + [funcion(dict(zip(cabecera, fila)))] for fila in bloque)
+                        nueva.write(texto.getvalue().encode(encoding))
+                        recalculados += 1
+                    bloques.append({"suma": suma, "inicio": inicio, "fin": nueva.tell()})
+                if vieja is not None:
+                    vieja.close()  # En Windows no se puede sustituir un fichero abierto
+                if recalculados == 0 and [b["suma"] for b in bloques] == [b["suma"] for b in anterior["bloques"]]:
+                    raise _SinCambios  # Mismo contenido: se deja la salida anterior intacta
+            sin_cambios = False
+        except _SinCambios:
+            sin_cambios = True
+        finally:
+            if vieja is not None:
+                vieja.close()
+
+    manifiesto = {"firma": firma, "fecha_y_tamano_entrada": fecha_y_tamano,
+                  "tamano_salida": os.path.getsize(salida), "bloques": bloques}
+    with abrir_atomico(ruta_manifiesto) as f:
+        json.dump(manifiesto, f)
+    return {"bloques": len(bloques), "recalculados": recalculados, "sin_cambios": sin_cambios}
+
+
+if __name__ == "__main__":
+    def media(fila):
+        notas = [float(valor) for campo, valor in fila.items() if campo != "Alumno/a"]
+        return round(sum(notas) / len(notas), 2)
+
+    informe = agregar_columna("notas.csv", "notas_con_media.csv", "Media", media, tam_bloque=5)
+    print(f"✓ 'notas_con_media.csv': {informe}")
@@ -0,0 +1,219 @@
+"""
+columnas_notas: Cargador por columnas de hojas de notas (estilo notas.csv)
+Deduce el tipo de cada columna una sola vez y guarda las numéricas en
+array.array (o en arrays de NumPy si está instalado), de forma compacta.
+Las estadísticas (media por alumno y por asignatura, mínimo, máximo y
+desviación típica) se calculan sobre columnas enteras, sin bucles anidados.
+"""
+
+import csv
+import math
+import operator
+import time
+from array import array
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+FILAS_MUESTRA = 100  # Filas usadas para deducir el tipo de cada columna
+TAM_LOTE = 10_000  # Filas que se convierten de golpe, columna a columna
+
+
+def deducir_tipo(valores):
+    """Devuelve 'q' (entero), 'd' (decimal) o 'str' según los valores de muestra"""
+    tipo = "q"
+    for valor in valores:
+        if valor == "":
+            continue
+        try:
+            int(valor)
+            continue
+        except ValueError:
+            pass
+        try:
+            float(valor)
+            tipo = "d"
+        except ValueError:
+            return "str"
+    return tipo
+
+
+class TablaNotas:
+    """Tabla de notas guardada por columnas"""
+
+    def __init__(self, nombres, columnas, tipos):
+        self.nombres = nombres
+        self.columnas = columnas
+        self.tipos = tipos
+
+    @classmethod
+    def cargar(cls, ruta, delimiter=",", encoding="utf-8"):
+        """Lee el CSV una vez y devuelve la tabla con las columnas ya tipadas"""
+        with open(ruta, "r", newline="", encoding=encoding) as archivo:
+            lector = csv.reader(archivo, delimiter=delimiter)
+            nombres = next(lector)
+            muestra = [fila for _, fila in zip(range(FILAS_MUESTRA), lector)]
+            tipos = [deducir_tipo(valores) for valores in zip(*muestra)] or ["str"] * len(nombres)
+            columnas = [[] if tipo == "str" else array(tipo) for tipo in tipos]
+            cls._anadir_lote(muestra, columnas, tipos)
+            while True:
+                lote = [fila for _, fila in zip(range(TAM_LOTE), lector)]
+                if not lote:
+                    break
+                cls._anadir_lote(lote, columnas, tipos)
+
+        if numpy is not None:
+            columnas = [col if tipo == "str" else numpy.frombuffer(col, dtype=numpy.float64 if tipo == "d" else numpy.int64)
+                        for col, tipo in zip(columnas, tipos)]
+        return cls(nombres, columnas, tipos)
+
+    @classmethod
+    def _anadir_lote(cls, lote, columnas, tipos):
+        """Convierte un lote columna a columna; si algo falla, celda a celda"""
+        for fila in lote:
+            if len(fila) != len(tipos):
+                raise ValueError(f"Fila con {len(fila)} columnas en lugar de {len(tipos)}: {fila}")
+        nuevas = []
+        try:
+            for tipo, valores in zip(tipos, zip(*lote)):
+                if tipo == "str":
+                    nuevas.append(valores)
+                else:
+                    nuevas.append(array(tipo, map(int if tipo == "q" else float, valores)))
+        except ValueError:
+            for fila in lote:
+                cls._anadir_fila(fila, columnas, tipos)
+            return
+        for columna, valores in zip(columnas, nuevas):
+            columna.extend(valores)
+
+    @staticmethod
+    def _anadir_fila(fila, columnas, tipos):
+        for i, valor in enumerate(fila):
+            tipo = tipos[i]
+            if tipo == "str":
+                columnas[i].append(valor)
+            elif valor == "":
+                # Un hueco no cabe en un entero: la columna pasa a decimal con NaN
+                if tipo == "q":
+                    columnas[i] = array("d", columnas[i])
+                    tipos[i] = "d"
+                columnas[i].append(math.nan)
+            elif tipo == "q":
+                try:
+                    columnas[i].append(int(valor))
+                except ValueError:
+                    columnas[i] = array("d", columnas[i])
+                    tipos[i] = "d"
+                    columnas[i].append(float(valor))
+            else:
+                columnas[i].append(float(valor))
+
+    def __len__(self):
+        return len(self.columnas[0]) if self.columnas else 0
+
+    def numericas(self):
+        """Nombres de las columnas numéricas (las asignaturas)"""
+        return [nombre for nombre, tipo in zip(self.nombres, self.tipos) if tipo != "str"]
+
+    def columna(self, nombre):
+        return self.columnas[self.nombres.index(nombre)]
+
+    def _numericas(self):
+        return [col for col, tipo in zip(self.columnas, self.tipos) if tipo != "str"]
+
+    def media_por_fila(self):
+        """Media de cada alumno sobre todas las asignaturas"""
+        columnas = self._numericas()
+        if numpy is not None:
+            return numpy.column_stack(columnas).astype(numpy.float64).mean(axis=1)
+        totales = array("d", map(sum, zip(*columnas)))
+        return array("d", [total / len(columnas) for total in totales])
+
+    def media_por_columna(self):
+        """Media de cada asignatura"""
+        if numpy is not None:
+            return {n: float(self.columna(n).mean()) for n in self.numericas()}
+        return {n: math.fsum(self.columna(n)) / len(self) for n in self.numericas()}
+
+    def minimo(self):
+        if numpy is not None:
+            return {n: float(self.columna(n).min()) for n in self.numericas()}
+        return {n: min(self.columna(n)) for n in self.numericas()}
+
+    def maximo(self):
+        if numpy is not None:
+            return {n: float(self.columna(n).max()) for n in self.numericas()}
+        return {n: max(self.columna(n)) for n in self.numericas()}
+
+    def desviacion(self):
+        """Desviación típica poblacional de cada asignatura"""
+        if numpy is not None:
+            return {n: float(self.columna(n).std()) for n in self.numericas()}
+        resultado = {}
+        for nombre, media in self.media_por_columna().items():
+            col = self.columna(nombre)
+            cuadrados = math.fsum(map(operator.mul, col, col))
+            resultado[nombre] = math.sqrt(max(cuadrados / len(col) - media * media, 0.0))
+        return resultado
+
+
+def media_con_bucle(ruta):
+    """Versión original de notas.py: lista completa y float() celda a celda"""
+    with open(ruta, newline="", encoding="utf-8") as f:
+        notes = list(csv.reader(f, delimiter=","))
+    average = []
+    for i in range(1, len(notes)):
+        sum = 0
+        for j in range(1, len(notes[i])):
+            sum += float(notes[i][j])
+        average.append(round(sum / (len(notes[i]) - 1), 2))
+    return average
+
+
+def comparar_con_bucle(ruta):
+    """Cronometra el bucle original frente al cargador por columnas"""
+    inicio = time.perf_counter()
+    media_con_bucle(ruta)
+    t_bucle = time.perf_counter() - inicio
+
+    inicio = time.perf_counter()
+    tabla = TablaNotas.cargar(ruta)
+    t_carga = time.perf_counter() - inicio
+    inicio = time.perf_counter()
+    tabla.media_por_fila()
+    tabla.media_por_columna()
+    tabla.desviacion()
+    t_calculo = time.perf_counter() - inicio
+
+    print(f"Alumnos: {len(tabla)}  (NumPy: {'sí' if numpy is not None else 'no'})")
+    print(f"  Bucle original (carga + medias):  {t_bucle:.3f} s")
+    print(f"  Por columnas - carga:             {t_carga:.3f} s")
+    print(f"  Por columnas - estadísticas:      {t_calculo:.3f} s")
+
+
+def generar_notas(ruta, alumnos, asignaturas=3):
+    """Crea una hoja de notas aleatoria para las pruebas de rendimiento"""
+    import random
+    with open(ruta, "w", newline="", encoding="utf-8") as f:
+        escritor = csv.writer(f)
+        escritor.writerow(["Alumno/a"] + [f"Evaluación {i + 1}" for i in range(asignaturas)])
+        for n in range(alumnos):
+            escritor.writerow([f"alumno {n}"] + [round(random.uniform(0, 10), 1) for _ in range(asignaturas)])
+
+
+if __name__ == "__main__":
+    import sys
+
+    tabla = TablaNotas.cargar("notas.csv")
+    print(f"Asignaturas: {tabla.numericas()}")
+    print(f"Media por asignatura: {tabla.media_por_columna()}")
+    print(f"Mínimo: {tabla.minimo()}")
+    print(f"Máximo: {tabla.maximo()}")
+    print(f"Desviación típica: {tabla.desviacion()}")
+
+    alumnos = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    generar_notas("notas_grande.csv", alumnos)
+    comparar_con_bucle("notas_grande.csv")
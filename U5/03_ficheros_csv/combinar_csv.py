@@ -0,0 +1,109 @@
+"""
+combinar_csv: Combinación en flujo de N ficheros CSV
+Comprueba que todas las cabeceras tienen las mismas columnas (si están en
+otro orden, reordena cada fila por nombre), puede quitar duplicados por una
+clave y escribe directamente en la salida sin guardar los registros.
+Si las entradas ya vienen ordenadas, las mezcla manteniendo el orden con
+memoria constante (heapq.merge).
+"""
+
+import csv
+import heapq
+import os
+import sys
+from operator import itemgetter
+
+if __name__ == "__main__":
+    # Ejecutado suelto: escritura_atomica está en la carpeta U5
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from escritura_atomica import abrir_atomico  # noqa: E402
+
+
+def leer_cabecera(ruta, delimiter=",", encoding="utf-8"):
+    with open(ruta, "r", newline="", encoding=encoding) as f:
+        return next(csv.reader(f, delimiter=delimiter), [])
+
+
+def _comprobar_cabeceras(rutas, delimiter, encoding):
+    """Devuelve la cabecera común y, para cada fichero, el orden de sus columnas"""
+    if not rutas:
+        raise ValueError("No hay ficheros CSV que combinar")
+    cabecera = leer_cabecera(rutas[0], delimiter, encoding)
+    ordenes = []
+    for ruta in rutas:
+        otra = leer_cabecera(ruta, delimiter, encoding)
+        if sorted(otra) != sorted(cabecera):
+            raise ValueError(f"La cabecera de '{ruta}' {otra} no coincide con {cabecera}")
+        ordenes.append(None if otra == cabecera else [otra.index(campo) for campo in cabecera])
+    return cabecera, ordenes
+
+
+def _filas(ruta, orden, delimiter, encoding):
+    with open(ruta, "r", newline="", encoding=encoding) as f:
+        lector = csv.reader(f, delimiter=delimiter)
+        next(lector, None)
+        if orden is None:
+            yield from lector
+        else:
+            for fila in lector:
+                yield [fila[i] for i in orden]
+
+
+def _getter(cabecera, campos):
+    if isinstance(campos, str):
+        campos = [campos]
+    return itemgetter(*[cabecera.index(campo) for campo in campos])
+
+
+def combinar_csv(rutas, salida, clave=None, ordenado_por=None, delimiter=",", encoding="utf-8"):
+    """
+    Une los CSV de rutas en salida y devuelve un informe con filas escritas y duplicadas.
+    clave: columna(s) para quitar duplicados (se queda la primera aparición).
+    ordenado_por: columna(s) por las que ya están ordenadas las entradas para mezclarlas en orden.
+    """
+    cabecera, ordenes = _comprobar_cabeceras(rutas, delimiter, encoding)
+    flujos = [_filas(ruta, orden, delimiter, encoding) for ruta, orden in zip(rutas, ordenes)]
+
+    if ordenado_por is None:
+        filas = (fila for flujo in flujos for fila in flujo)
+    else:
+        filas = heapq.merge(*flujos, key=_getter(cabecera, ordenado_por))
+
+    obtener_clave = _getter(cabecera, clave) if clave is not None else None
+    # Si la mezcla va ordenada por la misma clave, los duplicados salen seguidos
+    # y basta con recordar la última; si no, hace falta un conjunto de claves vistas
+    consecutivos = clave is not None and ordenado_por is not None and (
+        [clave] if isinstance(clave, str) else list(clave)) == (
+        [ordenado_por] if isinstance(ordenado_por, str) else list(ordenado_por))
+    vistas = set()
+    ultima = object()
+
+    escritas = duplicadas = 0
+    with abrir_atomico(salida, "w", newline="", encoding=encoding) as archivo:
+        escritor = csv.writer(archivo, delimiter=delimiter)
+        escritor.writerow(cabecera)
+        for fila in filas:
+            if obtener_clave is not None:
+                valor = obtener_clave(fila)
+                if consecutivos:
+                    if valor == ultima:
+                        duplicadas += 1
+                        continue
+                    ultima = valor
+                else:
+                    if valor in vistas:
+                        duplicadas += 1
+                        continue
+                    vistas.add(valor)
+            escritor.writerow(fila)
+            escritas += 1
+    return {"ficheros": len(rutas), "escritas": escritas, "duplicadas": duplicadas}
+
+
+if __name__ == "__main__":
+    import glob
+
+    rutas = sys.argv[2:] or sorted(glob.glob("grupo*.csv"))
+    salida = sys.argv[1] if len(sys.argv) > 1 else "todos_grupos.csv"
+    print(combinar_csv(rutas, salida, clave="Nombre"))
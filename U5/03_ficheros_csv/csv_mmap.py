@@ -0,0 +1,158 @@
+"""
+csv_mmap: Lector de CSV sobre mmap con campos sin copiar
+Recorre los bytes del fichero proyectado en memoria buscando delimitadores
+y devuelve filas ligeras que solo guardan las posiciones de cada campo.
+Un campo se decodifica a str únicamente cuando se pide; los números se
+convierten directamente desde los bytes con float().
+"""
+
+import csv
+import mmap
+
+
+class FilaBytes:
+    """Fila de un CSV descrita por las posiciones de sus campos dentro del mmap"""
+
+    __slots__ = ("_vista", "_limites", "_valores", "_encoding")
+
+    def __init__(self, vista, limites, encoding, valores=None):
+        self._vista = vista
+        self._limites = limites  # [inicio0, fin0, inicio1, fin1, ...]
+        self._encoding = encoding
+        self._valores = valores  # Solo en filas con comillas, ya decodificadas
+
+    def __len__(self):
+        if self._valores is not None:
+            return len(self._valores)
+        return len(self._limites) // 2
+
+    def bytes_campo(self, i):
+        """memoryview del campo i, sin copiar (no sobrevive al cierre del lector)"""
+        if self._valores is not None:
+            return memoryview(self._valores[i].encode(self._encoding))
+        return self._vista[self._limites[2 * i]:self._limites[2 * i + 1]]
+
+    def numero(self, i):
+        """Campo i como float, sin pasar por str"""
+        if self._valores is not None:
+            return float(self._valores[i])
+        return float(self.bytes_campo(i))
+
+    def __getitem__(self, i):
+        if self._valores is not None:
+            return self._valores[i]
+        return str(self.bytes_campo(i), self._encoding)
+
+    def lista(self):
+        return [self[i] for i in range(len(self))]
+
+    def __repr__(self):
+        return f"FilaBytes({self.lista()})"
+
+
+class LectorMmap:
+    """
+    Itera las filas de un CSV como FilaBytes. Con columnas=n solo se buscan
+    los delimitadores de las n primeras columnas y el resto de la línea se salta.
+    """
+
+    def __init__(self, ruta, delimiter=",", encoding="utf-8", columnas=None):
+        self.delimitador = delimiter.encode(encoding)
+        self.delimiter = delimiter
+        self.encoding = encoding
+        self.columnas = columnas
+        self._archivo = open(ruta, "rb")
+        try:
+            self._mm = mmap.mmap(self._archivo.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:  # mmap no admite ficheros vacíos
+            self._mm = None
+        self._vista = memoryview(self._mm) if self._mm is not None else memoryview(b"")
+        self.cabecera = None
+        inicio = 3 if self._mm is not None and self._mm[:3] == b"\xef\xbb\xbf" else 0
+        self._posicion = inicio
+        primera = next(iter(self), None)
+        if primera is not None:
+            self.cabecera = primera.lista()
+
+    def __iter__(self):
+        mm, vista, delim = self._mm, self._vista, self.delimitador
+        if mm is None:
+            return
+        tamano = len(mm)
+        n_delim = len(delim)
+        while self._posicion < tamano:
+            inicio = self._posicion
+            fin = mm.find(b"\n", inicio)
+            if fin == -1:
+                fin = tamano
+            if mm.find(b'"', inicio, fin) != -1:
+                fin, fila = self._fila_con_comillas(inicio, fin)
+                self._posicion = fin + 1
+                yield fila
+                continue
+            self._posicion = fin + 1
+            if fin > inicio and mm[fin - 1] == 13:  # \r de los finales \r\n
+                fin -= 1
+            if fin == inicio:
+                continue  # Línea vacía
+
+            limites = []
+            campo = inicio
+            while self.columnas is None or len(limites) < 2 * self.columnas:
+                siguiente = mm.find(delim, campo, fin)
+                if siguiente == -1:
+                    limites.append(campo)
+                    limites.append(fin)
+                    break
+                limites.append(campo)
+                limites.append(siguiente)
+                campo = siguiente + n_delim
+            yield FilaBytes(vista, limites, self.encoding)
+
+    def _fila_con_comillas(self, inicio, fin):
+        """Las filas con comillas (que pueden abarcar varias líneas) se analizan con csv"""
+        mm = self._mm
+        while mm[inicio:fin].count(b'"') % 2 == 1 and fin < len(mm):
+            siguiente = mm.find(b"\n", fin + 1)
+            fin = len(mm) if siguiente == -1 else siguiente
+        texto = mm[inicio:fin].decode(self.encoding)
+        valores = next(csv.reader([texto], delimiter=self.delimiter), [])
+        return fin, FilaBytes(self._vista, None, self.encoding, valores)
+
+    def cerrar(self):
+        self._vista.release()
+        if self._mm is not None:
+            try:
+                self._mm.close()
+            except BufferError:
+                # Quedan vistas de campos vivas: el mmap se cerrará al liberarlas
+                pass
+        self._archivo.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, tipo, valor, traza):
+        self.cerrar()
+
+
+def filtrar_por_minimo(ruta, columna, minimo, delimiter=","):
+    """Genera las filas cuyo campo numérico 'columna' es >= minimo (p. ej. Media >= 7.5)"""
+    with LectorMmap(ruta, delimiter=delimiter) as lector:
+        i = lector.cabecera.index(columna)
+        for fila in lector:
+            if fila.numero(i) >= minimo:
+                yield fila.lista()
+
+
+def primera_columna(ruta, delimiter=","):
+    """Genera solo los valores de la columna 0, sin buscar el resto de delimitadores"""
+    with LectorMmap(ruta, delimiter=delimiter, columnas=1) as lector:
+        for fila in lector:
+            yield fila[0]
+
+
+if __name__ == "__main__":
+    print("Ciudades:", list(primera_columna("ciudades.csv")))
+    for fila in filtrar_por_minimo("notas.csv", "Primera evaluación", 7.5):
+        print(" ", fila)
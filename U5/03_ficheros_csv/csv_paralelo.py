@@ -0,0 +1,136 @@
+"""
+csv_paralelo: Lectura de CSV repartida entre varios procesos
+Divide el fichero en rangos de bytes que empiezan y terminan en un límite
+de registro (teniendo en cuenta los saltos de línea dentro de comillas),
+los analiza en un ProcessPoolExecutor y devuelve los resultados en orden
+o según terminen. Con una función de reducción, el trabajo de la sección 7
+(medias, filtros) se hace dentro de cada proceso y solo viaja el resultado.
+"""
+
+import csv
+import io
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+TAM_BLOQUE = 1024 * 1024  # Bytes leídos de golpe al buscar los límites
+TAM_TROZO_MIN = 4 * 1024 * 1024  # No merece la pena repartir trozos más pequeños
+
+
+def _contar_comillas(archivo, desde, hasta):
+    archivo.seek(desde)
+    total = 0
+    while desde < hasta:
+        bloque = archivo.read(min(TAM_BLOQUE, hasta - desde))
+        if not bloque:
+            break
+        total += bloque.count(b'"')
+        desde += len(bloque)
+    return total
+
+
+def _siguiente_limite(archivo, desde, dentro_de_comillas):
+    """Posición justo después del primer salto de línea que no está entre comillas"""
+    archivo.seek(desde)
+    posicion = desde
+    while True:
+        bloque = archivo.read(TAM_BLOQUE)
+        if not bloque:
+            return posicion
+        inicio = 0
+        while True:
+            salto = bloque.find(b"\n", inicio)
+            if salto == -1:
+                break
+            # Un número impar de comillas antes del salto cambia el estado ("" cuenta doble)
+            if bloque.count(b'"', inicio, salto) % 2 == 1:
+                dentro_de_comillas = not dentro_de_comillas
+            if not dentro_de_comillas:
+                return posicion + salto + 1
+            inicio = salto + 1
+        if bloque.count(b'"', inicio) % 2 == 1:
+            dentro_de_comillas = not dentro_de_comillas
+        posicion += len(bloque)
+
+
+def calcular_rangos(ruta, trozos):
+    """Devuelve la cabecera en bytes y una lista de rangos (inicio, fin) alineados a registros"""
+    tamano = os.path.getsize(ruta)
+    with open(ruta, "rb") as archivo:
+        fin_cabecera = _siguiente_limite(archivo, 0, False)
+        archivo.seek(0)
+        cabecera = archivo.read(fin_cabecera)
+
+        objetivo = max((tamano - fin_cabecera) // max(trozos, 1), TAM_TROZO_MIN)
+        rangos = []
+        inicio = fin_cabecera
+        while inicio < tamano:
+            corte = min(inicio + objetivo, tamano)
+            # inicio es un límite de registro, así que la paridad de las comillas
+            # hasta el corte dice si este cae dentro de un campo entre comillas
+            dentro = _contar_comillas(archivo, inicio, corte) % 2 == 1
+            fin = _siguiente_limite(archivo, corte, dentro)
+            rangos.append((inicio, fin))
+            inicio = fin
+    return cabecera, rangos
+
+
+def _analizar_rango(ruta, inicio, fin, cabecera, reducir, delimiter, encoding):
+    with open(ruta, "rb") as archivo:
+        archivo.seek(inicio)
+        datos = archivo.read(fin - inicio)
+    campos = next(csv.reader(io.StringIO(cabecera.decode(encoding)), delimiter=delimiter))
+    filas = csv.reader(io.StringIO(datos.decode(encoding), newline=""), delimiter=delimiter)
+    if reducir is None:
+        return list(filas)
+    return reducir(campos, filas)
+
+
+def leer_paralelo(ruta, reducir=None, procesos=None, ordenado=True, delimiter=",", encoding="utf-8-sig"):
+    """
+    Genera el resultado de cada trozo: la lista de filas o, si se indica,
+    reducir(campos, filas). reducir debe ser una función de módulo (o un
+    functools.partial de una) para poder enviarse a otro proceso: una lambda no sirve.
+    """
+    procesos = procesos or os.cpu_count() or 1
+    cabecera, rangos = calcular_rangos(ruta, procesos)
+    with ProcessPoolExecutor(max_workers=procesos) as ejecutor:
+        futuros = [ejecutor.submit(_analizar_rango, ruta, inicio, fin, cabecera, reducir, delimiter, encoding)
+                   for inicio, fin in rangos]
+        if ordenado:
+            for futuro in futuros:
+                yield futuro.result()
+        else:
+            for futuro in as_completed(futuros):
+                yield futuro.result()
+
+
+# ─── Reducciones de la sección 7, pensadas para ejecutarse en los procesos ───
+
+def resumen_notas(campos, filas, umbral=7.5):
+    """Cuenta alumnos, suma sus medias y guarda los que llegan al umbral"""
+    n_asignaturas = len(campos) - 1
+    total, suma_medias, aprobados = 0, 0.0, []
+    for fila in filas:
+        media = round(sum(map(float, fila[1:])) / n_asignaturas, 2)
+        total += 1
+        suma_medias += media
+        if media >= umbral:
+            aprobados.append({campos[0]: fila[0], "Media": media})
+    return {"alumnos": total, "suma_medias": suma_medias, "aprobados": aprobados}
+
+
+def combinar_resumenes(resumenes):
+    """Junta los resúmenes parciales de cada proceso"""
+    total = {"alumnos": 0, "suma_medias": 0.0, "aprobados": []}
+    for resumen in resumenes:
+        total["alumnos"] += resumen["alumnos"]
+        total["suma_medias"] += resumen["suma_medias"]
+        total["aprobados"].extend(resumen["aprobados"])
+    total["media_global"] = total["suma_medias"] / total["alumnos"] if total["alumnos"] else 0.0
+    return total
+
+
+if __name__ == "__main__":
+    resumen = combinar_resumenes(leer_paralelo("notas.csv", resumen_notas))
+    print(f"Alumnos: {resumen['alumnos']}  Media global: {resumen['media_global']:.2f}")
+    print(f"Con media >= 7.5: {[a['Alumno/a'] for a in resumen['aprobados']]}")
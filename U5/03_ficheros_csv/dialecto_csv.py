@@ -0,0 +1,154 @@
+"""
+dialecto_csv: Detección de delimitador, comillas, cabecera y codificación
+Analiza solo un prefijo acotado del fichero y guarda el resultado en un
+registro junto al CSV (.dialectos_csv.json), indexado por nombre, fecha de
+modificación y tamaño. Mientras el fichero no cambie, no se vuelve a analizar.
+"""
+
+import codecs
+import csv
+import json
+import os
+import sys
+
+if __name__ == "__main__":
+    # Ejecutado suelto: escritura_atomica está en la carpeta U5
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from escritura_atomica import abrir_atomico  # noqa: E402
+
+TAM_MUESTRA = 64 * 1024  # Bytes que se leen para deducir el dialecto
+DELIMITADORES = ",;\t|"
+NOMBRE_REGISTRO = ".dialectos_csv.json"
+
+
+def detectar_codificacion(muestra):
+    """Deduce la codificación a partir de los primeros bytes"""
+    if muestra.startswith(codecs.BOM_UTF8):
+        return "utf-8-sig"
+    if muestra.startswith((codecs.BOM_UTF16_LE, codecs.BOM_UTF16_BE)):
+        return "utf-16"
+    for codificacion in ("utf-8", "cp1252"):
+        try:
+            # final=False: un carácter cortado al final de la muestra no es un error
+            codecs.getincrementaldecoder(codificacion)().decode(muestra, final=False)
+            return codificacion
+        except UnicodeDecodeError:
+            pass
+    return "latin-1"
+
+
+def analizar(ruta, tam_muestra=TAM_MUESTRA):
+    """Analiza el prefijo del fichero y devuelve un diccionario con el dialecto"""
+    with open(ruta, "rb") as f:
+        muestra = f.read(tam_muestra)
+        completo = len(muestra) < tam_muestra
+    codificacion = detectar_codificacion(muestra)
+    texto = codecs.getincrementaldecoder(codificacion)(errors="replace").decode(muestra, final=completo)
+    if not completo and "\n" in texto:
+        texto = texto[:texto.rindex("\n") + 1]  # Descartar la última línea, que puede estar cortada
+
+    sniffer = csv.Sniffer()
+    try:
+        dialecto = sniffer.sniff(texto, delimiters=DELIMITADORES)
+        delimitador, comillas = dialecto.delimiter, dialecto.quotechar
+        doble, espacio = dialecto.doublequote, dialecto.skipinitialspace
+        if comillas not in texto:
+            doble = True  # Sin comillas en la muestra no hay nada que deducir: valor por defecto de csv
+    except csv.Error:
+        # Sin suficiente muestra: el candidato que más aparece en la primera línea
+        primera = texto.split("\n", 1)[0]
+        delimitador = max(DELIMITADORES, key=primera.count) if any(c in primera for c in DELIMITADORES) else ","
+        comillas, doble, espacio = '"', True, False
+    try:
+        cabecera = sniffer.has_header(texto)
+    except csv.Error:
+        cabecera = False
+
+    return {
+        "encoding": codificacion,
+        "delimiter": delimitador,
+        "quotechar": comillas,
+        "doublequote": doble,
+        "skipinitialspace": espacio,
+        "cabecera": cabecera,
+    }
+
+
+class RegistroDialectos:
+    """Caché de dialectos: en memoria y en un fichero por carpeta"""
+
+    def __init__(self, nombre=NOMBRE_REGISTRO):
+        self.nombre = nombre
+        self._carpetas = {}  # carpeta -> {nombre_fichero: entrada}
+        self._modificadas = set()
+
+    def _entradas(self, carpeta):
+        if carpeta not in self._carpetas:
+            try:
+                with open(os.path.join(carpeta, self.nombre), "r", encoding="utf-8") as f:
+                    self._carpetas[carpeta] = json.load(f)
+            except (FileNotFoundError, json.JSONDecodeError):
+                self._carpetas[carpeta] = {}
+        return self._carpetas[carpeta]
+
+    def dialecto(self, ruta):
+        """Devuelve el dialecto de ruta, analizándolo solo si ha cambiado"""
+        ruta = os.path.abspath(ruta)
+        carpeta, nombre = os.path.split(ruta)
+        estado = os.stat(ruta)
+        entradas = self._entradas(carpeta)
+        entrada = entradas.get(nombre)
+        if entrada and entrada["mtime_ns"] == estado.st_mtime_ns and entrada["tamano"] == estado.st_size:
+            return entrada["dialecto"]
+        dialecto = analizar(ruta)
+        entradas[nombre] = {"mtime_ns": estado.st_mtime_ns, "tamano": estado.st_size, "dialecto": dialecto}
+        self._modificadas.add(carpeta)
+        return dialecto
+
+    def guardar(self):
+        """Escribe los registros de las carpetas con entradas nuevas"""
+        for carpeta in self._modificadas:
+            try:
+                with abrir_atomico(os.path.join(carpeta, self.nombre)) as f:
+                    json.dump(self._carpetas[carpeta], f, ensure_ascii=False, indent=2)
+            except OSError as e:
+                print(f"⚠ No se pudo guardar el registro de dialectos en {carpeta}: {e}")
+        self._modificadas.clear()
+
+
+_registro = RegistroDialectos()
+
+
+def detectar_dialecto(ruta):
+    """Dialecto de ruta usando el registro compartido; si hay que analizarlo, se guarda en el acto"""
+    dialecto = _registro.dialecto(ruta)
+    _registro.guardar()
+    return dialecto
+
+
+def leer_filas(ruta, como_dict=True, campos=None):
+    """
+    Genera las filas con el dialecto detectado. Si el fichero no tiene
+    cabecera y se pide como_dict, se usan los campos indicados (ValueError
+    si no se indican: la primera fila no son nombres de columna).
+    """
+    d = detectar_dialecto(ruta)
+    if como_dict and not d["cabecera"] and campos is None:
+        raise ValueError(f"'{ruta}' no tiene cabecera: indica los campos para leerlo como diccionarios")
+    formato = {k: d[k] for k in ("delimiter", "quotechar", "doublequote", "skipinitialspace")}
+    with open(ruta, "r", newline="", encoding=d["encoding"]) as archivo:
+        if not como_dict:
+            lector = csv.reader(archivo, **formato)
+            if d["cabecera"]:
+                next(lector, None)
+            yield from lector
+        elif d["cabecera"]:
+            yield from csv.DictReader(archivo, **formato)
+        else:
+            yield from csv.DictReader(archivo, fieldnames=campos, **formato)
+
+
+if __name__ == "__main__":
+    for ruta in sys.argv[1:] or ["ciudades.csv", "notas.csv", "patrimonios.csv"]:
+        print(f"{ruta}: {detectar_dialecto(ruta)}")
@@ -0,0 +1,151 @@
+"""
+flujo_csv: Procesamiento de CSV en flujo (memoria constante)
+Encadena las etapas leer → mapear → filtrar → escribir con generadores,
+sin guardar nunca el fichero completo en una lista.
+Cada etapa cuenta sus filas y su tiempo para informar de filas/segundo.
+"""
+
+import csv
+import os
+import sys
+import time
+
+if __name__ == "__main__":
+    # Ejecutado suelto: escritura_atomica está en la carpeta U5
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from escritura_atomica import abrir_atomico  # noqa: E402
+
+TAM_LOTE = 1000  # Filas que se acumulan como máximo antes de escribir
+
+
+class Etapa:
+    """Contador de filas y tiempo de una etapa del flujo"""
+
+    def __init__(self, nombre):
+        self.nombre = nombre
+        self.filas = 0
+        self.segundos = 0.0
+
+    def filas_por_segundo(self):
+        if self.segundos == 0:
+            return 0.0
+        return self.filas / self.segundos
+
+    def __str__(self):
+        return f"{self.nombre:<10} {self.filas:>10} filas  {self.filas_por_segundo():>12.0f} filas/s"
+
+
+def leer_csv(ruta, etapa=None, como_dict=True, delimiter=",", encoding="utf-8"):
+    """Genera las filas del CSV una a una (dict o lista)"""
+    etapa = etapa or Etapa("leer")
+    with open(ruta, "r", newline="", encoding=encoding) as archivo:
+        if como_dict:
+            lector = csv.DictReader(archivo, delimiter=delimiter)
+        else:
+            lector = csv.reader(archivo, delimiter=delimiter)
+        while True:
+            inicio = time.perf_counter()
+            fila = next(lector, None)
+            etapa.segundos += time.perf_counter() - inicio
+            if fila is None:
+                return
+            etapa.filas += 1
+            yield fila
+
+
+def mapear(filas, funcion, etapa=None):
+    """Aplica funcion a cada fila del flujo"""
+    etapa = etapa or Etapa("mapear")
+    for fila in filas:
+        inicio = time.perf_counter()
+        resultado = funcion(fila)
+        etapa.segundos += time.perf_counter() - inicio
+        etapa.filas += 1
+        yield resultado
+
+
+def filtrar(filas, condicion, etapa=None):
+    """Deja pasar solo las filas que cumplen la condición"""
+    etapa = etapa or Etapa("filtrar")
+    for fila in filas:
+        inicio = time.perf_counter()
+        pasa = condicion(fila)
+        etapa.segundos += time.perf_counter() - inicio
+        if pasa:
+            etapa.filas += 1
+            yield fila
+
+
+def escribir_csv(filas, ruta, fieldnames, etapa=None, tam_lote=TAM_LOTE, delimiter=",", encoding="utf-8"):
+    """
+    Escribe el flujo en lotes acotados y devuelve el número de filas escritas.
+    Si el flujo falla a mitad, el fichero anterior queda intacto.
+    """
+    etapa = etapa or Etapa("escribir")
+    with abrir_atomico(ruta, "w", newline="", encoding=encoding) as archivo:
+        escritor = csv.DictWriter(archivo, fieldnames=fieldnames, delimiter=delimiter)
+        escritor.writeheader()
+        lote = []
+        for fila in filas:
+            lote.append(fila)
+            if len(lote) >= tam_lote:
+                _volcar_lote(escritor, lote, etapa)
+                lote = []
+        if lote:
+            _volcar_lote(escritor, lote, etapa)
+    return etapa.filas
+
+
+def _volcar_lote(escritor, lote, etapa):
+    inicio = time.perf_counter()
+    escritor.writerows(lote)
+    etapa.segundos += time.perf_counter() - inicio
+    etapa.filas += len(lote)
+
+
+class FlujoCSV:
+    """Tubería leer → mapear/filtrar → escribir que se ejecuta al llamar a escribir()"""
+
+    def __init__(self, ruta, delimiter=",", encoding="utf-8"):
+        self.etapas = [Etapa("leer")]
+        self.filas = leer_csv(ruta, self.etapas[0], delimiter=delimiter, encoding=encoding)
+
+    def mapear(self, funcion, nombre="mapear"):
+        etapa = Etapa(nombre)
+        self.etapas.append(etapa)
+        self.filas = mapear(self.filas, funcion, etapa)
+        return self
+
+    def filtrar(self, condicion, nombre="filtrar"):
+        etapa = Etapa(nombre)
+        self.etapas.append(etapa)
+        self.filas = filtrar(self.filas, condicion, etapa)
+        return self
+
+    def escribir(self, ruta, fieldnames, tam_lote=TAM_LOTE, delimiter=",", encoding="utf-8"):
+        etapa = Etapa("escribir")
+        self.etapas.append(etapa)
+        return escribir_csv(self.filas, ruta, fieldnames, etapa, tam_lote, delimiter, encoding)
+
+    def __iter__(self):
+        return iter(self.filas)
+
+    def informe(self):
+        """Muestra filas y filas/segundo de cada etapa"""
+        for etapa in self.etapas:
+            print(f"  {etapa}")
+
+
+if __name__ == "__main__":
+    def con_media(fila):
+        notas = [float(valor) for clave, valor in fila.items() if clave != "Alumno/a"]
+        fila["Media"] = round(sum(notas) / len(notas), 2)
+        return fila
+
+    flujo = FlujoCSV("notas.csv").mapear(con_media).filtrar(lambda fila: fila["Media"] >= 5)
+    with open("notas.csv", "r", encoding="utf-8") as f:
+        campos = next(csv.reader(f)) + ["Media"]
+    total = flujo.escribir("notas_aprobados.csv", campos)
+    print(f"✓ {total} alumnos aprobados guardados en 'notas_aprobados.csv'")
+    flujo.informe()
@@ -0,0 +1,193 @@
+"""
+indice_csv: Índice persistente en disco para buscar filas de un CSV por clave
+Guarda junto al CSV un fichero ordenado clave → posición en bytes y un
+pequeño índice de bloques (la primera clave de cada bloque) que cabe en
+memoria. Una búsqueda lee un solo bloque del índice y salta directamente
+a la fila con seek(), sin recorrer el CSV.
+El índice sigue siendo válido si se añaden filas en modo "a": la parte
+añadida se indexa al abrir y se incorpora al fichero con actualizar().
+Al abrir, si el CSV no tiene el tamaño y la fecha de modificación de cuando
+se indexó, se comprueba la suma de unos bloques de la parte indexada (el
+primero, el último y otros repartidos entre ellos), así que abrir tras añadir
+filas no relee todo el fichero. Si esos bloques cambian, se reconstruye el
+índice; un cambio que no toque ninguno no se detecta: tras reescribir el CSV
+a mano, mejor llamar a construir().
+"""
+
+import bisect
+import csv
+import hashlib
+import json
+import os
+import sys
+
+if __name__ == "__main__":
+    # Ejecutado suelto: escritura_atomica está en la carpeta U5
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from escritura_atomica import abrir_atomico  # noqa: E402
+
+TAM_BLOQUE = 256  # Entradas del índice por bloque
+TAM_MUESTRA = 64 * 1024  # Bytes de cada bloque que se suma de la parte indexada
+MUESTRAS = 16  # Bloques que se suman como mucho (con ficheros pequeños, el fichero entero)
+
+
+def registros(archivo, desde):
+    """Genera (posición, bytes) de cada registro; un registro con comillas abiertas sigue en la línea siguiente"""
+    archivo.seek(desde)
+    posicion = desde
+    while True:
+        registro = archivo.readline()
+        if not registro:
+            return
+        while registro.count(b'"') % 2 == 1:
+            siguiente = archivo.readline()
+            if not siguiente:
+                break
+            registro += siguiente
+        yield posicion, registro
+        posicion += len(registro)
+
+
+def _huella(archivo, hasta):
+    """Suma de MUESTRAS bloques repartidos por los primeros hasta bytes, desde el primero hasta el último"""
+    resumen = hashlib.blake2b(digest_size=16)
+    if hasta <= TAM_MUESTRA * MUESTRAS:
+        inicios = range(0, hasta, TAM_MUESTRA)
+    else:
+        paso = (hasta - TAM_MUESTRA) / (MUESTRAS - 1)
+        inicios = [round(n * paso) for n in range(MUESTRAS)]
+    for inicio in inicios:
+        archivo.seek(inicio)
+        resumen.update(archivo.read(min(TAM_MUESTRA, hasta - inicio)))
+    return resumen.hexdigest()
+
+
+class IndiceCSV:
+    """Índice de la columna 'columna' del CSV 'ruta'"""
+
+    def __init__(self, ruta, columna, delimiter=",", encoding="utf-8"):
+        self.ruta = ruta
+        self.columna = columna
+        self.delimiter = delimiter
+        self.encoding = encoding
+        self.ruta_indice = f"{ruta}.{columna}.idx"
+        self.meta = None
+        self._cola = {}  # Claves de las filas añadidas después de construir el índice
+        self.cabecera = None
+
+    def _analizar(self, registro):
+        return next(csv.reader([registro.decode(self.encoding)], delimiter=self.delimiter), [])
+
+    def _leer_cabecera(self, archivo):
+        archivo.seek(0)
+        primero = next(registros(archivo, 0), None)
+        if primero is None:
+            raise ValueError(f"'{self.ruta}' está vacío")
+        self.cabecera = self._analizar(primero[1])
+        if self.cabecera and self.cabecera[0].startswith("\ufeff"):
+            self.cabecera[0] = self.cabecera[0][1:]
+        return primero[0] + len(primero[1])
+
+    def construir(self):
+        """Recorre el CSV entero y escribe el índice ordenado por clave"""
+        with open(self.ruta, "rb") as archivo:
+            inicio = self._leer_cabecera(archivo)
+            i = self.cabecera.index(self.columna)
+            entradas = [(self._analizar(registro)[i], posicion) for posicion, registro in registros(archivo, inicio)
+                        if registro.strip()]
+            tamano = archivo.tell()
+            huella = _huella(archivo, tamano)
+            modificado = os.fstat(archivo.fileno()).st_mtime_ns
+        entradas.sort()
+
+        claves_bloque, posiciones_bloque = [], []
+        with abrir_atomico(self.ruta_indice, "wb") as f:
+            for n, (clave, posicion) in enumerate(entradas):
+                if n % TAM_BLOQUE == 0:
+                    claves_bloque.append(clave)
+                    posiciones_bloque.append(f.tell())
+                f.write(json.dumps([clave, posicion]).encode("ascii") + b"\n")
+            tamano_indice = f.tell()
+        self.meta = {"columna": self.columna, "tamano_indexado": tamano, "modificado": modificado,
+                     "huella": huella, "tamano_indice": tamano_indice,
+                     "entradas": len(entradas), "claves_bloque": claves_bloque,
+                     "posiciones_bloque": posiciones_bloque}
+        with abrir_atomico(self.ruta_indice + ".json") as f:
+            json.dump(self.meta, f, ensure_ascii=False)
+        self._cola = {}
+
+    def abrir(self):
+        """Carga el índice; lo reconstruye si no existe, no cuadra con sus datos o el CSV se ha reescrito"""
+        try:
+            with open(self.ruta_indice + ".json", "r", encoding="utf-8") as f:
+                self.meta = json.load(f)
+            valido = (self.meta.get("columna") == self.columna
+                      and os.path.getsize(self.ruta_indice) == self.meta.get("tamano_indice"))
+        except (OSError, json.JSONDecodeError):
+            valido = False
+        if not valido:
+            self.construir()
+            return self
+
+        with open(self.ruta, "rb") as archivo:
+            self._leer_cabecera(archivo)
+            estado = os.fstat(archivo.fileno())
+            indexado = self.meta["tamano_indexado"]
+            sin_tocar = (estado.st_size, estado.st_mtime_ns) == (indexado, self.meta["modificado"])
+            # Añadir en modo "a" no cambia los bytes ya indexados; cualquier otra escritura sí
+            if not sin_tocar and (estado.st_size < indexado or _huella(archivo, indexado) != self.meta["huella"]):
+                self.construir()
+                return self
+            self._indexar_cola(archivo, indexado)
+        return self
+
+    def _indexar_cola(self, archivo, desde):
+        i = self.cabecera.index(self.columna)
+        self._cola = {}
+        for posicion, registro in registros(archivo, desde):
+            if registro.strip():
+                self._cola.setdefault(self._analizar(registro)[i], []).append(posicion)
+
+    def actualizar(self):
+        """Incorpora al índice las filas añadidas al CSV desde que se construyó"""
+        if self.meta is None:
+            self.abrir()
+        with open(self.ruta, "rb") as archivo:
+            self._indexar_cola(archivo, self.meta["tamano_indexado"])
+        if self._cola:
+            self.construir()
+
+    def posiciones(self, clave):
+        """Posiciones en bytes de las filas con esa clave"""
+        if self.meta is None:
+            self.abrir()
+        encontradas = []
+        claves_bloque = self.meta["claves_bloque"]
+        if claves_bloque:
+            # La clave puede empezar en el bloque anterior al primero cuya clave inicial es >= clave
+            n = max(bisect.bisect_left(claves_bloque, clave) - 1, 0)
+            with open(self.ruta_indice, "rb") as f:
+                f.seek(self.meta["posiciones_bloque"][n])
+                for linea in f:
+                    clave_linea, posicion = json.loads(linea)
+                    if clave_linea > clave:
+                        break
+                    if clave_linea == clave:
+                        encontradas.append(posicion)
+        return encontradas + self._cola.get(clave, [])
+
+    def buscar(self, clave):
+        """Devuelve las filas (como diccionarios) cuya columna vale clave"""
+        filas = []
+        with open(self.ruta, "rb") as archivo:
+            for posicion in self.posiciones(clave):
+                _, registro = next(registros(archivo, posicion))
+                filas.append(dict(zip(self.cabecera, self._analizar(registro))))
+        return filas
+
+
+if __name__ == "__main__":
+    indice = IndiceCSV("ciudades.csv", "Ciudad").abrir()
+    print("Delhi:", indice.buscar("Delhi"))
+    print("Madrid:", indice.buscar("Madrid"))
@@ -20,8 +20,22 @@ necesitas para el examen. Usa Ctrl+F para buscar rápidamente lo que necesites.
 """
 
 import csv
+import os
+import sys
 from csv import reader, writer, DictReader, DictWriter
 
+# Los módulos de escritura segura están en la carpeta U5, compartidos con la sección de JSON
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from columna_incremental import agregar_columna  # noqa: E402
+from combinar_csv import combinar_csv  # noqa: E402
+from dialecto_csv import detectar_dialecto, leer_filas  # noqa: E402
+from escritor_rapido import EscritorRapido  # noqa: E402
+from escritura_atomica import abrir_atomico  # noqa: E402
+from flujo_csv import FlujoCSV  # noqa: E402
+from indice_csv import IndiceCSV  # noqa: E402
+from ordenacion_externa import ordenar_csv  # noqa: E402
+
 # ═══════════════════════════════════════════════════════════════════════════
 # 1. LECTURA BÁSICA CON csv.reader
 # ═══════════════════════════════════════════════════════════════════════════
@@ -113,20 +127,20 @@ except FileNotFoundError:
 # EJEMPLO 2: DictReader SIN cabecera (definir fieldnames manualmente)
 print("\n--- EJEMPLO 2: DictReader con fieldnames manuales ---")
 try:
-    with open("ciudades.csv", "r", encoding="utf-8") as archivo:
+    # Detectar si tiene cabecera (y el delimitador y la codificación) con una
+    # muestra del archivo; el resultado queda en caché mientras el archivo no cambie
+    dialecto = detectar_dialecto("ciudades.csv")
+    
+    with open("ciudades.csv", "r", newline="", encoding=dialecto["encoding"]) as archivo:
         campos = ["Ciudad", "País", "Población (millones)"]
         
-        # Detectar si tiene cabecera
-        primera_linea = archivo.readline().strip()
-        archivo.seek(0)  # Reiniciar posición del archivo
-        
-        if primera_linea.split(",") == campos:
+        if dialecto["cabecera"]:
             # Tiene cabecera
-            lector = DictReader(archivo)
+            lector = DictReader(archivo, delimiter=dialecto["delimiter"])
             print("✓ Archivo CON cabecera detectada")
         else:
             # No tiene cabecera
-            lector = DictReader(archivo, fieldnames=campos)
+            lector = DictReader(archivo, fieldnames=campos, delimiter=dialecto["delimiter"])
             print("✓ Archivo SIN cabecera, usando campos manuales")
         
         print(f"Campos: {lector.fieldnames}")
@@ -227,6 +241,23 @@ try:
 except OSError as e:
     print(f"⚠ Error: {e}")
 
+# EJEMPLO 4: Buscar por clave con un índice en disco (sin recorrer el CSV)
+print("\n--- EJEMPLO 4: Búsqueda con índice ---")
+
+try:
+    # El índice (productos.csv.Producto.idx) se crea la primera vez y sigue
+    # siendo válido tras añadir filas en modo "a" como en el ejemplo anterior
+    indice = IndiceCSV("productos.csv", "Producto").abrir()
+    for producto in ["Monitor", "Webcam", "Altavoz"]:
+        encontrados = indice.buscar(producto)
+        if encontrados:
+            print(f"  {producto}: {encontrados[0]['Precio']} € ({encontrados[0]['Stock']} en stock)")
+        else:
+            print(f"  {producto}: no encontrado")
+    
+except (OSError, ValueError) as e:
+    print(f"⚠ Error: {e}")
+
 print()
 
 # ═══════════════════════════════════════════════════════════════════════════
@@ -304,6 +335,21 @@ try:
 except OSError as e:
     print(f"⚠ Error: {e}")
 
+# EJEMPLO 4: Escritor rápido para exportaciones grandes
+print("\n--- EJEMPLO 4: EscritorRapido (tuplas, dicts o dataclasses) ---")
+
+try:
+    with open("inventario_grande.csv", "w", newline="", encoding="utf-8") as archivo:
+        # Prepara una vez cómo sacar los campos y escribe en bloques grandes
+        with EscritorRapido(archivo, ["ID", "Artículo", "Cantidad"]) as escritor:
+            escritor.writeheader()
+            escritor.writerows((i, f"Artículo {i}", i % 50) for i in range(1, 10001))
+        
+    print("✓ Archivo 'inventario_grande.csv' creado con 10000 filas.")
+    
+except OSError as e:
+    print(f"⚠ Error: {e}")
+
 print()
 
 # ═══════════════════════════════════════════════════════════════════════════
@@ -352,6 +398,17 @@ try:
 except OSError as e:
     print(f"⚠ Error: {e}")
 
+# Leer sin indicar el delimitador: se detecta automáticamente
+print("\n4. Detección automática del delimitador:")
+for nombre in ["datos_tab.tsv", "datos_semicolon.csv", "datos_pipe.csv"]:
+    try:
+        dialecto = detectar_dialecto(nombre)
+        print(f"  {nombre}: delimitador {dialecto['delimiter']!r}, cabecera: {dialecto['cabecera']}")
+        for fila in leer_filas(nombre, como_dict=False):
+            print(f"    {fila}")
+    except OSError as e:
+        print(f"⚠ Error: {e}")
+
 print()
 
 # ═══════════════════════════════════════════════════════════════════════════
@@ -443,30 +500,17 @@ except FileNotFoundError:
 print("\n--- EJEMPLO 2: Filtrar alumnos con media >= 7.5 ---")
 
 try:
-    aprobados = []
-    
-    with open("notas.csv", "r", encoding="utf-8") as archivo:
-        lector = DictReader(archivo)
-        
-        for fila in lector:
-            mate = float(fila['Matemáticas'])
-            fisica = float(fila['Física'])
-            quimica = float(fila['Química'])
-            media = round((mate + fisica + quimica) / 3, 2)
-            
-            if media >= 7.5:
-                aprobados.append({
-                    'Alumno': fila['Alumno'],
-                    'Media': media
-                })
+    def con_media(fila):
+        mate = float(fila['Matemáticas'])
+        fisica = float(fila['Física'])
+        quimica = float(fila['Química'])
+        return {'Alumno': fila['Alumno'], 'Media': round((mate + fisica + quimica) / 3, 2)}
     
-    # Guardar aprobados en nuevo CSV
-    with open("aprobados.csv", "w", newline="", encoding="utf-8") as archivo:
-        escritor = DictWriter(archivo, fieldnames=['Alumno', 'Media'])
-        escritor.writeheader()
-        escritor.writerows(aprobados)
+    # Se lee, calcula, filtra y guarda fila a fila (si algo falla, el anterior queda intacto)
+    flujo = FlujoCSV("notas.csv").mapear(con_media).filtrar(lambda fila: fila['Media'] >= 7.5)
+    total = flujo.escribir("aprobados.csv", fieldnames=['Alumno', 'Media'])
     
-    print(f"✓ {len(aprobados)} alumnos con media >= 7.5 guardados en 'aprobados.csv'")
+    print(f"✓ {total} alumnos con media >= 7.5 guardados en 'aprobados.csv'")
     
 except Exception as e:
     print(f"⚠ Error: {e}")
@@ -475,19 +519,9 @@ except Exception as e:
 print("\n--- EJEMPLO 3: Ordenar por nombre ---")
 
 try:
-    with open("notas.csv", "r", encoding="utf-8") as archivo:
-        lector = DictReader(archivo)
-        alumnos = list(lector)
-    
-    # Ordenar alfabéticamente
-    alumnos_ordenados = sorted(alumnos, key=lambda x: x['Alumno'])
-    
-    # Guardar ordenado
-    with open("notas_ordenadas.csv", "w", newline="", encoding="utf-8") as archivo:
-        fieldnames = ['Alumno', 'Matemáticas', 'Física', 'Química']
-        escritor = DictWriter(archivo, fieldnames=fieldnames)
-        escritor.writeheader()
-        escritor.writerows(alumnos_ordenados)
+    # Ordenación externa: tramos ordenados en disco + mezcla con heapq,
+    # así el fichero puede ser más grande que la memoria disponible
+    ordenar_csv("notas.csv", "notas_ordenadas.csv", claves=['Alumno'])
     
     print("✓ Alumnos ordenados guardados en 'notas_ordenadas.csv'")
     
@@ -509,26 +543,20 @@ print("\n--- EJERCICIO 1: Agregar columna calculada ---")
 
 def agregar_media_notas():
     """Lee notas.csv, calcula media y guarda en notas_con_media.csv"""
+    def media(fila):
+        # Media de todas las asignaturas, sin suponer que son exactamente 3
+        notas = [float(valor) for campo, valor in fila.items() if campo != 'Alumno']
+        return round(sum(notas) / len(notas), 2)
+
     try:
-        with open("notas.csv", "r", encoding="utf-8") as archivo:
-            lector = DictReader(archivo)
-            datos = list(lector)
-        
-        # Agregar columna Media
-        for fila in datos:
-            mate = float(fila['Matemáticas'])
-            fisica = float(fila['Física'])
-            quimica = float(fila['Química'])
-            fila['Media'] = round((mate + fisica + quimica) / 3, 2)
-        
-        # Escribir nuevo CSV
-        with open("notas_con_media.csv", "w", newline="", encoding="utf-8") as archivo:
-            fieldnames = ['Alumno', 'Matemáticas', 'Física', 'Química', 'Media']
-            escritor = DictWriter(archivo, fieldnames=fieldnames)
-            escritor.writeheader()
-            escritor.writerows(datos)
+        # Solo se recalculan los bloques de filas que han cambiado desde la última vez
+        informe = agregar_columna("notas.csv", "notas_con_media.csv", "Media", media)
         
-        print("✓ Archivo 'notas_con_media.csv' creado con columna Media.")
+        if informe["sin_cambios"]:
+            print("✓ 'notas_con_media.csv' ya estaba al día.")
+        else:
+            print(f"✓ Archivo 'notas_con_media.csv' creado con columna Media "
+                  f"({informe['recalculados']} de {informe['bloques']} bloques recalculados).")
         
     except Exception as e:
         print(f"⚠ Error: {e}")
@@ -548,7 +576,8 @@ def exportar_catalogo_productos():
     ]
     
     try:
-        with open("catalogo.csv", "w", newline="", encoding="utf-8") as archivo:
+        # Se escribe en un temporal que sustituye a catalogo.csv al terminar
+        with abrir_atomico("catalogo.csv", "w", newline="", encoding="utf-8") as archivo:
             fieldnames = ["codigo", "nombre", "precio", "stock"]
             escritor = DictWriter(archivo, fieldnames=fieldnames)
             escritor.writeheader()
@@ -576,29 +605,11 @@ def combinar_csvs():
     with open("grupo2.csv", "w", newline="", encoding="utf-8") as f:
         writer(f).writerows(datos2)
     
-    # Combinar
+    # Combinar en flujo: las filas pasan directamente a la salida
     try:
-        combinado = []
-        
-        # Leer primer archivo
-        with open("grupo1.csv", "r", encoding="utf-8") as f:
-            lector = reader(f)
-            cabecera = next(lector)
-            combinado.extend(list(lector))
-        
-        # Leer segundo archivo (sin cabecera)
-        with open("grupo2.csv", "r", encoding="utf-8") as f:
-            lector = reader(f)
-            next(lector)  # Saltar cabecera
-            combinado.extend(list(lector))
-        
-        # Escribir combinado
-        with open("todos_grupos.csv", "w", newline="", encoding="utf-8") as f:
-            escritor = writer(f)
-            escritor.writerow(cabecera)
-            escritor.writerows(combinado)
-        
-        print(f"✓ Archivos combinados: {len(combinado)} registros en 'todos_grupos.csv'.")
+        informe = combinar_csv(["grupo1.csv", "grupo2.csv"], "todos_grupos.csv", clave="Nombre")
+        
+        print(f"✓ Archivos combinados: {informe['escritas']} registros en 'todos_grupos.csv'.")
         
     except Exception as e:
         print(f"⚠ Error: {e}")
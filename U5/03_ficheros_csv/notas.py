@@ -1,45 +1,41 @@
 import csv
 
-notes = ''
-average = []
-
-with open('notas.csv', newline='') as f:
-    data = csv.reader(f, delimiter=',')
-    notes = list(data)
 
+def getData(header, row):
+    for j in range(len(row)):
+        print(header[j] + ': ' + row[j])
+    print('')
 
-#print(notes)
 
-def getData(notes):
-    for i in range(1, len(notes)):
-        for j in range(len(notes[i])):
-            print(notes[0][j] + ': ' + notes[i][j])
-        print('')
+def getAverage(header, row):
+    sum = 0
+    print(header[0] + ': ' + row[0])
+    for j in range(1, len(row)):
+        sum += float(row[j])
+    med = round(sum/(len(row) - 1), 2)
+    print('Media: ' + str(med))
+    return med
 
 
-def getAverage(notes):
-    for i in range(1, len(notes)):
-        sum = 0
-        med = 0
-        print(notes[0][0] + ': ' + notes[i][0])
-        for j in range(1, len(notes[i])):
-            sum += float(notes[i][j])
-            med = round(sum/3, 2)
-        average.append(med)
-        print('Media: ' + str(med))
+#Leemos y escribimos a la vez, fila a fila, sin cargar todo el archivo en una lista.
+#De las medias solo se guardan los totales, no una lista con todas
 
-getData(notes)
-getAverage(notes)
-print(average)
+students = 0
+total = 0
 
+with open('notas.csv', newline='') as f, open('notes.csv', 'w', newline='') as out:
+    data = csv.reader(f, delimiter=',')
+    writer = csv.writer(out, delimiter=',')
 
-#Escribimos en el archivo los datos de media de cada alumno
-
-notes[0].append('Media')
+    header = next(data)
+    writer.writerow(header + ['Media'])
 
-for i in range(1, len(notes)):
-    notes[i].append(average[i-1])
+    for row in data:
+        getData(header, row)
+        med = getAverage(header, row)
+        students += 1
+        total += med
+        writer.writerow(row + [med])
 
-with open('notes.csv', 'w', newline='') as f:
-    writer = csv.writer(f, delimiter=',')
-    writer.writerows(notes)
\ No newline at end of file
+if students > 0:
+    print('Media de la clase: ' + str(round(total/students, 2)) + ' (' + str(students) + ' alumnos)')
@@ -0,0 +1,103 @@
+"""
+ordenacion_externa: Ordenación de CSV más grandes que la memoria
+Divide la entrada en tramos ordenados que se guardan en disco y después
+los mezcla con heapq.merge (mezcla de k vías).
+La ordenación es estable: a igual clave se respeta el orden de entrada.
+"""
+
+import csv
+import heapq
+import os
+import sys
+import tempfile
+
+if __name__ == "__main__":
+    # Ejecutado suelto: escritura_atomica está en la carpeta U5
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from escritura_atomica import abrir_atomico  # noqa: E402
+
+MEMORIA_MAX = 64 * 1024 * 1024  # Bytes aproximados de filas en memoria por tramo
+MAX_TRAMOS_ABIERTOS = 64  # Tramos que se mezclan a la vez como máximo
+
+
+def funcion_clave(cabecera, claves):
+    """Convierte ["Alumno", ("Media", float)] en una función que devuelve la tupla de orden"""
+    indices = []
+    for clave in claves:
+        nombre, tipo = clave if isinstance(clave, tuple) else (clave, str)
+        indices.append((cabecera.index(nombre), tipo))
+    return lambda fila: tuple(tipo(fila[i]) for i, tipo in indices)
+
+
+def _tam_fila(fila):
+    return sys.getsizeof(fila) + sum(sys.getsizeof(campo) for campo in fila)
+
+
+def _guardar_tramo(filas, carpeta, delimiter):
+    descriptor, ruta = tempfile.mkstemp(suffix=".csv", dir=carpeta)
+    with open(descriptor, "w", newline="", encoding="utf-8") as f:
+        csv.writer(f, delimiter=delimiter).writerows(filas)
+    return ruta
+
+
+def _leer_tramo(ruta, delimiter):
+    with open(ruta, "r", newline="", encoding="utf-8") as f:
+        yield from csv.reader(f, delimiter=delimiter)
+
+
+def _mezclar(rutas, clave, inverso, delimiter):
+    # heapq.merge es estable entre iterables: a igual clave saca antes el tramo anterior
+    tramos = [_leer_tramo(ruta, delimiter) for ruta in rutas]
+    return heapq.merge(*tramos, key=clave, reverse=inverso)
+
+
+def ordenar_csv(entrada, salida, claves, inverso=False, memoria_max=MEMORIA_MAX,
+                delimiter=",", encoding="utf-8"):
+    """Ordena entrada por las columnas de claves y escribe el resultado en salida"""
+    with tempfile.TemporaryDirectory(dir=os.path.dirname(os.path.abspath(salida))) as carpeta:
+        tramos = []
+        with open(entrada, "r", newline="", encoding=encoding) as archivo:
+            lector = csv.reader(archivo, delimiter=delimiter)
+            cabecera = next(lector)
+            clave = funcion_clave(cabecera, claves)
+
+            filas, ocupado = [], 0
+            for fila in lector:
+                filas.append(fila)
+                ocupado += _tam_fila(fila)
+                if ocupado >= memoria_max:
+                    filas.sort(key=clave, reverse=inverso)
+                    tramos.append(_guardar_tramo(filas, carpeta, delimiter))
+                    filas, ocupado = [], 0
+
+        # Si todo cabe en memoria no hace falta pasar por disco
+        if not tramos:
+            filas.sort(key=clave, reverse=inverso)
+            ordenadas = filas
+        else:
+            if filas:
+                filas.sort(key=clave, reverse=inverso)
+                tramos.append(_guardar_tramo(filas, carpeta, delimiter))
+            del filas
+            # Mezclas intermedias para no abrir demasiados ficheros a la vez
+            while len(tramos) > MAX_TRAMOS_ABIERTOS:
+                grupos = [tramos[i:i + MAX_TRAMOS_ABIERTOS] for i in range(0, len(tramos), MAX_TRAMOS_ABIERTOS)]
+                tramos = []
+                for grupo in grupos:
+                    tramos.append(_guardar_tramo(_mezclar(grupo, clave, inverso, delimiter), carpeta, delimiter))
+                    for ruta in grupo:
+                        os.remove(ruta)
+            ordenadas = _mezclar(tramos, clave, inverso, delimiter)
+
+        with abrir_atomico(salida, "w", newline="", encoding=encoding) as archivo:
+            escritor = csv.writer(archivo, delimiter=delimiter)
+            escritor.writerow(cabecera)
+            escritor.writerows(ordenadas)
+        return len(tramos)
+
+
+if __name__ == "__main__":
+    tramos = ordenar_csv("notas.csv", "notas_ordenadas.csv",
+                         [("Primera evaluación", float), "Alumno/a"], inverso=True, memoria_max=2048)
+    print(f"✓ 'notas_ordenadas.csv' creado mezclando {tramos} tramos.")
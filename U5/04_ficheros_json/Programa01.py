@@ -6,16 +6,20 @@ Controla posibles errores con try/except.
 
 import json
 
+from esquema_json import PAIS, cargar_registros
+
 try:
-    with open("paises.json", "r", encoding="utf-8") as archivo:
-        paises = json.load(archivo)
-        for pais in paises:
-            print(
-                f"{pais['nombre']} está en {pais['continente']} y tiene {pais['poblacion']} millones de habitantes."
-            )
+    # Cada país se lee cuando se necesita, sin cargar el array completo, y se
+    # comprueba que tiene los campos y tipos del esquema PAIS
+    for pais in cargar_registros("paises.json", PAIS):
+        print(
+            f"{pais.nombre} está en {pais.continente} y tiene {pais.poblacion} millones de habitantes."
+        )
 except FileNotFoundError:
     print("Error: El archivo 'paises.json' no se encuentra.")
 except json.JSONDecodeError:
     print("Error: El archivo contiene un JSON inválido.")
+except ValueError as e:
+    print("Error: Un país no cumple el esquema:", e)
 except Exception as e:
     print("Ocurrió un error:", e)
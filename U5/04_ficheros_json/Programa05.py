@@ -1,27 +1,34 @@
 import json
+import os
+import sys
 
-try:
-    with open("paises.json", "r", encoding="utf-8") as f:
-        paises = json.load(f)
+from json_flujo import EscritorArrayJSON, leer_array_json
+
+# abrir_atomico está en la carpeta U5, compartido con la sección de CSV
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from escritura_atomica import abrir_atomico  # noqa: E402
 
+try:
     continente = input("Introduce un continente: ").strip()
 
-    filtrados = []
+    # Leemos país a país y guardamos los que coinciden según aparecen,
+    # sin cargar todo paises.json en memoria. Si paises.json está mal a mitad,
+    # el paises_filtrados.json anterior no se toca
+    with open("paises.json", "r", encoding="utf-8") as f, \
+         abrir_atomico("paises_filtrados.json") as salida:
+        escritor = EscritorArrayJSON(salida, ensure_ascii=False, indent=4)
 
-    for pais in paises:
-        if pais["continente"].lower() == continente.lower():
-            filtrados.append(pais)
+        for pais in leer_array_json(f):
+            if pais["continente"].lower() == continente.lower():
+                if escritor.escritos == 0:
+                    print("\nPaíses encontrados:")
+                print(f"- {pais['nombre']} ({pais['poblacion']} millones)")
+                escritor.escribir(pais)
 
-    if filtrados:
-        print("\nPaíses encontrados:")
-        for p in filtrados:
-            print(f"- {p['nombre']} ({p['poblacion']} millones)")
-    else:
-        print("No se encontraron países en ese continente.")
+        escritor.cerrar()
 
-    # Guardamos los resultados en un nuevo archivo JSON
-    with open("paises_filtrados.json", "w", encoding="utf-8") as f:
-        json.dump(filtrados, f, ensure_ascii=False, indent=4)
+    if escritor.escritos == 0:
+        print("No se encontraron países en ese continente.")
 
     print("\nArchivo 'paises_filtrados.json' creado correctamente.")
 
@@ -0,0 +1,153 @@
+"""
+almacen_catalogo: Catálogo de productos con acceso por id y actualizaciones en O(1)
+Carga catalogo.json una vez en un diccionario id → producto. Cada cambio se
+apunta como una línea en un diario JSON Lines, sin reescribir el catálogo.
+Cada cierto número de operaciones (y al cerrar) se vuelca una instantánea
+en catalogo.json con el formato de siempre y el diario se vacía. Varias
+actualizaciones pueden ir en una transacción: o se aplican todas o ninguna.
+Varios procesos pueden usar el mismo catálogo: el diario es compartido y
+cada uno aplica, en orden, las líneas que han añadido los demás antes de
+leer o de apuntar un cambio. La instantánea se hace con el bloqueo
+exclusivo y a partir del fichero y el diario releídos, no de la copia en
+memoria, así que no se pierden los cambios de otros procesos.
+"""
+
+import os
+import sys
+from contextlib import contextmanager
+
+if __name__ == "__main__":
+    # Ejecutado suelto: escritura_atomica está en la carpeta U5
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from codec_json import cargar, volcar  # noqa: E402
+from escritura_atomica import abrir_atomico, bloqueo, huella  # noqa: E402
+from json_lineas import FSYNC_LOTE, AlmacenJSONL  # noqa: E402
+
+OPERACIONES_POR_INSTANTANEA = 1000
+
+
+class AlmacenCatalogo:
+    """Catálogo indexado por id, persistido como catalogo.json + diario de cambios"""
+
+    def __init__(self, ruta="catalogo.json", ruta_diario=None, cada=OPERACIONES_POR_INSTANTANEA, fsync=FSYNC_LOTE):
+        self.ruta = ruta
+        self.ruta_diario = ruta_diario or os.path.splitext(ruta)[0] + ".diario.jsonl"
+        self.cada = cada
+        self.diario = AlmacenJSONL(self.ruta_diario, fsync=fsync)
+        self._transaccion = None
+        with bloqueo(self.ruta, compartido=True):
+            self._leer()
+
+    def _leer(self):
+        """Carga la instantánea y le aplica el diario; hay que tener el bloqueo"""
+        with open(self.ruta, "r", encoding="utf-8") as f:
+            self.catalogo = cargar(f)
+        self.productos = {producto["id"]: producto for producto in self.catalogo["productos"]}
+        self.base = huella(self.ruta)
+        self.pendientes = 0  # Operaciones en el diario desde la última instantánea
+        self.leido = 0  # Bytes del diario ya aplicados
+        self._ponerse_al_dia()
+
+    def _ponerse_al_dia(self):
+        """Aplica las líneas del diario añadidas desde la última lectura (propias o de otros procesos)"""
+        for fin, entrada in self.diario.leer_desde(self.leido):
+            # Las entradas de antes de la última instantánea ya están en el fichero
+            if entrada["base"] == self.base:
+                self._aplicar(entrada["cambios"])
+                self.pendientes += 1
+            self.leido = fin
+
+    def _sincronizar(self):
+        """Deja la memoria como el fichero + el diario; hay que tener el bloqueo"""
+        if huella(self.ruta) != self.base:
+            self._leer()  # Otro proceso ha hecho una instantánea
+        else:
+            self._ponerse_al_dia()
+
+    def _aplicar(self, cambios):
+        for producto_id, campos in cambios:
+            self.productos[producto_id].update(campos)
+
+    def obtener(self, producto_id):
+        with bloqueo(self.ruta, compartido=True):
+            self._sincronizar()
+        return self.productos[producto_id]
+
+    def actualizar(self, producto_id, **campos):
+        """Cambia campos de un producto y lo devuelve ya cambiado; KeyError si el id no existe"""
+        if producto_id not in self.productos:
+            raise KeyError(f"Producto con ID '{producto_id}' no encontrado")
+        cambio = [producto_id, campos]
+        if self._transaccion is None:
+            self._registrar([cambio])
+            return self.productos[producto_id]
+        # En una transacción el cambio aún no está en memoria: se devuelve una copia con
+        # los cambios pendientes de este producto aplicados
+        self._transaccion.append(cambio)
+        producto = dict(self.productos[producto_id])
+        for otro_id, otros_campos in self._transaccion:
+            if otro_id == producto_id:
+                producto.update(otros_campos)
+        return producto
+
+    def actualizar_stock(self, producto_id, nuevo_stock):
+        return self.actualizar(producto_id, stock=nuevo_stock, disponible=nuevo_stock > 0)
+
+    def _registrar(self, cambios):
+        # Con el bloqueo compartido nadie hace una instantánea, así que la base no cambia
+        # entre comprobarla y apuntar la línea; los cambios llegan a la memoria al releer el diario
+        with bloqueo(self.ruta, compartido=True):
+            self._sincronizar()
+            self.diario.anadir_lote([{"base": self.base, "cambios": cambios}])
+            self._ponerse_al_dia()
+        if self.pendientes >= self.cada:
+            self.instantanea()
+
+    @contextmanager
+    def transaccion(self):
+        """Agrupa varias actualizaciones: se guardan todas juntas al salir sin errores"""
+        if self._transaccion is not None:
+            raise RuntimeError("Ya hay una transacción en curso")
+        self._transaccion = []
+        try:
+            yield self
+            cambios = self._transaccion
+        finally:
+            self._transaccion = None
+        if cambios:
+            self._registrar(cambios)
+
+    def instantanea(self):
+        """Escribe catalogo.json completo (fichero temporal + rename) y vacía el diario"""
+        with bloqueo(self.ruta):
+            self._leer()  # Lo que hay en disco, con los cambios de todos los procesos
+            self.catalogo["productos"] = list(self.productos.values())
+            with abrir_atomico(self.ruta) as f:
+                volcar(self.catalogo, f, ensure_ascii=False, indent=2)
+            # Si se corta aquí, el diario lleva la huella antigua y se ignora al cargar
+            self.base = huella(self.ruta)
+            self.diario.cerrar()
+            with abrir_atomico(self.ruta_diario, "wb"):
+                pass  # Diario vacío; los demás procesos reabren el fichero al ver que cambió el inodo
+            self.pendientes = self.leido = 0
+
+    def cerrar(self):
+        if self.pendientes:
+            self.instantanea()
+        self.diario.cerrar()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, tipo, valor, traza):
+        self.cerrar()
+
+
+if __name__ == "__main__":
+    with AlmacenCatalogo("catalogo.json") as catalogo:
+        with catalogo.transaccion():
+            catalogo.actualizar_stock("P001", 14)
+            catalogo.actualizar_stock("P002", 49)
+        for producto in catalogo.productos.values():
+            print(f"{producto['id']}: {producto['nombre']} - stock {producto['stock']}")
@@ -0,0 +1,166 @@
+"""
+codec_json: cargar/volcar JSON con el motor más rápido disponible
+Mismas funciones y opciones que json.load/dump/loads/dumps. Si orjson está
+instalado se usa cuando puede dar el mismo resultado (ensure_ascii=False,
+indent None con separadores compactos o indent=2); en cualquier otro caso,
+o si orjson no acepta los datos, se usa el módulo json estándar.
+Antes de usar orjson se comprueba que los datos solo tienen tipos de JSON
+(dict con claves str, list, tuple, str, int, float finito, bool y None, sin
+subclases): orjson escribiría datetime, UUID, dataclasses o Enum que json
+rechaza con TypeError, y NaN/Infinity como null. Con cualquiera de ellos se
+usa json, así que el resultado (o el error) no depende de tener orjson.
+Diferencia que queda: los floats con exponente se escriben 1e16 y 1e-7 en
+vez de 1e+16 y 1e-07 (mismo valor al leerlos).
+"""
+
+import json
+
+try:
+    import orjson
+except ImportError:  # Sin orjson todo funciona igual con json
+    orjson = None
+
+SEPARADORES_COMPACTOS = (",", ":")
+# Tipos que orjson escribe por su cuenta y json no: que vayan a default
+PASAR_A_DEFAULT = 0 if orjson is None else (
+    orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_DATACLASS | orjson.OPT_PASSTHROUGH_SUBCLASS)
+
+
+def _opciones_orjson(ensure_ascii, indent, sort_keys, separators):
+    """Opciones de orjson equivalentes, o None si orjson no puede dar la misma salida"""
+    if orjson is None or ensure_ascii:  # orjson siempre escribe UTF-8 sin escapar
+        return None
+    if indent is None:
+        if tuple(separators or ()) != SEPARADORES_COMPACTOS:  # json usa ", " y ": " por defecto
+            return None
+        opciones = PASAR_A_DEFAULT
+    elif indent == 2 and separators in (None, (",", ": ")):
+        opciones = orjson.OPT_INDENT_2 | PASAR_A_DEFAULT
+    else:
+        return None
+    if sort_keys:
+        opciones |= orjson.OPT_SORT_KEYS
+    return opciones
+
+
+_ESCALARES = {str, int, bool, type(None)}
+
+
+def _solo_json(obj):
+    """True si obj solo tiene tipos que json y orjson escriben igual"""
+    tipo = type(obj)
+    if tipo is dict:
+        if not all(type(clave) is str for clave in obj):
+            return False
+        valores = obj.values()
+    elif tipo is list or tipo is tuple:
+        valores = obj
+    elif tipo is float:
+        return obj - obj == 0.0  # NaN e infinito dan NaN
+    else:
+        return tipo in _ESCALARES
+    # Los escalares se comprueban aquí mismo: una llamada por valor haría la comprobación más lenta que orjson
+    for valor in valores:
+        tipo = type(valor)
+        if tipo in _ESCALARES:
+            continue
+        if tipo is float:
+            if valor - valor != 0.0:
+                return False
+        elif not _solo_json(valor):
+            return False
+    return True
+
+
+def _rechazar(obj):
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def volcados(obj, ensure_ascii=True, indent=None, sort_keys=False, separators=None, motor=None):
+    """Como json.dumps; motor="json" fuerza la librería estándar"""
+    opciones = None if motor == "json" else _opciones_orjson(ensure_ascii, indent, sort_keys, separators)
+    if opciones is not None and _solo_json(obj):
+        try:
+            # Por si acaso, lo que orjson sabe escribir y json no, se le pasa a default
+            return orjson.dumps(obj, default=_rechazar, option=opciones).decode("utf-8")
+        except TypeError:  # Enteros de más de 64 bits...
+            pass
+    return json.dumps(obj, ensure_ascii=ensure_ascii, indent=indent, sort_keys=sort_keys, separators=separators)
+
+
+def volcar(obj, archivo, ensure_ascii=True, indent=None, sort_keys=False, separators=None, motor=None):
+    """Como json.dump: genera el texto entero y lo escribe de una vez"""
+    archivo.write(volcados(obj, ensure_ascii, indent, sort_keys, separators, motor))
+
+
+def cargas(texto, motor=None):
+    """Como json.loads"""
+    if orjson is not None and motor != "json":
+        try:
+            return orjson.loads(texto)
+        except orjson.JSONDecodeError:
+            pass  # NaN, enteros enormes...: json decide si de verdad es inválido
+    return json.loads(texto)
+
+
+def cargar(archivo, motor=None):
+    """Como json.load"""
+    return cargas(archivo.read(), motor)
+
+
+# ─── Comparativa de rendimiento ───
+
+MODOS = {
+    "compacto": {"ensure_ascii": False, "separators": SEPARADORES_COMPACTOS},
+    "indent=2": {"ensure_ascii": False, "indent": 2},
+    "sort_keys": {"ensure_ascii": False, "indent": 2, "sort_keys": True},
+}
+
+
+def generar_datos(n, semilla=0):
+    """Lista de n registros parecidos a los de la guía (con tildes y anidados)"""
+    import random
+
+    aleatorio = random.Random(semilla)
+    continentes = ["Europa", "América", "Asia", "África", "Oceanía"]
+    return [{"id": i,
+             "nombre": f"País {i} ñ",
+             "continente": aleatorio.choice(continentes),
+             "poblacion": round(aleatorio.uniform(0.1, 1400), 1),
+             "disponible": aleatorio.random() < 0.5,
+             "ciudades": [{"nombre": f"Ciudad {j}", "habitantes": aleatorio.randint(1000, 10 ** 7)}
+                          for j in range(3)]}
+            for i in range(n)]
+
+
+def comparar(datos, repeticiones=3):
+    """Mide volcados/cargas con cada motor y modo; devuelve una fila por combinación"""
+    import time
+
+    motores = ["json"] + (["auto"] if orjson is not None else [])
+    resultados = []
+    for modo, opciones in MODOS.items():
+        for motor in motores:
+            texto = volcados(datos, motor=motor, **opciones)
+            megas = len(texto.encode("utf-8")) / 1e6
+            inicio = time.perf_counter()
+            for _ in range(repeticiones):
+                volcados(datos, motor=motor, **opciones)
+            escritura = (time.perf_counter() - inicio) / repeticiones
+            inicio = time.perf_counter()
+            for _ in range(repeticiones):
+                cargas(texto, motor=motor)
+            lectura = (time.perf_counter() - inicio) / repeticiones
+            resultados.append({"modo": modo, "motor": "orjson" if motor == "auto" else motor,
+                               "megas": megas, "escritura_mb_s": megas / escritura,
+                               "lectura_mb_s": megas / lectura})
+    return resultados
+
+
+if __name__ == "__main__":
+    for n in (1000, 50000):
+        print(f"\n{n} registros")
+        print(f"{'modo':<10} {'motor':<7} {'MB':>7} {'escribe MB/s':>13} {'lee MB/s':>10}")
+        for fila in comparar(generar_datos(n)):
+            print(f"{fila['modo']:<10} {fila['motor']:<7} {fila['megas']:>7.2f} "
+                  f"{fila['escritura_mb_s']:>13.1f} {fila['lectura_mb_s']:>10.1f}")
@@ -0,0 +1,133 @@
+"""
+coleccion_json: Colección en memoria con índices secundarios
+Carga un array JSON una vez y mantiene índices hash (valor → registros)
+para consultas de igualdad, como continente, categoria o disponible, e
+índices ordenados para rangos, como poblacion > 40. Los índices se
+actualizan al insertar, modificar o eliminar registros, sin reconstruirlos.
+"""
+
+import bisect
+import math
+
+from codec_json import cargar
+from json_flujo import leer_array_json
+
+
+class Coleccion:
+    """Registros (diccionarios) con índices por campo"""
+
+    def __init__(self, registros=(), hash=(), ordenados=()):
+        self.registros = []  # La posición de cada registro es su id; los eliminados quedan a None
+        self._hash = {campo: {} for campo in hash}  # campo -> valor -> set de ids
+        self._ordenados = {campo: [] for campo in ordenados}  # campo -> lista ordenada de (valor, id)
+        for registro in registros:
+            self.registros.append(registro)
+            self._indexar_hash(len(self.registros) - 1, registro)
+        # Los índices ordenados se construyen de una vez con sort(), no insertando uno a uno
+        for campo, indice in self._ordenados.items():
+            indice.extend((r[campo], i) for i, r in enumerate(self.registros) if r.get(campo) is not None)
+            indice.sort()
+
+    @classmethod
+    def desde_json(cls, ruta, clave=None, hash=(), ordenados=()):
+        """
+        Carga un array JSON (en flujo) o, con clave, la lista que hay en esa
+        clave de un objeto, como catalogo["productos"].
+        """
+        with open(ruta, "r", encoding="utf-8") as f:
+            registros = cargar(f)[clave] if clave is not None else leer_array_json(f)
+            return cls(registros, hash=hash, ordenados=ordenados)
+
+    def __len__(self):
+        return sum(1 for r in self.registros if r is not None)
+
+    def __iter__(self):
+        return (r for r in self.registros if r is not None)
+
+    # ─── Mantenimiento de índices ───
+
+    def _indexar_hash(self, id_registro, registro):
+        for campo, indice in self._hash.items():
+            if campo in registro:
+                indice.setdefault(registro[campo], set()).add(id_registro)
+
+    def _desindexar(self, id_registro, registro, campos):
+        for campo in campos:
+            if campo in self._hash and campo in registro:
+                ids = self._hash[campo][registro[campo]]
+                ids.discard(id_registro)
+                if not ids:
+                    del self._hash[campo][registro[campo]]
+            if campo in self._ordenados and registro.get(campo) is not None:
+                indice = self._ordenados[campo]
+                del indice[bisect.bisect_left(indice, (registro[campo], id_registro))]
+
+    def _indexar(self, id_registro, registro, campos):
+        for campo in campos:
+            if campo in self._hash and campo in registro:
+                self._hash[campo].setdefault(registro[campo], set()).add(id_registro)
+            if campo in self._ordenados and registro.get(campo) is not None:
+                bisect.insort(self._ordenados[campo], (registro[campo], id_registro))
+
+    def insertar(self, registro):
+        self.registros.append(registro)
+        id_registro = len(self.registros) - 1
+        self._indexar(id_registro, registro, registro.keys())
+        return id_registro
+
+    def actualizar(self, id_registro, **cambios):
+        """Modifica campos de un registro y solo toca los índices de esos campos"""
+        registro = self.registros[id_registro]
+        self._desindexar(id_registro, registro, cambios.keys())
+        registro.update(cambios)
+        self._indexar(id_registro, registro, cambios.keys())
+        return registro
+
+    def eliminar(self, id_registro):
+        registro = self.registros[id_registro]
+        self._desindexar(id_registro, registro, registro.keys())
+        self.registros[id_registro] = None
+
+    # ─── Consultas ───
+
+    def ids(self, **condiciones):
+        """Ids de los registros que cumplen todas las igualdades campo=valor"""
+        indexados = [c for c in condiciones if c in self._hash]
+        if indexados:
+            # Se empieza por el conjunto más pequeño y se cruza con los demás
+            conjuntos = sorted((self._hash[c].get(condiciones[c], set()) for c in indexados), key=len)
+            candidatos = set(conjuntos[0]).intersection(*conjuntos[1:])
+        else:
+            candidatos = (i for i, r in enumerate(self.registros) if r is not None)
+        resto = [c for c in condiciones if c not in self._hash]
+        return sorted(i for i in candidatos
+                      if all(self.registros[i].get(c) == condiciones[c] for c in resto))
+
+    def buscar(self, **condiciones):
+        """Registros con campo == valor para cada condición (p. ej. continente="Europa")"""
+        return [self.registros[i] for i in self.ids(**condiciones)]
+
+    def rango(self, campo, mayor_que=None, menor_que=None, desde=None, hasta=None):
+        """Registros con el campo en el rango (mayor_que/menor_que excluyen, desde/hasta incluyen)"""
+        if campo not in self._ordenados:
+            raise KeyError(f"El campo '{campo}' no tiene índice ordenado")
+        indice = self._ordenados[campo]
+        inicio, fin = 0, len(indice)
+        if mayor_que is not None:
+            inicio = bisect.bisect_right(indice, (mayor_que, math.inf))
+        elif desde is not None:
+            inicio = bisect.bisect_left(indice, (desde, -math.inf))
+        if menor_que is not None:
+            fin = bisect.bisect_left(indice, (menor_que, -math.inf))
+        elif hasta is not None:
+            fin = bisect.bisect_right(indice, (hasta, math.inf))
+        return [self.registros[i] for _, i in indice[inicio:fin]]
+
+
+if __name__ == "__main__":
+    paises = Coleccion.desde_json("paises.json", hash=["continente"], ordenados=["poblacion"])
+    print("Europa:", [p["nombre"] for p in paises.buscar(continente="Europa")])
+    print("Población > 40:", [p["nombre"] for p in paises.rango("poblacion", mayor_que=40)])
+
+    paises.actualizar(paises.ids(nombre="Canadá")[0], poblacion=41.0)
+    print("Tras actualizar Canadá:", [p["nombre"] for p in paises.rango("poblacion", mayor_que=40)])
@@ -0,0 +1,115 @@
+"""
+combinar_json: Combinación en flujo de N ficheros con un array JSON
+Lee cada fichero elemento a elemento y escribe directamente en la salida,
+así que la memoria no depende del número ni del tamaño de los ficheros.
+Puede quitar duplicados por una clave (por ejemplo "id") recordando las
+claves vistas en un conjunto o, para entradas enormes, en un filtro de
+Bloom de tamaño fijo. En los dos casos las claves se comparan por su texto
+JSON: 1, 1.0 y true son claves distintas.
+La salida se escribe con abrir_atomico(): puede ser también una de las
+entradas, porque no sustituye al fichero hasta terminar de leerlas.
+"""
+
+import hashlib
+import json
+import math
+import os
+import sys
+
+if __name__ == "__main__":
+    # Ejecutado suelto: escritura_atomica está en la carpeta U5
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from escritura_atomica import abrir_atomico  # noqa: E402
+from json_flujo import EscritorArrayJSON, leer_array_json  # noqa: E402
+
+
+class FiltroBloom:
+    """
+    Conjunto aproximado en un bytearray: nunca dice "no está" de algo que
+    sí está, pero con probabilidad ~error dice "está" de algo nuevo. Usado
+    para quitar duplicados, esa probabilidad es la de descartar por error
+    un registro único cuando el filtro lleva 'capacidad' claves (cadenas).
+    """
+
+    def __init__(self, capacidad, error=0.001):
+        if capacidad <= 0:
+            raise ValueError(f"La capacidad del filtro de Bloom debe ser positiva: {capacidad}")
+        if not 0 < error < 1:
+            raise ValueError(f"La probabilidad de error debe estar entre 0 y 1: {error}")
+        self.bits = max(8, math.ceil(-capacidad * math.log(error) / math.log(2) ** 2))
+        self.funciones = max(1, round(self.bits / capacidad * math.log(2)))
+        self.tabla = bytearray((self.bits + 7) // 8)
+
+    def _posiciones(self, clave):
+        # Dos hashes de 64 bits combinados dan las k posiciones (h1 + i*h2)
+        resumen = hashlib.blake2b(clave.encode("utf-8"), digest_size=16).digest()
+        h1 = int.from_bytes(resumen[:8], "little")
+        h2 = int.from_bytes(resumen[8:], "little") | 1
+        return [(h1 + i * h2) % self.bits for i in range(self.funciones)]
+
+    def __contains__(self, clave):
+        return all(self.tabla[p >> 3] & (1 << (p & 7)) for p in self._posiciones(clave))
+
+    def anadir(self, clave):
+        """Añade la clave y devuelve True si (probablemente) ya estaba"""
+        estaba = True
+        for p in self._posiciones(clave):
+            if not self.tabla[p >> 3] & (1 << (p & 7)):
+                estaba = False
+                self.tabla[p >> 3] |= 1 << (p & 7)
+        return estaba
+
+
+def _texto_clave(valor):
+    """Forma única de comparar claves en el conjunto y en el filtro (también sirve para listas y objetos)"""
+    return json.dumps(valor, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+
+
+def _elementos(ruta, encoding):
+    with open(ruta, "r", encoding=encoding) as f:
+        yield from leer_array_json(f)
+
+
+def combinar_json(rutas, salida, clave=None, capacidad_bloom=None, error_bloom=0.001,
+                  indent=2, ensure_ascii=False, encoding="utf-8"):
+    """
+    Une los arrays JSON de rutas en salida y devuelve un informe con elementos escritos y duplicados.
+    clave: campo para quitar duplicados (se queda la primera aparición); los
+    elementos sin ese campo se escriben siempre.
+    capacidad_bloom: si se indica, las claves vistas se guardan en un
+    FiltroBloom para ese número de claves en lugar de en un conjunto.
+    """
+    if clave is None:
+        vistas = None
+    elif capacidad_bloom is None:
+        vistas = set()
+    else:
+        vistas = FiltroBloom(capacidad_bloom, error_bloom)
+
+    escritos = duplicados = 0
+    with abrir_atomico(salida, encoding=encoding) as archivo:
+        with EscritorArrayJSON(archivo, indent=indent, ensure_ascii=ensure_ascii) as escritor:
+            for ruta in rutas:
+                for elemento in _elementos(ruta, encoding):
+                    if vistas is not None and isinstance(elemento, dict) and clave in elemento:
+                        valor = _texto_clave(elemento[clave])
+                        if isinstance(vistas, set):
+                            repetido = valor in vistas
+                            vistas.add(valor)
+                        else:
+                            repetido = vistas.anadir(valor)
+                        if repetido:
+                            duplicados += 1
+                            continue
+                    escritor.escribir(elemento)
+                    escritos += 1
+    return {"ficheros": len(rutas), "escritos": escritos, "duplicados": duplicados}
+
+
+if __name__ == "__main__":
+    import glob
+
+    rutas = sys.argv[2:] or sorted(glob.glob("usuarios*.json"))
+    salida = sys.argv[1] if len(sys.argv) > 1 else "todos_usuarios.json"
+    print(combinar_json(rutas, salida, clave="id"))
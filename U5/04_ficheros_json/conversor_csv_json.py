@@ -0,0 +1,389 @@
+"""
+conversor_csv_json: Conversión en flujo entre CSV y JSON (array o JSON Lines)
+CSV → JSON: deduce el tipo de cada columna (int, float, bool, json o str) a
+partir de una muestra; si después algún valor no encaja, toda la columna
+pasa a str (sin columnas mezcladas ni "007" convertido en 7). Convierte las
+cabeceras con puntos ("departamento.nombre") en objetos anidados.
+JSON → CSV: aplana los objetos anidados en columnas con puntos. Los ficheros grandes se reparten por rangos
+de bytes entre varios procesos; cada uno escribe su parte en un fichero
+temporal y al final se juntan en orden.
+Usa calcular_rangos() de csv_paralelo (03_ficheros_csv): quien lo importe
+debe tener esa carpeta en sys.path, como main.py.
+"""
+
+import csv
+import io
+import os
+import re
+import shutil
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+if __name__ == "__main__":
+    # Ejecutado suelto: escritura_atomica está en la carpeta U5 y csv_paralelo en 03_ficheros_csv
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "03_ficheros_csv"))
+
+from codec_json import cargas, volcados  # noqa: E402
+# Los rangos alineados a registros CSV se calculan igual que en la lectura paralela de la sección de CSV
+from csv_paralelo import calcular_rangos  # noqa: E402
+from escritura_atomica import abrir_atomico  # noqa: E402
+from json_flujo import leer_array_json  # noqa: E402
+
+CARPETA_CSV = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "03_ficheros_csv")
+
+MUESTRA = 1000  # Filas o registros usados para deducir tipos y columnas
+TAM_RANGO = 64 * 1024 * 1024  # Bytes que procesa cada tarea como mucho
+TAM_COPIA = 16 * 1024 * 1024  # Búfer al juntar las partes
+
+FORMATO_ARRAY = "array"
+FORMATO_JSONL = "jsonl"
+
+_ENTERO = re.compile(r"-?(?:0|[1-9]\d*)")
+_DECIMAL = re.compile(r"-?(?:(?:0|[1-9]\d*)(?:\.\d*)?|\.\d+)(?:[eE][+-]?\d+)?")
+
+
+# ─── Tipos ───
+
+def _es_json(texto):
+    if texto[:1] not in ("[", "{"):
+        return False
+    try:
+        cargas(texto)
+    except ValueError:
+        return False
+    return True
+
+
+def inferir_tipo(valores):
+    """Tipo común de los valores no vacíos de una columna: int, float, bool, json o str"""
+    valores = [v for v in valores if v != ""]
+    if not valores:
+        return "str"
+    if all(_ENTERO.fullmatch(v) for v in valores):
+        return "int"
+    if all(_DECIMAL.fullmatch(v) for v in valores):
+        return "float"
+    if all(v.lower() in ("true", "false") for v in valores):
+        return "bool"
+    if all(_es_json(v) for v in valores):
+        return "json"
+    return "str"
+
+
+# Con las mismas reglas que inferir_tipo(): int() y float() aceptan también "1_000", " 12" o "nan"
+def _a_int(texto):
+    if not _ENTERO.fullmatch(texto):
+        raise ValueError(texto)
+    return int(texto)
+
+
+def _a_float(texto):
+    if not _DECIMAL.fullmatch(texto):
+        raise ValueError(texto)
+    return float(texto)
+
+
+def _a_bool(texto):
+    minusculas = texto.lower()
+    if minusculas not in ("true", "false"):
+        raise ValueError(texto)
+    return minusculas == "true"
+
+
+def _a_json(texto):
+    if texto[:1] not in ("[", "{"):
+        raise ValueError(texto)
+    return cargas(texto)
+
+
+def _convertidor(tipo, campo, fallidos):
+    """
+    Función texto → valor; un texto vacío es null. Uno que no encaja se deja
+    como texto y el campo se apunta en fallidos para repetir la columna como str.
+    """
+    if tipo == "str":
+        return None
+    convertir = {"int": _a_int, "float": _a_float, "bool": _a_bool, "json": _a_json}[tipo]
+
+    def convertidor(texto):
+        if texto == "":
+            return None
+        try:
+            return convertir(texto)
+        except ValueError:
+            fallidos.add(campo)
+            return texto
+
+    return convertidor
+
+
+# ─── Anidar y aplanar ───
+
+def _anidador(campos):
+    """
+    Función que convierte una lista de valores en el diccionario (anidado si
+    hay puntos). ValueError si un campo es a la vez valor y objeto ("a" y "a.b").
+    """
+    if not any("." in campo for campo in campos):
+        return lambda valores: dict(zip(campos, valores))
+    rutas = [campo.split(".") for campo in campos]
+    nombres = set(campos)
+    for campo, ruta in zip(campos, rutas):
+        for n in range(1, len(ruta)):
+            prefijo = ".".join(ruta[:n])
+            if prefijo in nombres:
+                raise ValueError(f"Las columnas '{prefijo}' y '{campo}' no se pueden anidar a la vez; "
+                                 "usa anidar=False")
+
+    def anidar(valores):
+        registro = {}
+        for ruta, valor in zip(rutas, valores):
+            destino = registro
+            for parte in ruta[:-1]:
+                destino = destino.setdefault(parte, {})
+            destino[ruta[-1]] = valor
+        return registro
+
+    return anidar
+
+
+def aplanar(registro, prefijo="", salida=None):
+    """{"a": {"b": 1}} → {"a.b": 1}; las listas se quedan enteras"""
+    salida = {} if salida is None else salida
+    for clave, valor in registro.items():
+        if isinstance(valor, dict) and valor:
+            aplanar(valor, f"{prefijo}{clave}.", salida)
+        else:
+            salida[f"{prefijo}{clave}"] = valor
+    return salida
+
+
+def _texto_csv(valor):
+    if valor is None:
+        return ""
+    if valor is True or valor is False:
+        return "true" if valor else "false"
+    if isinstance(valor, (list, dict)):
+        return volcados(valor, ensure_ascii=False, separators=(",", ":"))
+    return str(valor)
+
+
+# ─── CSV → JSON ───
+
+def _linea_json(registro):
+    return volcados(registro, ensure_ascii=False, separators=(",", ":"))
+
+
+def _csv_a_json_rango(ruta, inicio, fin, campos, tipos, formato, delimiter, encoding, ruta_parte, anidar):
+    with open(ruta, "rb") as archivo:
+        archivo.seek(inicio)
+        datos = archivo.read(fin - inicio)
+    fallidos = set()
+    convertidores = [_convertidor(tipos[campo], campo, fallidos) for campo in campos]
+    a_registro = _anidador(campos) if anidar else (lambda valores: dict(zip(campos, valores)))
+    filas = 0
+    with open(ruta_parte, "w", encoding="utf-8") as salida:
+
+        def volcar_lote(lineas):
+            # En un array los elementos van separados por ",\n" (la parte no lleva corchetes)
+            if formato == FORMATO_JSONL:
+                salida.write("\n".join(lineas) + "\n")
+            else:
+                salida.write((",\n" if filas > len(lineas) else "") + ",\n".join(lineas))
+
+        lineas = []
+        for fila in csv.reader(io.StringIO(datos.decode(encoding), newline=""), delimiter=delimiter):
+            if not fila:
+                continue
+            valores = [texto if convertir is None else convertir(texto)
+                       for convertir, texto in zip(convertidores, fila)]
+            lineas.append(_linea_json(a_registro(valores)))
+            filas += 1
+            if len(lineas) >= MUESTRA:
+                volcar_lote(lineas)
+                lineas = []
+        if lineas:
+            volcar_lote(lineas)
+    return filas, fallidos
+
+
+def _muestra_csv(ruta, delimiter, encoding):
+    with open(ruta, "r", newline="", encoding=encoding) as f:
+        lector = csv.reader(f, delimiter=delimiter)
+        campos = next(lector, [])
+        filas = [fila for fila in islice(lector, MUESTRA) if fila]
+    tipos = {campo: inferir_tipo([fila[i] for fila in filas if i < len(fila)]) for i, campo in enumerate(campos)}
+    return campos, tipos
+
+
+def _numero_de_rangos(ruta, procesos):
+    return max(procesos, os.path.getsize(ruta) // TAM_RANGO + 1)
+
+
+def _juntar(partes, salida, formato):
+    """Copia las partes en orden; en un array, las separa con comas y añade los corchetes"""
+    with abrir_atomico(salida, "wb") as destino:
+        escritas = 0
+        if formato == FORMATO_ARRAY:
+            destino.write(b"[")
+        for ruta_parte in partes:
+            if os.path.getsize(ruta_parte) == 0:
+                continue
+            if formato == FORMATO_ARRAY:
+                destino.write(b",\n" if escritas else b"\n")
+            with open(ruta_parte, "rb") as origen:
+                shutil.copyfileobj(origen, destino, TAM_COPIA)
+            escritas += 1
+        if formato == FORMATO_ARRAY:
+            destino.write(b"\n]" if escritas else b"]")
+
+
+def _ejecutar(tareas, procesos):
+    """Ejecuta (función, argumentos) en procesos, o aquí mismo si solo hay una tarea"""
+    if len(tareas) == 1 or procesos == 1:
+        return [funcion(*argumentos) for funcion, argumentos in tareas]
+    with ProcessPoolExecutor(max_workers=procesos) as ejecutor:
+        futuros = [ejecutor.submit(funcion, *argumentos) for funcion, argumentos in tareas]
+        return [futuro.result() for futuro in futuros]
+
+
+def csv_a_json(entrada, salida, formato=FORMATO_ARRAY, delimiter=",", anidar=True, procesos=None,
+               encoding="utf-8-sig"):
+    """
+    Convierte un CSV en un array JSON (un elemento por línea) o en JSON Lines.
+    Devuelve el número de filas y el tipo deducido para cada columna.
+    """
+    if formato not in (FORMATO_ARRAY, FORMATO_JSONL):
+        raise ValueError(f"Formato no válido: {formato}")
+    procesos = procesos or os.cpu_count() or 1
+    campos, tipos = _muestra_csv(entrada, delimiter, encoding)
+    if anidar:
+        _anidador(campos)  # Cabeceras incompatibles: error aquí y no en cada proceso
+    _, rangos = calcular_rangos(entrada, _numero_de_rangos(entrada, procesos))
+    partes = [f"{salida}.parte{n}" for n in range(len(rangos))]
+    try:
+        while True:
+            resultados = _ejecutar([(_csv_a_json_rango, (entrada, inicio, fin, campos, tipos, formato, delimiter,
+                                                         encoding, ruta_parte, anidar))
+                                    for (inicio, fin), ruta_parte in zip(rangos, partes)], procesos)
+            fallidos = set().union(*(fallidos for _, fallidos in resultados))
+            if not fallidos:
+                break
+            # La muestra no era representativa: esas columnas se repiten enteras como texto
+            tipos.update(dict.fromkeys(fallidos, "str"))
+        filas = [filas for filas, _ in resultados]
+        _juntar(partes, salida, formato)
+    finally:
+        for ruta_parte in partes:
+            if os.path.exists(ruta_parte):
+                os.remove(ruta_parte)
+    return {"filas": sum(filas), "tipos": tipos}
+
+
+# ─── JSON → CSV ───
+
+def _es_array(ruta, encoding):
+    with open(ruta, "r", encoding=encoding) as f:
+        while True:
+            caracter = f.read(1)
+            if not caracter or not caracter.isspace():
+                return caracter == "["
+
+
+def _registros_jsonl(archivo):
+    for linea in archivo:
+        if linea.strip():
+            yield cargas(linea)
+
+
+def _fila_csv(registro, campos, posiciones):
+    plano = aplanar(registro)
+    if not plano.keys() <= posiciones:
+        sobrantes = sorted(plano.keys() - posiciones)
+        raise ValueError(f"Los campos {sobrantes} no están en la cabecera; indícalos en campos=")
+    return [_texto_csv(plano.get(campo)) for campo in campos]
+
+
+def _json_a_csv_rango(ruta, inicio, fin, campos, delimiter, encoding, ruta_parte):
+    with open(ruta, "rb") as archivo:
+        archivo.seek(inicio)
+        datos = archivo.read(fin - inicio)
+    posiciones = set(campos)
+    filas = 0
+    with open(ruta_parte, "w", newline="", encoding="utf-8") as salida:
+        escritor = csv.writer(salida, delimiter=delimiter)
+        for registro in _registros_jsonl(io.StringIO(datos.decode(encoding))):
+            escritor.writerow(_fila_csv(registro, campos, posiciones))
+            filas += 1
+    return filas
+
+
+def _rangos_lineas(ruta, trozos):
+    """Rangos de bytes que terminan en un salto de línea (en JSON Lines no hay saltos dentro de un registro)"""
+    tamano = os.path.getsize(ruta)
+    objetivo = max(tamano // max(trozos, 1), 1)
+    rangos = []
+    with open(ruta, "rb") as archivo:
+        inicio = 0
+        while inicio < tamano:
+            archivo.seek(min(inicio + objetivo, tamano))
+            archivo.readline()
+            fin = min(archivo.tell(), tamano)
+            rangos.append((inicio, fin))
+            inicio = fin
+    return rangos
+
+
+def json_a_csv(entrada, salida, campos=None, delimiter=",", procesos=None, encoding="utf-8"):
+    """
+    Convierte un array JSON o un fichero JSON Lines en CSV, aplanando los
+    objetos anidados. Sin campos, las columnas salen de los primeros
+    registros. Los ficheros JSON Lines se reparten entre varios procesos.
+    """
+    procesos = procesos or os.cpu_count() or 1
+    es_array = _es_array(entrada, encoding)
+    if campos is None:
+        campos = {}
+        with open(entrada, "r", encoding=encoding) as f:
+            registros = leer_array_json(f) if es_array else _registros_jsonl(f)
+            for registro in islice(registros, MUESTRA):
+                campos.update(dict.fromkeys(aplanar(registro)))
+        campos = list(campos)
+    posiciones = set(campos)
+
+    if es_array:
+        # Un array no se puede cortar por bytes sin analizarlo: se convierte en flujo en este proceso
+        filas = 0
+        with open(entrada, "r", encoding=encoding) as f, abrir_atomico(salida, newline="") as s:
+            escritor = csv.writer(s, delimiter=delimiter)
+            escritor.writerow(campos)
+            for registro in leer_array_json(f):
+                escritor.writerow(_fila_csv(registro, campos, posiciones))
+                filas += 1
+        return {"filas": filas, "campos": campos}
+
+    rangos = _rangos_lineas(entrada, _numero_de_rangos(entrada, procesos))
+    partes = [f"{salida}.parte{n}" for n in range(len(rangos))]
+    try:
+        filas = _ejecutar([(_json_a_csv_rango, (entrada, inicio, fin, campos, delimiter, encoding, ruta_parte))
+                           for (inicio, fin), ruta_parte in zip(rangos, partes)], procesos)
+        with abrir_atomico(salida, newline="") as destino:
+            csv.writer(destino, delimiter=delimiter).writerow(campos)
+            destino.flush()
+            for ruta_parte in partes:
+                with open(ruta_parte, "rb") as origen:
+                    shutil.copyfileobj(origen, destino.buffer, TAM_COPIA)
+    finally:
+        for ruta_parte in partes:
+            if os.path.exists(ruta_parte):
+                os.remove(ruta_parte)
+    return {"filas": sum(filas), "campos": campos}
+
+
+if __name__ == "__main__":
+    ciudades = os.path.join(CARPETA_CSV, "ciudades.csv")
+    print(csv_a_json(ciudades, "ciudades.json"))
+    print(csv_a_json(os.path.join(CARPETA_CSV, "notas.csv"), "notas.jsonl", formato=FORMATO_JSONL))
+    print(json_a_csv("notas.jsonl", "notas_desde_json.csv"))
@@ -0,0 +1,165 @@
+"""
+esquema_json: Registros JSON decodificados a objetos con __slots__
+Un Esquema declara los campos de un tipo de registro (país, producto) y
+genera una clase con __slots__ y un decodificador que comprueba los tipos
+una sola vez, al cargar. Cada registro ocupa mucho menos que un diccionario
+y sus campos se leen como atributos (pais.nombre); pais["nombre"] también
+funciona para no tener que cambiar el código que ya usa diccionarios.
+"""
+
+import keyword
+import sys
+
+from codec_json import cargar
+from json_flujo import leer_array_json
+
+# Tipos que se aceptan para cada tipo declarado (bool no cuenta como int); los
+# enteros en un campo float se dejan como están para volver a escribirlos igual
+TIPOS_ACEPTADOS = {float: (float, int)}
+
+
+class Campo:
+    """Un campo del esquema: nombre, tipo y si puede faltar o ser null"""
+
+    __slots__ = ("nombre", "tipo", "tipos", "obligatorio", "defecto", "internar")
+
+    def __init__(self, nombre, tipo, obligatorio=True, defecto=None, internar=False):
+        if not nombre.isidentifier() or keyword.iskeyword(nombre):
+            raise ValueError(f"'{nombre}' no sirve como nombre de campo")
+        self.nombre = nombre
+        self.tipo = tipo
+        self.tipos = TIPOS_ACEPTADOS.get(tipo, (tipo,))
+        self.obligatorio = obligatorio
+        self.defecto = defecto
+        # Los valores que se repiten mucho (continente, categoria) se guardan una sola vez
+        self.internar = internar and tipo is str
+
+
+class Registro:
+    """Base de las clases generadas por Esquema"""
+
+    __slots__ = ()
+    _campos = ()
+
+    def __init__(self, *valores, **campos):
+        for nombre, valor in zip(self._campos, valores):
+            setattr(self, nombre, valor)
+        for nombre, valor in campos.items():
+            setattr(self, nombre, valor)
+
+    def __getitem__(self, campo):
+        try:
+            return getattr(self, campo)
+        except (AttributeError, TypeError):
+            raise KeyError(campo) from None
+
+    def a_dict(self):
+        return {nombre: getattr(self, nombre) for nombre in self._campos}
+
+    def __eq__(self, otro):
+        if type(otro) is not type(self):
+            return NotImplemented
+        return all(getattr(self, c) == getattr(otro, c) for c in self._campos)
+
+    def __repr__(self):
+        valores = ", ".join(f"{c}={getattr(self, c)!r}" for c in self._campos)
+        return f"{type(self).__name__}({valores})"
+
+
+class Esquema:
+    """Declara un tipo de registro y compila su clase y su decodificador"""
+
+    def __init__(self, nombre, campos, estricto=True):
+        self.nombre = nombre
+        self.campos = list(campos)
+        self.estricto = estricto  # Si es True, un campo no declarado es un error
+        nombres = tuple(campo.nombre for campo in self.campos)
+        if len(set(nombres)) != len(nombres):
+            raise ValueError(f"{nombre}: hay campos repetidos")
+        self.clase = type(nombre, (Registro,), {"__slots__": nombres, "_campos": nombres})
+        self._nombres = frozenset(nombres)
+        # Los descriptores de los slots permiten rellenar el objeto sin pasar por __init__
+        self._plan = [(campo, self.clase.__dict__[campo.nombre].__set__) for campo in self.campos]
+
+    def decodificar(self, datos):
+        """Convierte un diccionario en un objeto de la clase; ValueError si no cumple el esquema"""
+        if not isinstance(datos, dict):
+            raise ValueError(f"{self.nombre}: se esperaba un objeto JSON, no {type(datos).__name__}")
+        if self.estricto and not datos.keys() <= self._nombres:
+            sobrantes = sorted(datos.keys() - self._nombres)
+            raise ValueError(f"{self.nombre}: campos no declarados {sobrantes}")
+        objeto = self.clase.__new__(self.clase)
+        for campo, asignar in self._plan:
+            valor = datos.get(campo.nombre)
+            if valor is None:
+                if campo.obligatorio:
+                    raise ValueError(f"{self.nombre}: falta el campo '{campo.nombre}' en {datos}")
+                valor = campo.defecto
+            elif type(valor) not in campo.tipos:
+                raise ValueError(f"{self.nombre}: '{campo.nombre}' debe ser {campo.tipo.__name__}, "
+                                 f"no {type(valor).__name__} ({valor!r})")
+            elif campo.internar:
+                valor = sys.intern(valor)
+            asignar(objeto, valor)
+        return objeto
+
+
+PAIS = Esquema("Pais", [
+    Campo("nombre", str),
+    Campo("continente", str, internar=True),
+    Campo("poblacion", float),
+])
+
+PRODUCTO = Esquema("Producto", [
+    Campo("id", str),
+    Campo("nombre", str),
+    Campo("categoria", str, internar=True),
+    Campo("precio", float),
+    Campo("stock", int),
+    Campo("disponible", bool),
+])
+
+
+def cargar_registros(ruta, esquema, clave=None, encoding="utf-8"):
+    """
+    Genera los registros de un fichero ya decodificados con el esquema.
+    Sin clave, el fichero es un array y se lee elemento a elemento; con
+    clave, se toma la lista de esa clave de un objeto (catalogo["productos"]).
+    """
+    with open(ruta, "r", encoding=encoding) as f:
+        elementos = cargar(f)[clave] if clave is not None else leer_array_json(f)
+        for elemento in elementos:
+            yield esquema.decodificar(elemento)
+
+
+def comparar_memoria(n=100000):
+    """
+    Bytes por registro como diccionario y como objeto del esquema PAIS:
+    'total' incluye los valores (cadenas, números); 'contenedor' solo el
+    diccionario u objeto, que es lo que ahorra el esquema.
+    """
+    import tracemalloc
+
+    from codec_json import cargas, volcados
+
+    continentes = ["Europa", "América", "Asia", "África", "Oceanía"]
+    texto = volcados([{"nombre": f"País {i}", "continente": continentes[i % 5], "poblacion": i / 10}
+                      for i in range(n)])
+    resultado = {}
+    for modo in ("diccionarios", "esquema"):
+        tracemalloc.start()
+        datos = cargas(texto)
+        if modo == "esquema":
+            datos = [PAIS.decodificar(pais) for pais in datos]
+        total = tracemalloc.get_traced_memory()[0] / n
+        tracemalloc.stop()
+        resultado[modo] = {"total": total, "contenedor": sum(map(sys.getsizeof, datos)) / n}
+        del datos
+    return resultado
+
+
+if __name__ == "__main__":
+    for pais in cargar_registros("paises.json", PAIS):
+        print(f"{pais.nombre} está en {pais.continente} y tiene {pais.poblacion} millones de habitantes.")
+    for modo, medidas in comparar_memoria().items():
+        print(f"{modo}: {medidas['total']:.0f} bytes/registro en total, {medidas['contenedor']:.0f} el contenedor")
@@ -0,0 +1,120 @@
+"""
+json_flujo: Lectura y escritura de arrays JSON elemento a elemento
+leer_array_json() genera los elementos de un fichero '[ {...}, {...} ]' uno a
+uno leyendo por trozos, así que la memoria depende del tamaño de un elemento
+y no del fichero. EscritorArrayJSON escribe un array elemento a elemento con
+el mismo formato que json.dump(lista, f, indent=...).
+"""
+
+import json
+
+TAM_TROZO = 64 * 1024  # Caracteres leídos en cada lectura
+ESPACIOS = " \t\n\r"
+CARACTERES_NUMERO = "0123456789+-.eE"
+
+
+def leer_array_json(archivo, tam_trozo=TAM_TROZO):
+    """Genera los elementos de un array JSON desde un fichero abierto en modo texto"""
+    decodificador = json.JSONDecoder()
+    buffer = archivo.read(tam_trozo)
+    fin_fichero = not buffer
+    posicion = 0
+
+    def rellenar(tam=tam_trozo):
+        # Descarta lo ya procesado y añade el siguiente trozo
+        nonlocal buffer, posicion, fin_fichero
+        trozo = archivo.read(tam)
+        fin_fichero = not trozo
+        buffer = buffer[posicion:] + trozo
+        posicion = 0
+
+    def saltar_espacios():
+        nonlocal posicion
+        while True:
+            while posicion < len(buffer) and buffer[posicion] in ESPACIOS:
+                posicion += 1
+            if posicion < len(buffer) or fin_fichero:
+                return
+            rellenar()
+
+    saltar_espacios()
+    if posicion >= len(buffer) or buffer[posicion] != "[":
+        raise json.JSONDecodeError("Se esperaba '[' al principio del array", buffer, posicion)
+    posicion += 1
+    saltar_espacios()
+    if posicion < len(buffer) and buffer[posicion] == "]":
+        return
+
+    while True:
+        saltar_espacios()
+        lectura = tam_trozo
+        while True:
+            try:
+                elemento, fin = decodificador.raw_decode(buffer, posicion)
+                # Un número al final del trozo puede estar cortado ("12" de "123", "4.5" de "4.5e3"):
+                # solo se da por bueno si detrás viene algo que no puede ser parte del número
+                if fin_fichero or (fin < len(buffer) and buffer[fin] not in CARACTERES_NUMERO):
+                    break
+            except json.JSONDecodeError:
+                if fin_fichero:
+                    raise
+            rellenar(lectura)
+            # Elemento grande: leer más de golpe para no reanalizarlo muchas veces. Solo
+            # mientras dura este elemento: el siguiente vuelve a leerse de tam_trozo en tam_trozo
+            lectura *= 2
+        posicion = fin
+        yield elemento
+
+        saltar_espacios()
+        if posicion >= len(buffer):
+            raise json.JSONDecodeError("Array sin cerrar", buffer, posicion)
+        if buffer[posicion] == "]":
+            return
+        if buffer[posicion] != ",":
+            raise json.JSONDecodeError("Se esperaba ',' o ']'", buffer, posicion)
+        posicion += 1
+
+
+class EscritorArrayJSON:
+    """Escribe un array JSON elemento a elemento (mismo formato que json.dump)"""
+
+    def __init__(self, archivo, indent=None, ensure_ascii=True, sort_keys=False):
+        self.archivo = archivo
+        self.indent = indent
+        self.opciones = {"indent": indent, "ensure_ascii": ensure_ascii, "sort_keys": sort_keys}
+        self.escritos = 0
+        if indent is None:
+            self._separador, self._sangria, self._cierre = ", ", "", "]"
+        else:
+            sangria = " " * indent if isinstance(indent, int) else indent
+            self._separador, self._sangria, self._cierre = ",\n", sangria, "\n]"
+
+    def escribir(self, elemento):
+        texto = json.dumps(elemento, **self.opciones)
+        if self._sangria:
+            texto = self._sangria + texto.replace("\n", "\n" + self._sangria)
+        if self.escritos == 0:
+            self.archivo.write("[\n" + texto if self.indent is not None else "[" + texto)
+        else:
+            self.archivo.write(self._separador + texto)
+        self.escritos += 1
+
+    def escribir_todos(self, elementos):
+        for elemento in elementos:
+            self.escribir(elemento)
+
+    def cerrar(self):
+        self.archivo.write(self._cierre if self.escritos else "[]")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, tipo, valor, traza):
+        if tipo is None:
+            self.cerrar()
+
+
+if __name__ == "__main__":
+    with open("paises.json", "r", encoding="utf-8") as f:
+        for pais in leer_array_json(f):
+            print(f"{pais['nombre']} está en {pais['continente']}")
@@ -0,0 +1,171 @@
+"""
+json_lineas: Almacenamiento en JSON Lines (un registro JSON por línea)
+Añadir un registro es escribir una línea al final del fichero, sin leer ni
+reescribir lo anterior. Cada escritura se hace en modo O_APPEND y con el
+bloqueo del fichero, de modo que nunca se mezclan dos registros aunque
+escriban varios procesos. Si una escritura anterior quedó a medias, la
+línea rota se quita antes de añadir.
+Incluye compactación (quitar líneas rotas y versiones antiguas de una
+clave) y conversión desde/hacia los ficheros con un array JSON.
+"""
+
+import json
+import os
+import sys
+
+if __name__ == "__main__":
+    # Ejecutado suelto: escritura_atomica está en la carpeta U5
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from escritura_atomica import abrir_atomico, bloqueo, quitar_linea_rota  # noqa: E402
+from json_flujo import EscritorArrayJSON, leer_array_json  # noqa: E402
+
+# Cuándo se fuerza la escritura a disco con os.fsync
+FSYNC_NUNCA = "nunca"  # Lo decide el sistema operativo (lo más rápido)
+FSYNC_LOTE = "lote"  # Al terminar cada anadir_lote() y al cerrar
+FSYNC_SIEMPRE = "siempre"  # Después de cada escritura (lo más seguro)
+
+
+def _linea(registro):
+    return (json.dumps(registro, ensure_ascii=False, separators=(",", ":")) + "\n").encode("utf-8")
+
+
+class AlmacenJSONL:
+    """Fichero .jsonl en el que solo se añade al final"""
+
+    def __init__(self, ruta, fsync=FSYNC_LOTE):
+        if fsync not in (FSYNC_NUNCA, FSYNC_LOTE, FSYNC_SIEMPRE):
+            raise ValueError(f"Política de fsync no válida: {fsync}")
+        self.ruta = ruta
+        self.fsync = fsync
+        self._fd = None
+
+    def _descriptor(self):
+        """Descriptor para añadir; hay que tener el bloqueo"""
+        if self._fd is not None and os.fstat(self._fd).st_ino != _inodo(self.ruta):
+            self.cerrar()  # compactar() (aquí o en otro proceso) ha sustituido el fichero
+        if self._fd is None:
+            self._fd = os.open(self.ruta, os.O_RDWR | os.O_APPEND | os.O_CREAT, 0o644)
+        return self._fd
+
+    def _escribir(self, datos):
+        # Con el bloqueo, si os.write() escribe solo una parte y hay que repetir,
+        # ningún otro proceso puede meter su línea en medio
+        with bloqueo(self.ruta):
+            fd = self._descriptor()
+            quitar_linea_rota(fd)
+            vista = memoryview(datos)
+            while vista:
+                escritos = os.write(fd, vista)
+                vista = vista[escritos:]
+
+    def anadir(self, registro):
+        """Añade un registro al final: O(1), sin tocar el resto del fichero"""
+        self._escribir(_linea(registro))
+        if self.fsync == FSYNC_SIEMPRE:
+            os.fsync(self._fd)
+
+    def anadir_lote(self, registros):
+        """Añade varios registros con una sola escritura"""
+        datos = b"".join(_linea(registro) for registro in registros)
+        if datos:
+            self._escribir(datos)
+            if self.fsync != FSYNC_NUNCA:
+                os.fsync(self._fd)
+
+    def leer(self, ignorar_errores=False):
+        """
+        Genera los registros. Una última línea sin terminar (escritura
+        interrumpida) se ignora siempre; las líneas con JSON inválido, solo
+        si se pide ignorar_errores.
+        """
+        for _, registro in self.leer_desde(0, ignorar_errores):
+            yield registro
+
+    def leer_desde(self, posicion, ignorar_errores=False):
+        """Como leer() pero empezando en el byte posicion; genera (posición tras la línea, registro)"""
+        try:
+            archivo = open(self.ruta, "rb")
+        except FileNotFoundError:
+            return
+        with archivo:
+            archivo.seek(posicion)
+            for linea in archivo:
+                if not linea.endswith(b"\n"):
+                    return
+                posicion += len(linea)
+                if not linea.strip():
+                    continue
+                try:
+                    registro = json.loads(linea)
+                except json.JSONDecodeError:
+                    if ignorar_errores:
+                        continue
+                    raise
+                yield posicion, registro
+
+    def compactar(self, clave=None):
+        """
+        Reescribe el fichero sin líneas vacías ni rotas. Con clave, deja solo
+        la última versión de cada registro. Devuelve cuántos registros quedan.
+        Los demás procesos esperan al bloqueo y después añaden al fichero nuevo.
+        """
+        ultimas = None
+        quedan = 0
+        with bloqueo(self.ruta):
+            if clave is not None:
+                # Primera pasada: en qué posición está la última versión de cada clave
+                ultimas = {registro[clave]: n for n, registro in enumerate(self.leer(True))}
+                conservar = set(ultimas.values())
+            self.cerrar()  # El descriptor abierto apuntaría al fichero antiguo
+            with abrir_atomico(self.ruta, "wb") as salida:
+                for n, registro in enumerate(self.leer(True)):
+                    if ultimas is None or n in conservar:
+                        salida.write(_linea(registro))
+                        quedan += 1
+        return quedan
+
+    def cerrar(self):
+        if self._fd is not None:
+            if self.fsync != FSYNC_NUNCA:
+                os.fsync(self._fd)
+            os.close(self._fd)
+            self._fd = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, tipo, valor, traza):
+        self.cerrar()
+
+
+def _inodo(ruta):
+    try:
+        return os.stat(ruta).st_ino
+    except FileNotFoundError:
+        return None
+
+
+def array_a_jsonl(ruta_json, ruta_jsonl):
+    """Convierte un fichero con un array JSON en JSON Lines, elemento a elemento"""
+    with open(ruta_json, "r", encoding="utf-8") as entrada, abrir_atomico(ruta_jsonl, "wb") as salida:
+        total = 0
+        for elemento in leer_array_json(entrada):
+            salida.write(_linea(elemento))
+            total += 1
+    return total
+
+
+def jsonl_a_array(ruta_jsonl, ruta_json, indent=2):
+    """Convierte JSON Lines en un array JSON con el formato habitual de la guía"""
+    with abrir_atomico(ruta_json) as salida:
+        with EscritorArrayJSON(salida, indent=indent, ensure_ascii=False) as escritor:
+            escritor.escribir_todos(AlmacenJSONL(ruta_jsonl).leer())
+    return escritor.escritos
+
+
+if __name__ == "__main__":
+    if len(sys.argv) == 3 and sys.argv[1] == "compactar":
+        print(f"✓ Quedan {AlmacenJSONL(sys.argv[2]).compactar(clave='nombre')} registros.")
+    else:
+        print(f"✓ {array_a_jsonl('paises.json', 'paises.jsonl')} países pasados a 'paises.jsonl'.")
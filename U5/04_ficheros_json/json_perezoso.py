@@ -0,0 +1,244 @@
+"""
+json_perezoso: Vista perezosa de un documento JSON anidado
+Una sola pasada por los bytes (con mmap si viene de un fichero) apunta
+dónde empieza y dónde acaba cada objeto y cada array. Después, al acceder
+a datos["empleados"][0]["nombre"], solo se analizan las partes por las que
+se pasa: los demás subárboles se saltan usando esas posiciones, sin
+convertirlos a Python. También admite selectores como
+"empleados[*].departamento.nombre" u "oficinas.*.ciudad".
+"""
+
+import mmap
+import re
+
+from codec_json import cargas
+
+ABRE_OBJETO, ABRE_ARRAY, CIERRA_OBJETO, CIERRA_ARRAY = b"{[}]"
+COMILLAS, COMA, DOS_PUNTOS = b'",:'
+
+_CADENA = rb'"[^"\\]*+(?:\\.[^"\\]*+)*+"'
+# Salta cadenas y texto normal y se para en el siguiente {, [, } o ] que no esté dentro de una cadena
+_HASTA_CORCHETE = re.compile(rb'(?:[^"\[\]{}]++|' + _CADENA + rb')*+([\[\]{}])', re.S)
+_ESPACIOS = re.compile(rb"[ \t\n\r]*+")
+_VALOR_SIMPLE = re.compile(_CADENA + rb'|[^,:\[\]{}\s]++', re.S)
+_PASO = re.compile(r'\.?([^.\[\]]+)|\[(\d+|\*)\]|\["([^"]*)"\]')
+
+
+def _error(mensaje, posicion):
+    return ValueError(f"JSON mal formado en la posición {posicion}: {mensaje}")
+
+
+class Nodo:
+    """Un objeto o array del documento; sus hijos se localizan al usarlo por primera vez"""
+
+    __slots__ = ("documento", "inicio", "fin", "_hijos")
+
+    def __init__(self, documento, inicio, fin):
+        self.documento = documento
+        self.inicio = inicio
+        self.fin = fin
+        self._hijos = None  # dict clave → (inicio, fin) o lista de (inicio, fin)
+
+    @property
+    def es_objeto(self):
+        return self.documento.datos[self.inicio] == ABRE_OBJETO
+
+    def hijos(self):
+        if self._hijos is None:
+            self._hijos = self.documento._hijos(self.inicio, self.fin)
+        return self._hijos
+
+    def __getitem__(self, clave):
+        return self.documento._valor(*self.hijos()[clave])
+
+    def get(self, clave, defecto=None):
+        try:
+            return self[clave]
+        except (KeyError, IndexError, TypeError):
+            return defecto
+
+    def __len__(self):
+        return len(self.hijos())
+
+    def __iter__(self):
+        """Como en Python: las claves de un objeto, los valores de un array"""
+        if self.es_objeto:
+            return iter(self.hijos())
+        return (self.documento._valor(*posiciones) for posiciones in self.hijos())
+
+    def keys(self):
+        return self.hijos().keys()
+
+    def items(self):
+        return ((clave, self.documento._valor(*posiciones)) for clave, posiciones in self.hijos().items())
+
+    def valor(self):
+        """El subárbol completo convertido a dict/list"""
+        return cargas(bytes(self.documento.datos[self.inicio:self.fin]))
+
+    def __repr__(self):
+        tipo = "objeto" if self.es_objeto else "array"
+        return f"<Nodo {tipo} en bytes {self.inicio}-{self.fin}>"
+
+
+class DocumentoPerezoso:
+    """Documento JSON (bytes o mmap) cuya raíz es un objeto o un array"""
+
+    def __init__(self, datos):
+        self.datos = datos
+        self._mapa = None
+        self.fines = self._escanear()  # posición de cada { o [ → posición tras su } o ]
+        inicio = _ESPACIOS.match(self.datos, 0).end()
+        if inicio not in self.fines:
+            raise _error("la raíz debe ser un objeto o un array", inicio)
+        self.raiz = Nodo(self, inicio, self.fines[inicio])
+
+    @classmethod
+    def abrir(cls, ruta):
+        """Abre un fichero con mmap: solo se leen de disco las páginas que se usan"""
+        with open(ruta, "rb") as f:
+            try:
+                mapa = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:  # Fichero vacío
+                return cls(b"")
+        documento = cls(mapa)
+        documento._mapa = mapa
+        return documento
+
+    def _escanear(self):
+        fines, pila = {}, []
+        posicion = 0
+        while True:
+            encontrado = _HASTA_CORCHETE.match(self.datos, posicion)
+            if encontrado is None:
+                break
+            posicion = encontrado.end()
+            caracter = self.datos[posicion - 1]
+            if caracter == ABRE_OBJETO or caracter == ABRE_ARRAY:
+                pila.append(posicion - 1)
+            else:
+                if not pila:
+                    raise _error("cierre sin apertura", posicion - 1)
+                inicio = pila.pop()
+                if (self.datos[inicio] == ABRE_OBJETO) != (caracter == CIERRA_OBJETO):
+                    raise _error("el cierre no corresponde con la apertura", posicion - 1)
+                fines[inicio] = posicion
+        if pila:
+            raise _error("contenedor sin cerrar", pila[-1])
+        return fines
+
+    def _saltar(self, posicion):
+        return _ESPACIOS.match(self.datos, posicion).end()
+
+    def _extension(self, posicion):
+        """Posiciones (inicio, fin) del valor que empieza en posicion"""
+        if posicion in self.fines:
+            return posicion, self.fines[posicion]
+        encontrado = _VALOR_SIMPLE.match(self.datos, posicion)
+        if encontrado is None:
+            raise _error("se esperaba un valor", posicion)
+        return posicion, encontrado.end()
+
+    def _valor(self, inicio, fin):
+        if inicio in self.fines:
+            return Nodo(self, inicio, fin)
+        return cargas(bytes(self.datos[inicio:fin]))
+
+    def _hijos(self, inicio, fin):
+        """Recorre solo el primer nivel del contenedor, saltando los subárboles"""
+        datos = self.datos
+        es_objeto = datos[inicio] == ABRE_OBJETO
+        hijos = {} if es_objeto else []
+        posicion = self._saltar(inicio + 1)
+        if posicion == fin - 1:
+            return hijos
+        while True:
+            if es_objeto:
+                if datos[posicion] != COMILLAS:
+                    raise _error("se esperaba una clave", posicion)
+                clave_inicio, clave_fin = self._extension(posicion)
+                clave = cargas(bytes(datos[clave_inicio:clave_fin]))
+                posicion = self._saltar(clave_fin)
+                if datos[posicion] != DOS_PUNTOS:
+                    raise _error("se esperaba ':'", posicion)
+                posicion = self._saltar(posicion + 1)
+            extension = self._extension(posicion)
+            if es_objeto:
+                hijos[clave] = extension
+            else:
+                hijos.append(extension)
+            posicion = self._saltar(extension[1])
+            if posicion == fin - 1:
+                return hijos
+            if datos[posicion] != COMA:
+                raise _error("se esperaba ',' o el cierre", posicion)
+            posicion = self._saltar(posicion + 1)
+
+    # ─── Acceso ───
+
+    def __getitem__(self, clave):
+        return self.raiz[clave]
+
+    def __iter__(self):
+        return iter(self.raiz)
+
+    def __len__(self):
+        return len(self.raiz)
+
+    def seleccionar(self, selector):
+        """
+        Valores que coinciden con el selector, ya convertidos a Python.
+        Pasos: .clave, ["clave"], [n] y [*] o .* (todos los hijos); un paso
+        que no existe en una rama simplemente no aporta resultados.
+        """
+        actuales = [self.raiz]
+        texto = selector[1:] if selector.startswith("$") else selector
+        posicion = 0
+        while posicion < len(texto):
+            paso = _PASO.match(texto, posicion)
+            if paso is None:
+                raise ValueError(f"Selector no válido en '{texto[posicion:]}'")
+            posicion = paso.end()
+            nombre, indice, entre_comillas = paso.groups()
+            siguientes = []
+            for nodo in actuales:
+                if not isinstance(nodo, Nodo):
+                    continue
+                if nombre == "*" or indice == "*":
+                    siguientes.extend(self._valor(*p) for p in
+                                      (nodo.hijos().values() if nodo.es_objeto else nodo.hijos()))
+                    continue
+                if indice is not None:
+                    clave = int(indice)
+                    if nodo.es_objeto or clave >= len(nodo):
+                        continue
+                else:
+                    clave = nombre if nombre is not None else entre_comillas
+                    if not nodo.es_objeto or clave not in nodo.hijos():
+                        continue
+                siguientes.append(nodo[clave])
+            actuales = siguientes
+        return [nodo.valor() if isinstance(nodo, Nodo) else nodo for nodo in actuales]
+
+    def obtener(self, selector, defecto=None):
+        """El primer valor que coincide con el selector, o defecto"""
+        valores = self.seleccionar(selector)
+        return valores[0] if valores else defecto
+
+    def cerrar(self):
+        if self._mapa is not None:
+            self._mapa.close()
+            self._mapa = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, tipo, valor, traza):
+        self.cerrar()
+
+
+if __name__ == "__main__":
+    with DocumentoPerezoso.abrir("empresa.json") as empresa:
+        print("Departamentos:", empresa.seleccionar("empleados[*].departamento.nombre"))
+        print("Ciudades de las oficinas:", empresa.seleccionar("oficinas.*.ciudad"))
+        print("Primer empleado:", empresa.obtener("empleados[0].nombre"))
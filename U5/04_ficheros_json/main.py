@@ -21,6 +21,25 @@ necesitas para el examen. Usa Ctrl+F para buscar rápidamente lo que necesites.
 """
 
 import json
+import os
+import sys
+
+# Los módulos de escritura segura están en la carpeta U5, compartidos con la sección de CSV,
+# y el conversor usa la lectura por rangos de 03_ficheros_csv
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "03_ficheros_csv"))
+
+from almacen_catalogo import AlmacenCatalogo  # noqa: E402
+# cargar()/volcar()/cargas()/volcados() hacen lo mismo que json.load()/dump()/loads()/dumps(),
+# con orjson si está instalado
+from codec_json import cargar, cargas, volcados, volcar  # noqa: E402
+from coleccion_json import Coleccion  # noqa: E402
+from combinar_json import combinar_json  # noqa: E402
+from conversor_csv_json import CARPETA_CSV, csv_a_json, json_a_csv  # noqa: E402
+from escritura_atomica import ArchivoJSON, abrir_atomico  # noqa: E402
+from json_flujo import EscritorArrayJSON, leer_array_json  # noqa: E402
+from json_lineas import AlmacenJSONL, array_a_jsonl  # noqa: E402
+from json_perezoso import DocumentoPerezoso  # noqa: E402
 
 # ═══════════════════════════════════════════════════════════════════════════
 # 1. LECTURA DE JSON - json.load()
@@ -41,11 +60,11 @@ paises_data = [
 ]
 
 with open("paises.json", "w", encoding="utf-8") as f:
-    json.dump(paises_data, f, ensure_ascii=False, indent=2)
+    volcar(paises_data, f, ensure_ascii=False, indent=2)
 
 try:
     with open("paises.json", "r", encoding="utf-8") as archivo:
-        paises = json.load(archivo)
+        paises = cargar(archivo)
         
         print(f"Tipo de dato: {type(paises)}")
         print(f"Número de países: {len(paises)}")
@@ -72,11 +91,11 @@ usuario_data = {
 }
 
 with open("usuario.json", "w", encoding="utf-8") as f:
-    json.dump(usuario_data, f, ensure_ascii=False, indent=2)
+    volcar(usuario_data, f, ensure_ascii=False, indent=2)
 
 try:
     with open("usuario.json", "r", encoding="utf-8") as archivo:
-        usuario = json.load(archivo)
+        usuario = cargar(archivo)
         
         print(f"Nombre: {usuario['nombre']}")
         print(f"Edad: {usuario['edad']}")
@@ -106,11 +125,11 @@ persona_data = {
 }
 
 with open("persona.json", "w", encoding="utf-8") as f:
-    json.dump(persona_data, f, ensure_ascii=False, indent=2)
+    volcar(persona_data, f, ensure_ascii=False, indent=2)
 
 try:
     with open("persona.json", "r", encoding="utf-8") as archivo:
-        persona = json.load(archivo)
+        persona = cargar(archivo)
         
         print(f"Nombre: {persona['nombre']}")
         print(f"Ciudad: {persona['direccion']['ciudad']}")
@@ -141,7 +160,7 @@ capitales = [
 
 try:
     with open("capitales.json", "w", encoding="utf-8") as archivo:
-        json.dump(capitales, archivo, ensure_ascii=False, indent=4)
+        volcar(capitales, archivo, ensure_ascii=False, indent=4)
     
     print("✓ Archivo 'capitales.json' creado correctamente.")
     
@@ -166,7 +185,7 @@ producto = {
 
 try:
     with open("producto.json", "w", encoding="utf-8") as archivo:
-        json.dump(producto, archivo, ensure_ascii=False, indent=2)
+        volcar(producto, archivo, ensure_ascii=False, indent=2)
     
     print("✓ Archivo 'producto.json' creado.")
     
@@ -180,7 +199,7 @@ datos_compactos = {"nombre": "Test", "valor": 42, "activo": True}
 
 try:
     with open("compacto.json", "w", encoding="utf-8") as archivo:
-        json.dump(datos_compactos, archivo, ensure_ascii=False)
+        volcar(datos_compactos, archivo, ensure_ascii=False)
     
     print("✓ Archivo compacto creado.")
     
@@ -213,7 +232,7 @@ cadena_json = """
 """
 
 try:
-    paises = json.loads(cadena_json)
+    paises = cargas(cadena_json)
     print(f"Tipo de dato obtenido: {type(paises)}")
     
     for pais in paises:
@@ -227,12 +246,12 @@ except Exception as e:
 # EJEMPLO 2: Convertir diferentes tipos
 print("\n--- EJEMPLO 2: Conversión de diferentes tipos ---")
 
-print("Lista:", json.loads('[1, 2, 3, 4, 5]'))
-print("Diccionario:", json.loads('{"nombre": "Ana", "edad": 25}'))
-print("Cadena:", json.loads('"Hola Mundo"'))
-print("Número:", json.loads('42'))
-print("Booleano:", json.loads('true'))
-print("Null:", json.loads('null'))
+print("Lista:", cargas('[1, 2, 3, 4, 5]'))
+print("Diccionario:", cargas('{"nombre": "Ana", "edad": 25}'))
+print("Cadena:", cargas('"Hola Mundo"'))
+print("Número:", cargas('42'))
+print("Booleano:", cargas('true'))
+print("Null:", cargas('null'))
 
 # EJEMPLO 3: Parsear respuesta API simulada
 print("\n--- EJEMPLO 3: Simular respuesta de API ---")
@@ -248,7 +267,7 @@ respuesta_api = """{
 }"""
 
 try:
-    datos = json.loads(respuesta_api)
+    datos = cargas(respuesta_api)
     
     if datos['status'] == 'success':
         print("✓ Petición exitosa")
@@ -278,7 +297,7 @@ pais = {
     "superficie_km2": 103000,
 }
 
-cadena_json = json.dumps(pais, indent=2, sort_keys=True)
+cadena_json = volcados(pais, indent=2, sort_keys=True)
 print(cadena_json)
 
 # EJEMPLO 2: Diferentes opciones de formateo
@@ -287,20 +306,20 @@ print("\n--- EJEMPLO 2: Opciones de formateo ---")
 datos = {"nombre": "Python", "versión": 3.11, "gratis": True}
 
 print("Sin formateo:")
-print(json.dumps(datos))
+print(volcados(datos))
 
 print("\nCon indentación de 2 espacios:")
-print(json.dumps(datos, indent=2))
+print(volcados(datos, indent=2))
 
 print("\nCon indentación de 4 espacios:")
-print(json.dumps(datos, indent=4))
+print(volcados(datos, indent=4))
 
 print("\nCon claves ordenadas:")
-print(json.dumps(datos, indent=2, sort_keys=True))
+print(volcados(datos, indent=2, sort_keys=True))
 
 print("\nCon ensure_ascii=False (permite caracteres Unicode):")
 texto_unicode = {"mensaje": "Hola, España 🇪🇸"}
-print(json.dumps(texto_unicode, ensure_ascii=False))
+print(volcados(texto_unicode, ensure_ascii=False))
 
 # EJEMPLO 3: Separadores personalizados
 print("\n--- EJEMPLO 3: Separadores personalizados ---")
@@ -308,10 +327,10 @@ print("\n--- EJEMPLO 3: Separadores personalizados ---")
 datos = {"a": 1, "b": 2, "c": 3}
 
 print("Compacto (sin espacios):")
-print(json.dumps(datos, separators=(',', ':')))
+print(volcados(datos, separators=(',', ':')))
 
 print("\nCon espacios:")
-print(json.dumps(datos, separators=(', ', ': ')))
+print(volcados(datos, separators=(', ', ': ')))
 
 print()
 
@@ -367,12 +386,12 @@ datos_python = {
     "diccionario": {"clave": "valor"}
 }
 
-json_string = json.dumps(datos_python, indent=2)
+json_string = volcados(datos_python, indent=2)
 print("Python → JSON:")
 print(json_string)
 
 print("\nJSON → Python:")
-datos_recuperados = json.loads(json_string)
+datos_recuperados = cargas(json_string)
 for clave, valor in datos_recuperados.items():
     print(f"  {clave}: {valor} (tipo: {type(valor).__name__})")
 
@@ -398,20 +417,20 @@ datos_ejemplo = {
 print("\n--- OPCIONES DE FORMATEO ---\n")
 
 print("1. Sin formateo (una línea):")
-print(json.dumps(datos_ejemplo))
+print(volcados(datos_ejemplo))
 
 print("\n2. Con indent=2:")
-print(json.dumps(datos_ejemplo, indent=2))
+print(volcados(datos_ejemplo, indent=2))
 
 print("\n3. Con indent=4 y sort_keys=True:")
-print(json.dumps(datos_ejemplo, indent=4, sort_keys=True))
+print(volcados(datos_ejemplo, indent=4, sort_keys=True))
 
 print("\n4. Compacto (sin espacios):")
-print(json.dumps(datos_ejemplo, separators=(',', ':')))
+print(volcados(datos_ejemplo, separators=(',', ':')))
 
 print("\n5. Con ensure_ascii=False (caracteres especiales):")
 datos_unicode = {"mensaje": "España, México, Perú 🌍"}
-print(json.dumps(datos_unicode, ensure_ascii=False, indent=2))
+print(volcados(datos_unicode, ensure_ascii=False, indent=2))
 
 print()
 
@@ -471,7 +490,7 @@ print("\n--- EJEMPLOS de errores comunes ---\n")
 # Error 1: JSON inválido
 print("1. JSON inválido (falta comilla):")
 try:
-    json.loads('{"nombre: "Ana"}')
+    cargas('{"nombre: "Ana"}')
 except json.JSONDecodeError as e:
     print(f"   ✗ JSONDecodeError: {e.msg}")
 
@@ -479,7 +498,7 @@ except json.JSONDecodeError as e:
 print("\n2. Archivo no existe:")
 try:
     with open("archivo_inexistente.json", "r") as f:
-        json.load(f)
+        cargar(f)
 except FileNotFoundError:
     print("   ✗ FileNotFoundError: El archivo no existe.")
 
@@ -488,7 +507,7 @@ print("\n3. Tipo de dato no serializable:")
 try:
     import datetime
     datos = {"fecha": datetime.datetime.now()}
-    json.dumps(datos)
+    volcados(datos)
 except TypeError as e:
     print(f"   ✗ TypeError: {e}")
 
@@ -544,25 +563,31 @@ empresa = {
 
 # Guardar
 with open("empresa.json", "w", encoding="utf-8") as f:
-    json.dump(empresa, f, ensure_ascii=False, indent=2)
+    volcar(empresa, f, ensure_ascii=False, indent=2)
 
 # Leer y acceder a datos anidados
-with open("empresa.json", "r", encoding="utf-8") as f:
-    datos = json.load(f)
+# DocumentoPerezoso se usa igual que el diccionario de json.load(), pero solo
+# convierte a Python las partes del archivo por las que se pasa
+with DocumentoPerezoso.abrir("empresa.json") as datos:
+    print(f"Empresa: {datos['nombre']}")
+    print(f"Primer empleado: {datos['empleados'][0]['nombre']}")
+    print(f"Departamento: {datos['empleados'][0]['departamento']['nombre']}")
+    print(f"Primer proyecto: {datos['empleados'][0]['proyectos'][0]}")
+    print(f"Oficina principal: {datos['oficinas']['principal']['ciudad']}")
 
-print(f"Empresa: {datos['nombre']}")
-print(f"Primer empleado: {datos['empleados'][0]['nombre']}")
-print(f"Departamento: {datos['empleados'][0]['departamento']['nombre']}")
-print(f"Primer proyecto: {datos['empleados'][0]['proyectos'][0]}")
-print(f"Oficina principal: {datos['oficinas']['principal']['ciudad']}")
+    # EJEMPLO 2: Recorrer estructura anidada
+    print("\n--- EJEMPLO 2: Recorrer JSON anidado ---")
 
-# EJEMPLO 2: Recorrer estructura anidada
-print("\n--- EJEMPLO 2: Recorrer JSON anidado ---")
+    for empleado in datos['empleados']:
+        print(f"\n{empleado['nombre']} - {empleado['puesto']}")
+        print(f"  Departamento: {empleado['departamento']['nombre']}")
+        print(f"  Proyectos: {', '.join(empleado['proyectos'])}")
 
-for empleado in datos['empleados']:
-    print(f"\n{empleado['nombre']} - {empleado['puesto']}")
-    print(f"  Departamento: {empleado['departamento']['nombre']}")
-    print(f"  Proyectos: {', '.join(empleado['proyectos'])}")
+    # EJEMPLO 3: Selectores (estilo JSONPath) sobre la estructura anidada
+    print("\n--- EJEMPLO 3: Selectores sobre JSON anidado ---")
+
+    print(f"Departamentos: {datos.seleccionar('empleados[*].departamento.nombre')}")
+    print(f"Ciudades de las oficinas: {datos.seleccionar('oficinas.*.ciudad')}")
 
 print()
 
@@ -580,23 +605,24 @@ print("\n--- EJERCICIO 1: Filtrar países por continente ---")
 def filtrar_paises_por_continente():
     """Lee paises.json, filtra por continente y guarda resultado"""
     try:
-        with open("paises.json", "r", encoding="utf-8") as f:
-            paises = json.load(f)
-        
         # Filtrar por Europa (puedes cambiar el continente)
         continente_buscar = "Europa"
-        filtrados = [p for p in paises if p["continente"] == continente_buscar]
         
-        if filtrados:
-            print(f"✓ Países en {continente_buscar}:")
-            for p in filtrados:
-                print(f"  - {p['nombre']} ({p['poblacion']} millones)")
-            
-            # Guardar resultado
-            with open("paises_filtrados.json", "w", encoding="utf-8") as f:
-                json.dump(filtrados, f, ensure_ascii=False, indent=2)
-            
-            print(f"\n✓ Archivo 'paises_filtrados.json' creado con {len(filtrados)} países.")
+        # Se lee y se escribe país a país: nunca está el archivo entero en memoria.
+        # El resultado solo sustituye al anterior si se ha leído paises.json entero
+        with open("paises.json", "r", encoding="utf-8") as entrada, \
+             abrir_atomico("paises_filtrados.json") as salida:
+            escritor = EscritorArrayJSON(salida, ensure_ascii=False, indent=2)
+            for p in leer_array_json(entrada):
+                if p["continente"] == continente_buscar:
+                    if escritor.escritos == 0:
+                        print(f"✓ Países en {continente_buscar}:")
+                    print(f"  - {p['nombre']} ({p['poblacion']} millones)")
+                    escritor.escribir(p)
+            escritor.cerrar()
+        
+        if escritor.escritos:
+            print(f"\n✓ Archivo 'paises_filtrados.json' creado con {escritor.escritos} países.")
         else:
             print(f"⚠ No se encontraron países en {continente_buscar}.")
     
@@ -610,33 +636,52 @@ filtrar_paises_por_continente()
 # EJERCICIO 2: Agregar datos a JSON existente
 print("\n--- EJERCICIO 2: Agregar nuevo país a JSON ---")
 
+def anadir_pais(paises, nuevo_pais):
+    """Cambio que se aplica a la lista de países; devuelve el total"""
+    paises.append(nuevo_pais)
+    return len(paises)
+
 def agregar_pais(nombre, continente, poblacion):
     """Agrega un nuevo país al archivo paises.json"""
     try:
-        # Leer datos existentes
-        with open("paises.json", "r", encoding="utf-8") as f:
-            paises = json.load(f)
-        
-        # Agregar nuevo país
         nuevo_pais = {
             "nombre": nombre,
             "continente": continente,
             "poblacion": poblacion
         }
-        paises.append(nuevo_pais)
         
-        # Guardar actualizado
-        with open("paises.json", "w", encoding="utf-8") as f:
-            json.dump(paises, f, ensure_ascii=False, indent=2)
+        # Leer, agregar y guardar con el archivo bloqueado para otros procesos;
+        # se escribe un temporal que sustituye a paises.json solo si todo va bien
+        total = ArchivoJSON("paises.json", anadir_pais, inicial=[]).actualizar(nuevo_pais)
         
         print(f"✓ País '{nombre}' agregado correctamente.")
-        print(f"  Total de países ahora: {len(paises)}")
+        print(f"  Total de países ahora: {total}")
         
     except Exception as e:
         print(f"⚠ Error: {e}")
 
 agregar_pais("Argentina", "América", 45)
 
+# EJERCICIO 2 (bis): Lo mismo con JSON Lines, sin reescribir el archivo
+print("\n--- EJERCICIO 2 (bis): Agregar países a un archivo JSON Lines ---")
+
+def agregar_pais_jsonl(nombre, continente, poblacion):
+    """Agrega un país al final de paises.jsonl (una línea por país)"""
+    try:
+        # La primera vez se convierte el array de paises.json a JSON Lines
+        if not os.path.exists("paises.jsonl"):
+            array_a_jsonl("paises.json", "paises.jsonl")
+        
+        with AlmacenJSONL("paises.jsonl") as almacen:
+            almacen.anadir({"nombre": nombre, "continente": continente, "poblacion": poblacion})
+        
+        print(f"✓ País '{nombre}' agregado a 'paises.jsonl' sin reescribir el archivo.")
+        
+    except Exception as e:
+        print(f"⚠ Error: {e}")
+
+agregar_pais_jsonl("Chile", "América", 19)
+
 # EJERCICIO 3: Convertir CSV a JSON
 print("\n--- EJERCICIO 3: Convertir lista Python a JSON ---")
 
@@ -675,7 +720,7 @@ def crear_catalogo_json():
     
     try:
         with open("catalogo.json", "w", encoding="utf-8") as f:
-            json.dump(catalogo, f, ensure_ascii=False, indent=2)
+            volcar(catalogo, f, ensure_ascii=False, indent=2)
         
         print("✓ Catálogo JSON creado con éxito.")
         print(f"  Tienda: {catalogo['tienda']}")
@@ -686,40 +731,70 @@ def crear_catalogo_json():
 
 crear_catalogo_json()
 
+# EJERCICIO 3 (bis): Convertir de verdad un CSV de la sección de CSV a JSON
+print("\n--- EJERCICIO 3 (bis): Convertir ciudades.csv a JSON y de vuelta ---")
+
+def convertir_ciudades():
+    """Convierte ciudades.csv en JSON (deduciendo los tipos) y otra vez en CSV"""
+    try:
+        informe = csv_a_json(os.path.join(CARPETA_CSV, "ciudades.csv"), "ciudades.json")
+        print(f"✓ {informe['filas']} ciudades guardadas en 'ciudades.json'. Tipos: {informe['tipos']}")
+        
+        informe = json_a_csv("ciudades.json", "ciudades_desde_json.csv")
+        print(f"✓ {informe['filas']} filas de vuelta en 'ciudades_desde_json.csv'.")
+        
+    except FileNotFoundError as e:
+        print(f"⚠ Archivo no encontrado: {e.filename}")
+
+convertir_ciudades()
+
 # EJERCICIO 4: Actualizar valores en JSON
 print("\n--- EJERCICIO 4: Actualizar stock de producto ---")
 
 def actualizar_stock_producto(producto_id, nuevo_stock):
     """Actualiza el stock de un producto en el catálogo"""
     try:
-        with open("catalogo.json", "r", encoding="utf-8") as f:
-            catalogo = json.load(f)
-        
-        # Buscar y actualizar producto
-        encontrado = False
-        for producto in catalogo['productos']:
-            if producto['id'] == producto_id:
-                producto['stock'] = nuevo_stock
-                producto['disponible'] = nuevo_stock > 0
-                encontrado = True
-                print(f"✓ Stock de '{producto['nombre']}' actualizado a {nuevo_stock}")
-                break
-        
-        if not encontrado:
-            print(f"⚠ Producto con ID '{producto_id}' no encontrado.")
-            return
-        
-        # Guardar cambios
-        with open("catalogo.json", "w", encoding="utf-8") as f:
-            json.dump(catalogo, f, ensure_ascii=False, indent=2)
+        # Acceso directo por id (sin buscar producto a producto); el cambio se
+        # apunta en un diario y catalogo.json se reescribe solo al cerrar
+        with AlmacenCatalogo("catalogo.json") as catalogo:
+            producto = catalogo.actualizar_stock(producto_id, nuevo_stock)
+            print(f"✓ Stock de '{producto['nombre']}' actualizado a {nuevo_stock}")
         
         print("✓ Catálogo actualizado.")
         
+    except KeyError:
+        print(f"⚠ Producto con ID '{producto_id}' no encontrado.")
     except Exception as e:
         print(f"⚠ Error: {e}")
 
 actualizar_stock_producto("P003", 25)
 
+# EJERCICIO 4 (bis): Consultas repetidas con índices por campo
+print("\n--- EJERCICIO 4 (bis): Consultar productos y países con índices ---")
+
+def consultar_con_indices():
+    """Carga cada archivo una vez y responde varias consultas sin recorrerlo"""
+    try:
+        catalogo = Coleccion.desde_json("catalogo.json", clave="productos",
+                                        hash=["categoria", "disponible"], ordenados=["precio"])
+        accesorios = catalogo.buscar(categoria="Accesorios", disponible=True)
+        print(f"✓ Accesorios disponibles: {[p['nombre'] for p in accesorios]}")
+        
+        # Los índices se actualizan con el cambio, sin reconstruirlos
+        ids = catalogo.ids(categoria="Accesorios", disponible=False)
+        for producto_id in ids:
+            catalogo.actualizar(producto_id, disponible=True)
+        print(f"✓ Tras reponer: {len(catalogo.buscar(categoria='Accesorios', disponible=True))} accesorios disponibles")
+        
+        paises = Coleccion.desde_json("paises.json", hash=["continente"], ordenados=["poblacion"])
+        grandes = paises.rango("poblacion", mayor_que=40)
+        print(f"✓ Países con más de 40 millones: {[p['nombre'] for p in grandes]}")
+        
+    except FileNotFoundError as e:
+        print(f"⚠ Archivo no encontrado: {e.filename}")
+
+consultar_con_indices()
+
 # EJERCICIO 5: Combinar múltiples JSON
 print("\n--- EJERCICIO 5: Combinar múltiples archivos JSON ---")
 
@@ -730,25 +805,16 @@ def combinar_json_files():
     usuarios2 = [{"id": 3, "nombre": "María"}, {"id": 4, "nombre": "Carlos"}]
     
     with open("usuarios1.json", "w", encoding="utf-8") as f:
-        json.dump(usuarios1, f)
+        volcar(usuarios1, f)
     with open("usuarios2.json", "w", encoding="utf-8") as f:
-        json.dump(usuarios2, f)
+        volcar(usuarios2, f)
     
     try:
-        # Leer ambos archivos
-        with open("usuarios1.json", "r") as f:
-            datos1 = json.load(f)
-        with open("usuarios2.json", "r") as f:
-            datos2 = json.load(f)
-        
-        # Combinar
-        todos_usuarios = datos1 + datos2
-        
-        # Guardar combinado
-        with open("todos_usuarios.json", "w", encoding="utf-8") as f:
-            json.dump(todos_usuarios, f, indent=2)
+        # Se leen y escriben elemento a elemento: sirve igual para cientos de archivos
+        informe = combinar_json(["usuarios1.json", "usuarios2.json"], "todos_usuarios.json", clave="id")
         
-        print(f"✓ Archivos combinados: {len(todos_usuarios)} usuarios total.")
+        print(f"✓ Archivos combinados: {informe['escritos']} usuarios total "
+              f"({informe['duplicados']} duplicados descartados).")
         
     except Exception as e:
         print(f"⚠ Error: {e}")
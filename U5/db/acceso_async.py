@@ -0,0 +1,307 @@
+"""
+acceso_async: Consultas de U5 en paralelo con asyncio y un pool de conexiones
+En MySQL usa mysql.connector.aio; sin servidor, el mismo código funciona
+sobre SQLite ejecutando cada sentencia en un hilo con asyncio.to_thread.
+- El pool abre un número fijo de conexiones: como mucho hay ese número de
+  consultas a la vez en la base de datos.
+- Cada conexión guarda sus sentencias preparadas (un cursor por SQL) para no
+  volver a prepararlas en cada llamada.
+- ejecutar_carga() reparte las peticiones desde una cola acotada: si los
+  trabajadores no dan abasto, el productor espera (contrapresión) en lugar
+  de acumular peticiones en memoria. Al final informa de los percentiles
+  p50 y p99 de la latencia.
+"""
+
+import asyncio
+import math
+import sqlite3
+import time
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+
+from repositorio import CONFIG_MYSQL, RUTA_SQLITE, marcadores_sqlite
+
+try:
+    import mysql.connector.aio as mysql_aio
+    from mysql.connector import errors as mysql_errores
+except ImportError:  # Sin el conector solo está disponible SQLite
+    mysql_aio = None
+
+TAM_POOL = 4
+TAM_CACHE = 32  # Sentencias preparadas que guarda cada conexión
+TAM_COLA = 100  # Peticiones pendientes antes de que el productor tenga que esperar
+
+
+class _CacheSentencias:
+    """SQL → cursor preparado, con las menos usadas cerradas al pasar de tam"""
+
+    def __init__(self, tam=TAM_CACHE):
+        self.tam = tam
+        self.cursores = OrderedDict()
+
+    def obtener(self, sql):
+        cursor = self.cursores.get(sql)
+        if cursor is not None:
+            self.cursores.move_to_end(sql)
+        return cursor
+
+    def guardar(self, sql, cursor):
+        """Guarda el cursor y devuelve el que sale de la caché (para cerrarlo) o None"""
+        self.cursores[sql] = cursor
+        if len(self.cursores) > self.tam:
+            return self.cursores.popitem(last=False)[1]
+        return None
+
+
+class _ConexionSQLite:
+    Error = sqlite3.Error
+
+    def __init__(self, ruta, tam_cache):
+        # La usa una sola tarea a la vez (la del pool), aunque desde hilos distintos
+        self.conexion = sqlite3.connect(ruta, isolation_level=None, check_same_thread=False, timeout=30)
+        self.conexion.row_factory = sqlite3.Row
+        self.conexion.execute("PRAGMA journal_mode=WAL")
+        self.sentencias = _CacheSentencias(tam_cache)
+
+    @classmethod
+    async def abrir(cls, ruta, tam_cache=TAM_CACHE):
+        return await asyncio.to_thread(cls, ruta, tam_cache)
+
+    def _ejecutar(self, sql, parametros):
+        cursor = self.sentencias.obtener(sql)
+        if cursor is None:
+            cursor = self.conexion.cursor()
+            viejo = self.sentencias.guardar(sql, cursor)
+            if viejo is not None:
+                viejo.close()
+        cursor.execute(marcadores_sqlite(sql), parametros)
+        return cursor
+
+    def _consultar(self, sql, parametros):
+        return [dict(fila) for fila in self._ejecutar(sql, parametros).fetchall()]
+
+    async def consultar(self, sql, parametros=()):
+        return await asyncio.to_thread(self._consultar, sql, tuple(parametros))
+
+    async def ejecutar(self, sql, parametros=()):
+        cursor = await asyncio.to_thread(self._ejecutar, sql, tuple(parametros))
+        return cursor.rowcount
+
+    async def cerrar(self):
+        await asyncio.to_thread(self.conexion.close)
+
+
+class _ConexionMySQL:
+    def __init__(self, conexion, tam_cache):
+        self.conexion = conexion
+        self.sentencias = _CacheSentencias(tam_cache)
+
+    @classmethod
+    async def abrir(cls, config, tam_cache=TAM_CACHE):
+        if mysql_aio is None:
+            raise RuntimeError("mysql-connector-python no está instalado (está en el entorno de U5/db)")
+        cls.Error = mysql_errores.Error  # mysql.connector.aio no tiene su propia clase Error
+        conexion = await mysql_aio.connect(**config)
+        await conexion.set_autocommit(True)
+        return cls(conexion, tam_cache)
+
+    async def _ejecutar(self, sql, parametros):
+        # El cursor preparado solo recuerda su última sentencia: uno por SQL
+        cursor = self.sentencias.obtener(sql)
+        if cursor is None:
+            cursor = await self.conexion.cursor(prepared=True, dictionary=True)
+            viejo = self.sentencias.guardar(sql, cursor)
+            if viejo is not None:
+                await viejo.close()  # Libera la sentencia en el servidor
+        await cursor.execute(sql, parametros)
+        return cursor
+
+    async def consultar(self, sql, parametros=()):
+        cursor = await self._ejecutar(sql, tuple(parametros))
+        return await cursor.fetchall()
+
+    async def ejecutar(self, sql, parametros=()):
+        cursor = await self._ejecutar(sql, tuple(parametros))
+        return cursor.rowcount
+
+    async def cerrar(self):
+        for cursor in self.sentencias.cursores.values():
+            await cursor.close()
+        await self.conexion.close()
+
+
+class PoolAsync:
+    """
+    Pool de tamano conexiones. Se usa con "async with PoolAsync.sqlite(...) as pool"
+    y cada operación toma una conexión libre y la devuelve al terminar.
+    """
+
+    def __init__(self, abrir_conexion, tamano=TAM_POOL):
+        self.abrir_conexion = abrir_conexion  # Función async que devuelve una conexión nueva
+        self.tamano = tamano
+        self._libres = None
+        self._todas = []
+        self.Error = None  # Clase de error del conector, al abrir
+
+    @classmethod
+    def sqlite(cls, ruta=RUTA_SQLITE, tamano=TAM_POOL, tam_cache=TAM_CACHE):
+        return cls(lambda: _ConexionSQLite.abrir(ruta, tam_cache), tamano)
+
+    @classmethod
+    def mysql(cls, tamano=TAM_POOL, tam_cache=TAM_CACHE, **config):
+        return cls(lambda: _ConexionMySQL.abrir({**CONFIG_MYSQL, **config}, tam_cache), tamano)
+
+    async def abrir(self):
+        self._todas = list(await asyncio.gather(*(self.abrir_conexion() for _ in range(self.tamano))))
+        self.Error = self._todas[0].Error
+        self._libres = asyncio.Queue()
+        for conexion in self._todas:
+            self._libres.put_nowait(conexion)
+        return self
+
+    async def cerrar(self):
+        await asyncio.gather(*(conexion.cerrar() for conexion in self._todas))
+        self._todas = []
+
+    async def __aenter__(self):
+        return await self.abrir()
+
+    async def __aexit__(self, tipo, valor, traza):
+        await self.cerrar()
+
+    @asynccontextmanager
+    async def conexion(self):
+        """Espera a que haya una conexión libre y la devuelve al pool al salir"""
+        conexion = await self._libres.get()
+        try:
+            yield conexion
+        finally:
+            self._libres.put_nowait(conexion)
+
+    async def consultar(self, sql, parametros=()):
+        async with self.conexion() as conexion:
+            return await conexion.consultar(sql, parametros)
+
+    async def ejecutar(self, sql, parametros=()):
+        async with self.conexion() as conexion:
+            return await conexion.ejecutar(sql, parametros)
+
+    # ─── Operaciones de los ejercicios ───
+
+    async def ciudades_de_pais(self, pais):
+        return await self.consultar(
+            "SELECT nombre, pais, poblacion_millones FROM ciudades WHERE pais = %s ORDER BY nombre", (pais,))
+
+    async def paises_por_continente(self, continente):
+        return await self.consultar(
+            "SELECT nombre, continente, poblacion FROM paises WHERE continente = %s ORDER BY nombre",
+            (continente,))
+
+    async def media_alumno(self, alumno):
+        filas = await self.consultar(
+            "SELECT ROUND((primera + segunda + tercera) / 3, 2) AS media FROM notas WHERE alumno = %s",
+            (alumno,))
+        return filas[0]["media"] if filas else None
+
+    async def actualizar_stock(self, producto_id, nuevo_stock):
+        """Cambia el stock y la disponibilidad; KeyError si el producto no existe"""
+        async with self.conexion() as conexion:
+            cambiadas = await conexion.ejecutar(
+                "UPDATE productos SET stock = %s, disponible = %s WHERE id = %s",
+                (nuevo_stock, nuevo_stock > 0, producto_id))
+            # MySQL cuenta 0 filas si los valores no cambian: se comprueba si existe
+            if cambiadas == 0 and not await conexion.consultar(
+                    "SELECT id FROM productos WHERE id = %s", (producto_id,)):
+                raise KeyError(f"Producto con ID '{producto_id}' no encontrado")
+            return cambiadas
+
+
+# ─── Carga de trabajo y latencias ───
+
+def percentil(valores, p):
+    """Percentil p (0-100) por rango más cercano de una lista ya ordenada"""
+    if not valores:
+        return None
+    posicion = max(0, min(len(valores) - 1, math.ceil(p / 100 * len(valores)) - 1))
+    return valores[posicion]
+
+
+async def ejecutar_carga(pool, peticiones, concurrencia=None, tam_cola=TAM_COLA):
+    """
+    Ejecuta peticiones (iterable de (nombre_operacion, *argumentos)) con
+    concurrencia tareas. Devuelve un informe con totales, errores por tipo,
+    operaciones por segundo y p50/p99 de latencia en milisegundos.
+    """
+    concurrencia = concurrencia or pool.tamano
+    cola = asyncio.Queue(maxsize=tam_cola)
+    latencias, errores = [], {}
+
+    async def trabajador():
+        while True:
+            peticion = await cola.get()
+            if peticion is None:
+                return
+            operacion, *argumentos = peticion
+            inicio = time.perf_counter()
+            try:
+                await getattr(pool, operacion)(*argumentos)
+            except Exception as e:  # Si el trabajador terminara, el productor se quedaría esperando con la cola llena
+                errores[type(e).__name__] = errores.get(type(e).__name__, 0) + 1
+            latencias.append(time.perf_counter() - inicio)
+
+    inicio = time.perf_counter()
+    tareas = [asyncio.create_task(trabajador()) for _ in range(concurrencia)]
+    for peticion in peticiones:
+        await cola.put(peticion)  # Espera si la cola está llena
+    for _ in tareas:
+        await cola.put(None)
+    await asyncio.gather(*tareas)
+    segundos = time.perf_counter() - inicio
+
+    latencias.sort()
+    return {
+        "peticiones": len(latencias),
+        "errores": errores,
+        "por_segundo": round(len(latencias) / segundos) if segundos else None,
+        "p50_ms": round(percentil(latencias, 50) * 1000, 3) if latencias else None,
+        "p99_ms": round(percentil(latencias, 99) * 1000, 3) if latencias else None,
+    }
+
+
+async def carga_u5(pool, total, semilla=0):
+    """Mezcla de búsquedas por país, medias de alumnos y cambios de stock con los datos de la base"""
+    import random
+
+    aleatorio = random.Random(semilla)
+    tipos = []
+    paises = [f["pais"] for f in await pool.consultar("SELECT DISTINCT pais FROM ciudades")]
+    alumnos = [f["alumno"] for f in await pool.consultar("SELECT alumno FROM notas")]
+    productos = [f["id"] for f in await pool.consultar("SELECT id FROM productos")]
+    if paises:
+        tipos.append(lambda: ("ciudades_de_pais", aleatorio.choice(paises)))
+    if alumnos:
+        tipos.append(lambda: ("media_alumno", aleatorio.choice(alumnos)))
+    if productos:
+        tipos.append(lambda: ("actualizar_stock", aleatorio.choice(productos), aleatorio.randint(0, 50)))
+    if not tipos:
+        return []
+    return [aleatorio.choice(tipos)() for _ in range(total)]
+
+
+async def _demo(ruta, total):
+    for tamano in (1, 4, 8):
+        async with PoolAsync.sqlite(ruta, tamano=tamano) as pool:
+            peticiones = await carga_u5(pool, total)
+            informe = await ejecutar_carga(pool, peticiones)
+        print(f"pool de {tamano}: {informe}")
+
+
+if __name__ == "__main__":
+    import sys
+
+    from repositorio import Repositorio, importar_datos_u5
+
+    with Repositorio.sqlite() as repo:
+        repo.crear_tablas()
+        importar_datos_u5(repo)
+    asyncio.run(_demo(RUTA_SQLITE, int(sys.argv[1]) if len(sys.argv) > 1 else 5000))
@@ -0,0 +1,167 @@
+"""
+cache_consultas: Caché de resultados de consultas para Repositorio
+Guarda el resultado de cada SELECT con clave (SQL normalizado, parámetros),
+como mucho capacidad resultados (se expulsa el menos usado) y durante ttl
+segundos. Cada tabla tiene un contador de versión: las escrituras que pasan
+por el repositorio (agregar_pais, actualizar_stock, insertar...) lo
+incrementan y los resultados guardados con una versión anterior dejan de
+valer. Si no se reconocen las tablas de una consulta (una subconsulta en
+el FROM, por ejemplo), su resultado deja de valer con cualquier escritura.
+Lo que cambie otro programa en la base de datos solo se nota al caducar el ttl.
+
+    repo = Repositorio.sqlite(cache=CacheConsultas(capacidad=512, ttl=30))
+"""
+
+import re
+import time
+from collections import OrderedDict
+from functools import lru_cache
+
+CAPACIDAD = 256
+TTL = 60.0  # Segundos
+
+TODAS = "*"  # En tablas_de(): la sentencia puede usar cualquier tabla
+
+_TABLAS = re.compile(r"\b(?:JOIN|INTO|UPDATE|TABLE)\s+`?([A-Za-z_]\w*)", re.IGNORECASE)
+_FROM = re.compile(r"\bFROM\b", re.IGNORECASE)
+# Una tabla de la lista del FROM con su alias opcional y la coma que la sigue, si hay otra
+_TABLA_FROM = re.compile(
+    r"\s*`?([A-Za-z_]\w*)`?(?:\s+(?:AS\s+)?(?!(?:WHERE|GROUP|ORDER|LIMIT|HAVING|UNION|JOIN|INNER|LEFT|RIGHT"
+    r"|CROSS|NATURAL|FULL|ON|USING)\b)`?[A-Za-z_]\w*`?)?\s*(,)?", re.IGNORECASE)
+_CADENAS = re.compile(r"('(?:[^']|'')*')")
+_ESPACIOS = re.compile(r"\s+")
+
+
+@lru_cache(maxsize=1024)
+def normalizar_sql(sql):
+    """Une los espacios y saltos de línea (fuera de las cadenas) y quita el ';' final"""
+    partes = _CADENAS.split(sql.strip().rstrip(";").strip())
+    for i in range(0, len(partes), 2):
+        partes[i] = _ESPACIOS.sub(" ", partes[i])
+    return "".join(partes)
+
+
+def _tablas_from(sql, desde):
+    """Tablas de la lista separada por comas que empieza en desde; TODAS si hay algo que no es una tabla"""
+    tablas = []
+    while True:
+        encontrada = _TABLA_FROM.match(sql, desde)
+        if encontrada is None:
+            return [TODAS]  # Subconsulta u otra cosa: no se sabe qué tablas usa
+        tablas.append(encontrada.group(1))
+        if encontrada.group(2) is None:
+            return tablas
+        desde = encontrada.end()
+
+
+@lru_cache(maxsize=1024)
+def tablas_de(sql):
+    """Tablas que lee o escribe la sentencia (con TODAS si no se reconocen)"""
+    sql = _CADENAS.sub("''", sql)
+    nombres = _TABLAS.findall(sql)
+    for desde in _FROM.finditer(sql):
+        nombres.extend(_tablas_from(sql, desde.end()))
+    return frozenset(nombre.lower() for nombre in nombres)
+
+
+class CacheConsultas:
+    """LRU con caducidad e invalidación por tabla"""
+
+    def __init__(self, capacidad=CAPACIDAD, ttl=TTL, reloj=time.monotonic):
+        self.capacidad = capacidad
+        self.ttl = ttl
+        self.reloj = reloj
+        self._entradas = OrderedDict()  # clave → (caduca, tablas, versiones, filas)
+        self._versiones = {}
+        self._generacion = 0  # Sube con invalidar() sin tabla: vale para todas
+        self._cambios = 0  # Sube con cualquier invalidación: la versión de TODAS
+        self.aciertos = self.fallos = self.expulsiones = self.caducadas = self.invalidadas = 0
+
+    def _version(self, tablas):
+        return (self._generacion,
+                *(self._cambios if tabla == TODAS else self._versiones.get(tabla, 0) for tabla in tablas))
+
+    def leer(self, sql, parametros, cargar):
+        """Devuelve las filas de la consulta; si no están (o ya no valen), las pide a cargar()"""
+        sql = normalizar_sql(sql)
+        clave = (sql, tuple(parametros))
+        entrada = self._entradas.get(clave)
+        if entrada is not None:
+            caduca, tablas, version, filas = entrada
+            if version != self._version(tablas):
+                self.invalidadas += 1
+                del self._entradas[clave]
+            elif caduca <= self.reloj():
+                self.caducadas += 1
+                del self._entradas[clave]
+            else:
+                self.aciertos += 1
+                self._entradas.move_to_end(clave)
+                return [dict(fila) for fila in filas]  # Copias: quien llama puede modificarlas
+
+        self.fallos += 1
+        tablas = tablas_de(sql)
+        version = self._version(tablas)
+        filas = cargar()
+        self._entradas[clave] = (self.reloj() + self.ttl, tablas, version, [dict(fila) for fila in filas])
+        if len(self._entradas) > self.capacidad:
+            self._entradas.popitem(last=False)
+            self.expulsiones += 1
+        return filas
+
+    def invalidar(self, tabla=None):
+        """Invalida los resultados que usan tabla (o todos si no se indica)"""
+        self._cambios += 1
+        if tabla is None:
+            self._generacion += 1
+        else:
+            tabla = tabla.lower()
+            self._versiones[tabla] = self._versiones.get(tabla, 0) + 1
+
+    def invalidar_sql(self, sql):
+        """Invalida las tablas que escribe la sentencia; si no se reconoce ninguna, todas"""
+        tablas = tablas_de(normalizar_sql(sql))
+        if not tablas or TODAS in tablas:
+            self.invalidar()
+            return
+        for tabla in tablas:
+            self.invalidar(tabla)
+
+    def vaciar(self):
+        self._entradas.clear()
+
+    def metricas(self):
+        consultas = self.aciertos + self.fallos
+        return {
+            "aciertos": self.aciertos,
+            "fallos": self.fallos,
+            "tasa_aciertos": round(self.aciertos / consultas, 3) if consultas else None,
+            "expulsiones": self.expulsiones,
+            "caducadas": self.caducadas,
+            "invalidadas": self.invalidadas,
+            "entradas": len(self._entradas),
+        }
+
+
+if __name__ == "__main__":
+    from repositorio import Repositorio, importar_datos_u5
+
+    for cache in (None, CacheConsultas()):
+        with Repositorio.sqlite(cache=cache) as repo:
+            repo.crear_tablas()
+            importar_datos_u5(repo)
+            inicio = time.perf_counter()
+            for _ in range(20000):
+                repo.paises_por_continente("Europa")
+                repo.medias_notas(7.5)
+            segundos = time.perf_counter() - inicio
+            print(f"{'con' if cache else 'sin'} caché: {40000 / segundos:.0f} consultas/s")
+
+    with Repositorio.sqlite(cache=CacheConsultas()) as repo:
+        for _ in range(3):
+            print("Europa:", [p["nombre"] for p in repo.paises_por_continente("Europa")])
+        repo.agregar_pais("Portugal", "Europa", 10.3)
+        print("Tras agregar_pais:", [p["nombre"] for p in repo.paises_por_continente("Europa")])
+        repo.ejecutar("DELETE FROM paises WHERE nombre = %s", ("Portugal",))
+        print("Tras borrarlo:", [p["nombre"] for p in repo.paises_por_continente("Europa")])
+        print("Métricas:", repo.cache.metricas())
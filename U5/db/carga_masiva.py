@@ -0,0 +1,190 @@
+"""
+carga_masiva: Carga de ficheros CSV grandes en la base de datos de U5
+El CSV se lee en flujo y se inserta por lotes (un INSERT de varias filas por
+lote en MySQL, executemany con la sentencia compilada en SQLite) o, en MySQL
+con allow_local_infile, con LOAD DATA LOCAL INFILE por lotes.
+Mientras dura la carga se quitan los índices secundarios de la tabla y se
+vuelven a crear al final: construirlos una vez es más rápido que ir
+actualizándolos fila a fila.
+Cada lote se confirma en la misma transacción que un punto de control con
+las filas ya cargadas, así que si la carga se corta, la siguiente llamada
+sigue donde se quedó sin repetir ni perder filas.
+"""
+
+import csv
+import os
+import tempfile
+import time
+from itertools import islice
+
+from repositorio import COLUMNAS, TAM_LOTE
+
+TAM_LOTE_LOAD_DATA = 50000  # Filas por fichero temporal de LOAD DATA
+
+TABLA_CONTROL = """
+    CREATE TABLE IF NOT EXISTS cargas_csv (
+        fichero VARCHAR(255) PRIMARY KEY,
+        tabla VARCHAR(50) NOT NULL,
+        tamano BIGINT NOT NULL,
+        modificado BIGINT NOT NULL,
+        filas BIGINT NOT NULL DEFAULT 0,
+        completado BOOLEAN NOT NULL DEFAULT FALSE
+    )"""
+
+# Conversión de una fila del CSV a la tupla de COLUMNAS[tabla]
+CONVERSIONES = {
+    "ciudades": lambda fila: (fila[0], fila[1], float(fila[2])),
+    "notas": lambda fila: (fila[0], *map(float, fila[1:4])),
+}
+
+_ERRORES_LOAD_DATA = (1148, 2068, 3948)  # LOCAL INFILE desactivado en el cliente o el servidor
+
+
+def _punto_de_control(repositorio, ruta, tabla, reanudar):
+    """Filas ya cargadas de ruta, o None si la carga ya se completó"""
+    estado = os.stat(ruta)
+    filas = repositorio.consultar(
+        "SELECT tabla, tamano, modificado, filas, completado FROM cargas_csv WHERE fichero = %s", (ruta,))
+    if filas and reanudar:
+        control = filas[0]
+        if (control["tamano"], control["modificado"]) != (estado.st_size, estado.st_mtime_ns):
+            raise ValueError(f"'{ruta}' ha cambiado desde la carga anterior; usa reanudar=False para empezar de cero")
+        if control["tabla"] != tabla:
+            raise ValueError(f"'{ruta}' ya se cargó en la tabla {control['tabla']}")
+        return None if control["completado"] else control["filas"]
+    with repositorio.transaccion():
+        repositorio.ejecutar("DELETE FROM cargas_csv WHERE fichero = %s", (ruta,))
+        repositorio.ejecutar(
+            "INSERT INTO cargas_csv (fichero, tabla, tamano, modificado) VALUES (%s, %s, %s, %s)",
+            (ruta, tabla, estado.st_size, estado.st_mtime_ns))
+    return 0
+
+
+def _load_data(repositorio, tabla, lote):
+    """Escribe el lote en un CSV temporal y lo manda con LOAD DATA LOCAL INFILE"""
+    descriptor, temporal = tempfile.mkstemp(suffix=".csv")
+    try:
+        with open(descriptor, "w", newline="", encoding="utf-8") as f:
+            csv.writer(f, lineterminator="\n").writerows(lote)
+        cursor = repositorio.backend.cursor()
+        try:
+            cursor.execute(
+                f"LOAD DATA LOCAL INFILE %s INTO TABLE {tabla} CHARACTER SET utf8mb4 "
+                "FIELDS TERMINATED BY ',' OPTIONALLY ENCLOSED BY '\"' LINES TERMINATED BY '\\n' "
+                f"({', '.join(COLUMNAS[tabla])})", (temporal,))
+        finally:
+            cursor.close()
+        # El cursor va directo a la conexión: la caché del repositorio no se entera sola
+        if repositorio.cache is not None:
+            repositorio.cache.invalidar(tabla)
+    finally:
+        os.remove(temporal)
+
+
+def cargar_csv(repositorio, ruta, tabla, convertir=None, tam_lote=None, reanudar=True, load_data=True,
+               delimiter=",", encoding="utf-8-sig"):
+    """
+    Carga las filas de ruta (sin la cabecera) en tabla y devuelve un informe.
+    convertir: función fila → tupla en el orden de COLUMNAS[tabla] (por
+    defecto, la de CONVERSIONES). Con reanudar=False se descarta el punto de
+    control y se carga el fichero entero otra vez.
+    """
+    ruta = os.path.abspath(ruta)
+    convertir = convertir or CONVERSIONES[tabla]
+    repositorio.ejecutar(repositorio.backend.ddl(TABLA_CONTROL))
+    hechas = _punto_de_control(repositorio, ruta, tabla, reanudar)
+    if hechas is None:
+        return {"tabla": tabla, "filas": 0, "total": None, "metodo": None, "segundos": 0, "filas_por_segundo": None}
+
+    usar_load_data = load_data and repositorio.backend.nombre == "mysql"
+    tam_lote = tam_lote or (TAM_LOTE_LOAD_DATA if usar_load_data else TAM_LOTE)
+    cargadas = 0
+    inicio = time.perf_counter()
+    repositorio.eliminar_indices(tabla)
+    try:
+        with open(ruta, "r", newline="", encoding=encoding) as f:
+            lector = csv.reader(f, delimiter=delimiter)
+            next(lector, None)  # Cabecera
+            # El punto de control cuenta filas cargadas, no líneas: las vacías no cuentan al saltar
+            no_vacias = (fila for fila in lector if fila)
+            for _ in islice(no_vacias, hechas):
+                pass
+            filas = (convertir(fila) for fila in no_vacias)
+            while True:
+                lote = list(islice(filas, tam_lote))
+                if not lote:
+                    break
+                with repositorio.transaccion():
+                    if usar_load_data:
+                        try:
+                            _load_data(repositorio, tabla, lote)
+                        except repositorio.Error as e:
+                            if e.errno not in _ERRORES_LOAD_DATA:
+                                raise
+                            usar_load_data = False
+                    if not usar_load_data:
+                        repositorio.insertar(tabla, lote)
+                    repositorio.ejecutar("UPDATE cargas_csv SET filas = filas + %s WHERE fichero = %s",
+                                         (len(lote), ruta))
+                cargadas += len(lote)
+        repositorio.ejecutar("UPDATE cargas_csv SET completado = %s WHERE fichero = %s", (True, ruta))
+    finally:
+        repositorio.crear_indices(tabla)
+    segundos = time.perf_counter() - inicio
+    return {
+        "tabla": tabla,
+        "filas": cargadas,
+        "total": hechas + cargadas,
+        "metodo": "LOAD DATA" if usar_load_data else "executemany",
+        "segundos": round(segundos, 3),
+        "filas_por_segundo": round(cargadas / segundos) if segundos else None,
+    }
+
+
+# ─── Prueba de rendimiento ───
+
+def _generar_notas(ruta, filas):
+    import random
+
+    aleatorio = random.Random(0)
+    with open(ruta, "w", newline="", encoding="utf-8") as f:
+        escritor = csv.writer(f)
+        escritor.writerow(["Alumno/a", "Primera evaluación", "Segunda evaluación", "Tercera evaluación"])
+        for n in range(filas):
+            escritor.writerow([f"alumno {n}"] + [aleatorio.randint(0, 20) / 2 for _ in range(3)])
+
+
+if __name__ == "__main__":
+    import sys
+
+    from repositorio import Repositorio
+
+    filas = 200000
+    with tempfile.TemporaryDirectory() as carpeta:
+        ruta_csv = os.path.join(carpeta, "notas_grandes.csv")
+        _generar_notas(ruta_csv, filas)
+        repositorios = [("sqlite", lambda: Repositorio.sqlite(os.path.join(carpeta, "carga.db")))]
+        if "--mysql" in sys.argv:
+            repositorios.append(("mysql", lambda: Repositorio.mysql(allow_local_infile=True)))
+
+        for nombre, abrir in repositorios:
+            with abrir() as repo:
+                repo.crear_tablas()
+                repo.vaciar("notas")
+                print(nombre, cargar_csv(repo, ruta_csv, "notas", reanudar=False))
+
+                # Una carga que falla a mitad y se reanuda
+                repo.vaciar("notas")
+
+                def falla_a_mitad(fila, convertir=CONVERSIONES["notas"]):
+                    if fila[0] == f"alumno {filas // 2}":
+                        raise RuntimeError("Corte simulado")
+                    return convertir(fila)
+
+                try:
+                    cargar_csv(repo, ruta_csv, "notas", convertir=falla_a_mitad, reanudar=False)
+                except RuntimeError as e:
+                    hechas = repo.consultar("SELECT COUNT(*) AS n FROM notas")[0]["n"]
+                    print(f"{nombre}: {e} con {hechas} filas cargadas")
+                print(nombre, "reanudada:", cargar_csv(repo, ruta_csv, "notas"))
+                print(nombre, "filas en la tabla:", repo.consultar("SELECT COUNT(*) AS n FROM notas")[0]["n"])
@@ -0,0 +1,113 @@
+"""
+exportacion: Exportación de consultas de U5 a CSV y JSON sin cargar el resultado
+Las filas se leen con Repositorio.consultar_en_flujo() (cursor sin buffer en
+MySQL, fetchmany en SQLite) y se escriben según llegan con csv.DictWriter o
+con EscritorArrayJSON de la sección de JSON. La memoria depende del tamaño
+del lote y no del número de filas. La salida se escribe con abrir_atomico():
+si la exportación falla a mitad, el fichero anterior queda intacto.
+Como los demás módulos, al importarlo no toca sys.path: las carpetas U5 y
+04_ficheros_json solo las añade él mismo cuando se ejecuta suelto.
+"""
+
+import csv
+import os
+import sys
+from decimal import Decimal
+
+if __name__ == "__main__":
+    # Ejecutado suelto: escritura_atomica está en la carpeta U5 y json_flujo en 04_ficheros_json
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "04_ficheros_json"))
+
+from escritura_atomica import abrir_atomico  # noqa: E402
+from json_flujo import EscritorArrayJSON  # noqa: E402
+from repositorio import TAM_LOTE  # noqa: E402
+
+
+def exportar_csv(repositorio, sql, salida, parametros=(), cabecera=None, tam_lote=TAM_LOTE,
+                 delimiter=",", encoding="utf-8"):
+    """
+    Escribe el resultado de sql en salida y devuelve las filas escritas.
+    cabecera: nombres para la primera fila (por defecto, las columnas de la consulta).
+    """
+    columnas, filas = repositorio.consultar_en_flujo(sql, parametros, tam_lote)
+    escritas = 0
+    try:
+        with abrir_atomico(salida, "w", newline="", encoding=encoding) as archivo:
+            escritor = csv.DictWriter(archivo, fieldnames=columnas, delimiter=delimiter)
+            if cabecera is None:
+                escritor.writeheader()
+            else:
+                escritor.writerow(dict(zip(columnas, cabecera)))
+            for fila in filas:
+                escritor.writerow(fila)
+                escritas += 1
+    finally:
+        filas.close()
+    return escritas
+
+
+def _a_json(fila):
+    # MySQL devuelve DECIMAL como Decimal, que json no sabe escribir
+    return {clave: float(valor) if isinstance(valor, Decimal) else valor for clave, valor in fila.items()}
+
+
+def exportar_json(repositorio, sql, salida, parametros=(), tam_lote=TAM_LOTE, indent=2, ensure_ascii=False):
+    """Escribe el resultado de sql como un array JSON de objetos y devuelve los elementos escritos"""
+    _, filas = repositorio.consultar_en_flujo(sql, parametros, tam_lote)
+    try:
+        with abrir_atomico(salida) as archivo, \
+                EscritorArrayJSON(archivo, indent=indent, ensure_ascii=ensure_ascii) as escritor:
+            for fila in filas:
+                escritor.escribir(_a_json(fila))
+    finally:
+        filas.close()
+    return escritor.escritos
+
+
+# ─── Exportaciones de los ejercicios ───
+
+def exportar_ciudades_csv(repositorio, salida="ciudades_continente.csv"):
+    """Ciudades con su país y continente, con la cabecera de capitales.csv"""
+    return exportar_csv(
+        repositorio,
+        "SELECT c.nombre, c.pais, p.continente FROM ciudades c LEFT JOIN paises p ON p.nombre = c.pais "
+        "ORDER BY c.nombre",
+        salida, cabecera=["Ciudad", "País", "Continente"])
+
+
+def exportar_paises_json(repositorio, continente, salida="paises_filtrados.json"):
+    """Países de un continente, con el formato de paises_filtrados.json"""
+    return exportar_json(
+        repositorio, "SELECT nombre, continente, poblacion FROM paises WHERE continente = %s ORDER BY nombre",
+        salida, (continente,), indent=4)
+
+
+if __name__ == "__main__":
+    import os
+    import tempfile
+    import tracemalloc
+
+    from repositorio import Repositorio, importar_datos_u5
+
+    with Repositorio.sqlite() as repo:
+        repo.crear_tablas()
+        importar_datos_u5(repo)
+        print("Ciudades exportadas:", exportar_ciudades_csv(repo))
+        print("Países de Europa exportados:", exportar_paises_json(repo, "Europa"))
+
+    # Memoria al exportar muchas filas: en flujo frente a fetchall()
+    filas = 300000
+    with tempfile.TemporaryDirectory() as carpeta, Repositorio.sqlite(os.path.join(carpeta, "grande.db")) as repo:
+        repo.crear_tablas()
+        repo.insertar("notas", ((f"alumno {n}", n % 10, n % 7, n % 5) for n in range(filas)))
+        sql = "SELECT alumno, primera, segunda, tercera FROM notas"
+        for nombre, exportar in (
+                ("csv en flujo", lambda: exportar_csv(repo, sql, os.path.join(carpeta, "notas.csv"))),
+                ("json en flujo", lambda: exportar_json(repo, sql, os.path.join(carpeta, "notas.json"))),
+                ("fetchall", lambda: len(repo.consultar(sql)))):
+            tracemalloc.start()
+            escritas = exportar()
+            pico = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            print(f"{nombre}: {escritas} filas, pico de memoria {pico / 1024 / 1024:.1f} MB")
@@ -0,0 +1,443 @@
+"""
+repositorio: Capa de datos de U5 (ciudades, paises, notas y productos)
+Las mismas operaciones funcionan sobre MySQL (la base de datos "ciudades" de
+los Programa0X) o sobre un fichero SQLite local para pruebas, sin servidor.
+Las consultas se escriben una vez con marcadores %s, como en
+mysql.connector; para SQLite se pasan a "?".
+Las consultas repetidas usan sentencias preparadas (cursor prepared=True en
+MySQL; en SQLite el propio módulo guarda las sentencias compiladas) y las
+inserciones masivas van por executemany en lotes: en MySQL, executemany de
+un INSERT se envía como un único INSERT de varias filas por lote.
+Con cache (un CacheConsultas de cache_consultas.py) los SELECT repetidos se
+sirven de memoria y las escrituras invalidan las tablas que tocan.
+"""
+
+import os
+import re
+import sqlite3
+from contextlib import contextmanager
+from functools import lru_cache
+from itertools import islice
+
+try:
+    import mysql.connector
+except ImportError:  # Sin el conector solo está disponible SQLite
+    mysql = None
+
+CONFIG_MYSQL = {"host": "localhost", "database": "ciudades", "user": "ciudades", "password": "ciudades"}
+RUTA_SQLITE = "u5.db"
+TAM_LOTE = 1000  # Filas por executemany
+
+CARPETA_U5 = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Columnas que se insertan en cada tabla (sin el id autonumérico)
+COLUMNAS = {
+    "ciudades": ("nombre", "pais", "poblacion_millones"),
+    "paises": ("nombre", "continente", "poblacion"),
+    "notas": ("alumno", "primera", "segunda", "tercera"),
+    "productos": ("id", "nombre", "categoria", "precio", "stock", "disponible"),
+}
+
+# Definiciones en el dialecto de MySQL; _a_sqlite() adapta el autonumérico
+TABLAS = {
+    "ciudades": """
+        CREATE TABLE IF NOT EXISTS ciudades (
+            id INT AUTO_INCREMENT PRIMARY KEY,
+            nombre VARCHAR(100) NOT NULL,
+            pais VARCHAR(50),
+            poblacion_millones FLOAT
+        )""",
+    "paises": """
+        CREATE TABLE IF NOT EXISTS paises (
+            id INT AUTO_INCREMENT PRIMARY KEY,
+            nombre VARCHAR(100) NOT NULL,
+            continente VARCHAR(50),
+            poblacion FLOAT
+        )""",
+    "notas": """
+        CREATE TABLE IF NOT EXISTS notas (
+            id INT AUTO_INCREMENT PRIMARY KEY,
+            alumno VARCHAR(100) NOT NULL,
+            primera FLOAT,
+            segunda FLOAT,
+            tercera FLOAT
+        )""",
+    "productos": """
+        CREATE TABLE IF NOT EXISTS productos (
+            id VARCHAR(20) PRIMARY KEY,
+            nombre VARCHAR(100) NOT NULL,
+            categoria VARCHAR(50),
+            precio DECIMAL(10, 2),
+            stock INT NOT NULL DEFAULT 0,
+            disponible BOOLEAN NOT NULL DEFAULT FALSE
+        )""",
+}
+
+# Índices secundarios: (nombre, tabla, columnas)
+INDICES = [
+    ("idx_ciudades_pais", "ciudades", ("pais",)),
+    ("idx_paises_continente", "paises", ("continente",)),
+    ("idx_notas_alumno", "notas", ("alumno",)),
+    ("idx_productos_categoria", "productos", ("categoria",)),
+]
+
+
+@lru_cache(maxsize=256)
+def marcadores_sqlite(sql):
+    """Cambia los %s de fuera de las cadenas por ? (y %% por %)"""
+    partes = re.split(r"('(?:[^']|'')*')", sql)
+    for i in range(0, len(partes), 2):  # Las posiciones impares son literales entre comillas
+        partes[i] = partes[i].replace("%s", "?").replace("%%", "%")
+    return "".join(partes)
+
+
+def _a_sqlite(ddl):
+    return ddl.replace("INT AUTO_INCREMENT PRIMARY KEY", "INTEGER PRIMARY KEY AUTOINCREMENT")
+
+
+def _lotes(filas, tam_lote):
+    filas = iter(filas)
+    while True:
+        lote = list(islice(filas, tam_lote))
+        if not lote:
+            return
+        yield lote
+
+
+class _BackendSQLite:
+    nombre = "sqlite"
+    Error = sqlite3.Error
+
+    def __init__(self, ruta):
+        # Sin transacciones implícitas: cada sentencia se confirma sola salvo dentro de transaccion()
+        self.conexion = sqlite3.connect(ruta, cached_statements=256, isolation_level=None)
+        self.conexion.row_factory = sqlite3.Row
+        self.conexion.execute("PRAGMA journal_mode=WAL")
+
+    def sql(self, sql):
+        return marcadores_sqlite(sql)
+
+    def cursor(self, preparado=False):
+        return self.conexion.cursor()  # sqlite3 reutiliza la sentencia compilada si el SQL se repite
+
+    def filas(self, cursor):
+        return [dict(fila) for fila in cursor.fetchall()]
+
+    def cursor_flujo(self):
+        return self.conexion.cursor()  # fetchmany avanza la sentencia: no se calculan las filas de antemano
+
+    def lote(self, cursor, tam_lote):
+        return [dict(fila) for fila in cursor.fetchmany(tam_lote)]
+
+    def cerrar_flujo(self, cursor):
+        cursor.close()
+
+    def ddl(self, sql):
+        return _a_sqlite(sql)
+
+    def crear_indice(self, nombre, tabla, columnas):
+        self.conexion.execute(f"CREATE INDEX IF NOT EXISTS {nombre} ON {tabla} ({', '.join(columnas)})")
+
+    def eliminar_indice(self, nombre, tabla):
+        self.conexion.execute(f"DROP INDEX IF EXISTS {nombre}")
+
+    def empezar(self):
+        self.conexion.execute("BEGIN")
+
+
+class _BackendMySQL:
+    nombre = "mysql"
+
+    def __init__(self, config):
+        if mysql is None:
+            raise RuntimeError("mysql-connector-python no está instalado (está en el entorno de U5/db)")
+        self.Error = mysql.connector.Error
+        self.conexion = mysql.connector.connect(**config)
+        self.conexion.autocommit = True  # Igual que en SQLite: las transacciones, con transaccion()
+        self._preparados = None
+
+    def sql(self, sql):
+        return sql
+
+    def cursor(self, preparado=False):
+        if not preparado:
+            return self.conexion.cursor(dictionary=True)
+        # Un cursor preparado por conexión: el servidor guarda la última sentencia preparada
+        if self._preparados is None:
+            self._preparados = self.conexion.cursor(prepared=True, dictionary=True)
+        return self._preparados
+
+    def filas(self, cursor):
+        return cursor.fetchall()
+
+    def cursor_flujo(self):
+        # Sin buffer: las filas se leen del servidor según se piden, pero la
+        # conexión no admite otra consulta hasta leerlas todas o cerrar el cursor
+        return self.conexion.cursor(dictionary=True, buffered=False)
+
+    def lote(self, cursor, tam_lote):
+        return cursor.fetchmany(tam_lote)
+
+    def cerrar_flujo(self, cursor):
+        if self.conexion.unread_result:  # Se dejó de leer antes del final: se descarta el resto
+            self.conexion.consume_results()
+        cursor.close()
+
+    def ddl(self, sql):
+        return sql
+
+    def crear_indice(self, nombre, tabla, columnas):
+        cursor = self.conexion.cursor()
+        try:
+            cursor.execute(f"CREATE INDEX {nombre} ON {tabla} ({', '.join(columnas)})")
+        except mysql.connector.Error as e:
+            if e.errno != 1061:  # 1061: ya existe un índice con ese nombre
+                raise
+        finally:
+            cursor.close()
+
+    def eliminar_indice(self, nombre, tabla):
+        cursor = self.conexion.cursor()
+        try:
+            cursor.execute(f"DROP INDEX {nombre} ON {tabla}")
+        except mysql.connector.Error as e:
+            if e.errno != 1091:  # 1091: el índice no existe
+                raise
+        finally:
+            cursor.close()
+
+    def empezar(self):
+        self.conexion.start_transaction()
+
+
+class Repositorio:
+    """Acceso a las tablas de U5 sobre MySQL o SQLite"""
+
+    def __init__(self, backend, cache=None):
+        self.backend = backend
+        self.Error = backend.Error
+        self.cache = cache
+        self._en_transaccion = False
+
+    @classmethod
+    def sqlite(cls, ruta=RUTA_SQLITE, cache=None):
+        return cls(_BackendSQLite(ruta), cache)
+
+    @classmethod
+    def mysql(cls, cache=None, **config):
+        return cls(_BackendMySQL({**CONFIG_MYSQL, **config}), cache)
+
+    @property
+    def conexion(self):
+        return self.backend.conexion
+
+    # ─── Esquema ───
+
+    def crear_tablas(self):
+        cursor = self.backend.cursor()
+        try:
+            for ddl in TABLAS.values():
+                cursor.execute(self.backend.ddl(ddl))
+        finally:
+            cursor.close()
+        self.crear_indices()
+
+    def crear_indices(self, tabla=None):
+        for nombre, tabla_indice, columnas in INDICES:
+            if tabla is None or tabla == tabla_indice:
+                self.backend.crear_indice(nombre, tabla_indice, columnas)
+
+    def eliminar_indices(self, tabla):
+        for nombre, tabla_indice, _ in INDICES:
+            if tabla_indice == tabla:
+                self.backend.eliminar_indice(nombre, tabla_indice)
+
+    # ─── Ejecución ───
+
+    @contextmanager
+    def transaccion(self):
+        """Agrupa operaciones: commit al salir sin errores, rollback si hay una excepción"""
+        if self._en_transaccion:
+            yield self
+            return
+        self.backend.empezar()
+        self._en_transaccion = True
+        try:
+            yield self
+            self.conexion.commit()
+        except BaseException:
+            self.conexion.rollback()
+            raise
+        finally:
+            self._en_transaccion = False
+
+    def consultar(self, sql, parametros=()):
+        """SELECT con sentencia preparada; devuelve una lista de diccionarios"""
+        # Dentro de una transacción no se guarda nada: podría deshacerse con rollback
+        if self.cache is not None and not self._en_transaccion:
+            return self.cache.leer(sql, parametros, lambda: self._consultar(sql, parametros))
+        return self._consultar(sql, parametros)
+
+    def _consultar(self, sql, parametros):
+        cursor = self.backend.cursor(preparado=True)
+        cursor.execute(self.backend.sql(sql), tuple(parametros))
+        return self.backend.filas(cursor)
+
+    def ejecutar(self, sql, parametros=()):
+        """INSERT/UPDATE/DELETE con sentencia preparada; devuelve las filas afectadas"""
+        if self.cache is not None:
+            self.cache.invalidar_sql(sql)
+        cursor = self.backend.cursor(preparado=True)
+        cursor.execute(self.backend.sql(sql), tuple(parametros))
+        return cursor.rowcount
+
+    def insertar(self, tabla, filas, tam_lote=TAM_LOTE):
+        """Inserta tuplas en el orden de COLUMNAS[tabla], en lotes de executemany y en una sola transacción"""
+        columnas = COLUMNAS[tabla]
+        sql = self.backend.sql(
+            f"INSERT INTO {tabla} ({', '.join(columnas)}) VALUES ({', '.join(['%s'] * len(columnas))})")
+        total = 0
+        if self.cache is not None:
+            self.cache.invalidar(tabla)
+        with self.transaccion():
+            cursor = self.backend.cursor()
+            try:
+                for lote in _lotes(filas, tam_lote):
+                    cursor.executemany(sql, lote)
+                    total += len(lote)
+            finally:
+                cursor.close()
+        return total
+
+    def consultar_en_flujo(self, sql, parametros=(), tam_lote=TAM_LOTE):
+        """
+        Como consultar() pero genera las filas de tam_lote en tam_lote, sin
+        tener el resultado entero en memoria. Devuelve (columnas, generador).
+        En MySQL no se puede usar la conexión para otra cosa hasta agotar el generador.
+        """
+        cursor = self.backend.cursor_flujo()
+        try:
+            cursor.execute(self.backend.sql(sql), tuple(parametros))
+            columnas = [descripcion[0] for descripcion in cursor.description]
+        except BaseException:
+            self.backend.cerrar_flujo(cursor)
+            raise
+
+        def filas():
+            try:
+                while True:
+                    lote = self.backend.lote(cursor, tam_lote)
+                    if not lote:
+                        return
+                    yield from lote
+            finally:
+                self.backend.cerrar_flujo(cursor)
+
+        return columnas, filas()
+
+    def vaciar(self, tabla):
+        if self.cache is not None:
+            self.cache.invalidar(tabla)
+        cursor = self.backend.cursor()
+        try:
+            cursor.execute(f"DELETE FROM {tabla}")
+        finally:
+            cursor.close()
+
+    # ─── Operaciones de los ejercicios ───
+
+    def ciudades_con_poblacion_mayor(self, minimo):
+        return self.consultar(
+            "SELECT nombre, pais, poblacion_millones FROM ciudades WHERE poblacion_millones > %s "
+            "ORDER BY poblacion_millones DESC", (minimo,))
+
+    def paises_por_continente(self, continente):
+        return self.consultar(
+            "SELECT nombre, continente, poblacion FROM paises WHERE continente = %s ORDER BY nombre",
+            (continente,))
+
+    def agregar_pais(self, nombre, continente, poblacion):
+        return self.ejecutar("INSERT INTO paises (nombre, continente, poblacion) VALUES (%s, %s, %s)",
+                             (nombre, continente, poblacion))
+
+    def medias_notas(self, minimo=None):
+        sql = "SELECT alumno, ROUND((primera + segunda + tercera) / 3, 2) AS media FROM notas"
+        if minimo is None:
+            return self.consultar(sql + " ORDER BY alumno")
+        return self.consultar(sql + " WHERE (primera + segunda + tercera) / 3 >= %s ORDER BY alumno", (minimo,))
+
+    def obtener_producto(self, producto_id):
+        filas = self.consultar(
+            "SELECT id, nombre, categoria, precio, stock, disponible FROM productos WHERE id = %s", (producto_id,))
+        if not filas:
+            return None
+        producto = filas[0]
+        producto["precio"] = float(producto["precio"])  # DECIMAL en MySQL
+        producto["disponible"] = bool(producto["disponible"])  # 0/1 en SQLite
+        return producto
+
+    def actualizar_stock(self, producto_id, nuevo_stock):
+        """Cambia el stock y la disponibilidad; KeyError si el producto no existe"""
+        cambiadas = self.ejecutar("UPDATE productos SET stock = %s, disponible = %s WHERE id = %s",
+                                  (nuevo_stock, nuevo_stock > 0, producto_id))
+        if cambiadas == 0 and self.obtener_producto(producto_id) is None:
+            raise KeyError(f"Producto con ID '{producto_id}' no encontrado")
+        return cambiadas
+
+    # ─── Cierre ───
+
+    def cerrar(self):
+        self.conexion.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, tipo, valor, traza):
+        self.cerrar()
+
+
+def importar_datos_u5(repositorio):
+    """Carga en las tablas vacías los ficheros de las secciones de CSV y JSON que existan"""
+    import csv
+    import json
+
+    carpeta_csv = os.path.join(CARPETA_U5, "03_ficheros_csv")
+    carpeta_json = os.path.join(CARPETA_U5, "04_ficheros_json")
+    cargadas = {}
+
+    def filas_csv(nombre):
+        with open(os.path.join(carpeta_csv, nombre), "r", newline="", encoding="utf-8-sig") as f:
+            lector = csv.reader(f)
+            next(lector, None)
+            yield from (fila for fila in lector if fila)
+
+    def datos_json(nombre):
+        with open(os.path.join(carpeta_json, nombre), "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    fuentes = {
+        "ciudades": lambda: ((c, p, float(n)) for c, p, n in filas_csv("ciudades.csv")),
+        "notas": lambda: ((f[0], *map(float, f[1:4])) for f in filas_csv("notas.csv")),
+        "paises": lambda: ((p["nombre"], p["continente"], p["poblacion"]) for p in datos_json("paises.json")),
+        "productos": lambda: ((p["id"], p["nombre"], p["categoria"], p["precio"], p["stock"], p["disponible"])
+                              for p in datos_json("catalogo.json")["productos"]),
+    }
+    with repositorio.transaccion():
+        for tabla, filas in fuentes.items():
+            if repositorio.consultar(f"SELECT COUNT(*) AS n FROM {tabla}")[0]["n"]:
+                continue
+            try:
+                cargadas[tabla] = repositorio.insertar(tabla, filas())
+            except FileNotFoundError:
+                cargadas[tabla] = 0
+    return cargadas
+
+
+if __name__ == "__main__":
+    with Repositorio.sqlite() as repo:
+        repo.crear_tablas()
+        print("Filas importadas:", importar_datos_u5(repo))
+        for ciudad in repo.ciudades_con_poblacion_mayor(25):
+            print(f"Ciudad: {ciudad['nombre']}, Población: {ciudad['poblacion_millones']} millones")
+        print("Europa:", [p["nombre"] for p in repo.paises_por_continente("Europa")])
+        print("Medias >= 7.5:", repo.medias_notas(7.5))
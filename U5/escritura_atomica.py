@@ -0,0 +1,269 @@
+"""
+escritura_atomica: Escritura segura de ficheros para las secciones de CSV y JSON
+abrir_atomico() escribe en un fichero temporal de la misma carpeta, lo fuerza
+a disco con fsync y lo renombra sobre el destino: quien lea ve el fichero
+antiguo o el nuevo completo, nunca uno a medias, aunque el programa se corte.
+bloqueo() coordina varios procesos con un bloqueo consultivo (fcntl.flock)
+sobre un fichero .lock al lado del destino.
+ArchivoJSON junta las dos cosas para leer-modificar-escribir un JSON y,
+opcionalmente, apunta los cambios en un diario (write-ahead log) para que
+varios procesos actualicen sin reescribir el fichero entero cada vez.
+
+Los módulos de 03_ficheros_csv y 04_ficheros_json lo importan como
+"from escritura_atomica import ..." sin tocar sys.path al importarlos: la
+carpeta U5 la añade el programa que se ejecuta (los main.py de cada sección,
+o el propio módulo dentro de if __name__ == "__main__" si se ejecuta suelto).
+"""
+
+import json
+import os
+import tempfile
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:  # Windows: msvcrt solo tiene bloqueos exclusivos
+    fcntl = None
+    import msvcrt
+
+TAM_DIARIO_MAX = 1024 * 1024  # Bytes de diario a partir de los cuales se consolida en el JSON
+TAM_LECTURA = 64 * 1024  # Bytes que se leen hacia atrás buscando el final de la última línea completa
+
+
+def _sincronizar_carpeta(carpeta):
+    """Fuerza a disco la entrada del directorio (el rename); en Windows no se puede"""
+    if not hasattr(os, "O_DIRECTORY"):
+        return
+    descriptor = os.open(carpeta, os.O_RDONLY | os.O_DIRECTORY)
+    try:
+        os.fsync(descriptor)
+    finally:
+        os.close(descriptor)
+
+
+@contextmanager
+def abrir_atomico(ruta, modo="w", encoding="utf-8", newline=None):
+    """
+    Como open(ruta, modo) para escribir, pero el contenido solo sustituye a
+    ruta al salir del with sin errores. Si hay una excepción, ruta no cambia.
+    """
+    if modo not in ("w", "wb"):
+        raise ValueError(f"Modo no válido para escritura atómica: {modo}")
+    carpeta = os.path.dirname(os.path.abspath(ruta))
+    descriptor, temporal = tempfile.mkstemp(prefix=f".{os.path.basename(ruta)}.", suffix=".tmp", dir=carpeta)
+    try:
+        # mkstemp crea el fichero solo para su dueño: se dejan los permisos del original
+        try:
+            os.chmod(temporal, os.stat(ruta).st_mode & 0o7777)
+        except FileNotFoundError:
+            os.chmod(temporal, 0o644)
+        if modo == "wb":
+            archivo = open(descriptor, "wb")
+        else:
+            archivo = open(descriptor, "w", encoding=encoding, newline=newline)
+        with archivo:
+            yield archivo
+            archivo.flush()
+            os.fsync(archivo.fileno())
+        os.replace(temporal, ruta)
+    except BaseException:
+        if os.path.exists(temporal):
+            os.remove(temporal)
+        raise
+    _sincronizar_carpeta(carpeta)
+
+
+@contextmanager
+def bloqueo(ruta, compartido=False):
+    """
+    Bloqueo consultivo sobre ruta + ".lock": varios lectores pueden tener el
+    compartido a la vez; el exclusivo espera a que no haya nadie más. Se usa
+    un fichero aparte porque el rename de abrir_atomico cambia el fichero de ruta.
+    """
+    descriptor = os.open(ruta + ".lock", os.O_RDWR | os.O_CREAT, 0o644)
+    try:
+        if fcntl is not None:
+            fcntl.flock(descriptor, fcntl.LOCK_SH if compartido else fcntl.LOCK_EX)
+        else:
+            msvcrt.locking(descriptor, msvcrt.LK_LOCK, 1)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(descriptor, fcntl.LOCK_UN)
+            else:
+                os.lseek(descriptor, 0, os.SEEK_SET)
+                msvcrt.locking(descriptor, msvcrt.LK_UNLCK, 1)
+    finally:
+        os.close(descriptor)
+
+
+def linea_rota(descriptor):
+    """True si el fichero (abierto con O_RDWR) no acaba en salto de línea: una escritura se cortó a medias"""
+    fin = os.fstat(descriptor).st_size
+    if fin == 0:
+        return False
+    os.lseek(descriptor, fin - 1, os.SEEK_SET)
+    return os.read(descriptor, 1) != b"\n"
+
+
+def quitar_linea_rota(descriptor):
+    """
+    Corta el fichero tras su último salto de línea, para que lo siguiente que
+    se añada no se pegue a la línea rota. Hay que tener el bloqueo exclusivo.
+    """
+    if not linea_rota(descriptor):
+        return
+    fin = os.fstat(descriptor).st_size
+    while fin > 0:
+        inicio = max(0, fin - TAM_LECTURA)
+        os.lseek(descriptor, inicio, os.SEEK_SET)
+        salto = os.read(descriptor, fin - inicio).rfind(b"\n")
+        if salto >= 0:
+            os.ftruncate(descriptor, inicio + salto + 1)
+            return
+        fin = inicio
+    os.ftruncate(descriptor, 0)
+
+
+def huella(ruta):
+    """Identifica la versión del fichero: cada escritura atómica crea un inodo nuevo"""
+    try:
+        estado = os.stat(ruta)
+    except FileNotFoundError:
+        return None
+    return [estado.st_ino, estado.st_size, estado.st_mtime_ns]
+
+
+class ArchivoJSON:
+    """
+    Un fichero JSON que varios procesos pueden actualizar a la vez.
+    aplicar(datos, cambio) modifica los datos con un cambio; debe ser una
+    función determinista porque, con diario, se vuelve a ejecutar al leer.
+    Sin diario, cada actualizar() bloquea, lee, aplica y reescribe el fichero.
+    Con diario, actualizar() solo añade una línea a ruta + ".wal" (con el
+    bloqueo compartido, así que varios procesos escriben a la vez) y el JSON
+    se reescribe cuando el diario pasa de tam_diario bytes o con consolidar().
+    """
+
+    def __init__(self, ruta, aplicar, diario=False, tam_diario=TAM_DIARIO_MAX, inicial=None,
+                 indent=2, ensure_ascii=False):
+        self.ruta = ruta
+        self.aplicar = aplicar
+        self.diario = diario
+        self.ruta_diario = ruta + ".wal"
+        self.tam_diario = tam_diario
+        self.inicial = inicial  # Valor si el fichero aún no existe
+        self.opciones = {"indent": indent, "ensure_ascii": ensure_ascii}
+
+    def _leer(self):
+        """Lee el JSON y le aplica el diario; hay que tener el bloqueo"""
+        base = huella(self.ruta)
+        if base is None:
+            datos = json.loads(json.dumps(self.inicial))  # Copia para no modificar el valor inicial
+        else:
+            with open(self.ruta, "r", encoding="utf-8") as f:
+                datos = json.load(f)
+        try:
+            with open(self.ruta_diario, "rb") as f:
+                for linea in f:
+                    if not linea.endswith(b"\n"):
+                        break  # Escritura cortada a medias
+                    entrada = json.loads(linea)
+                    # Las entradas de antes de la última consolidación ya están en el JSON
+                    if entrada["base"] == base:
+                        self.aplicar(datos, entrada["cambio"])
+        except FileNotFoundError:
+            pass
+        return datos
+
+    def _escribir(self, datos):
+        with abrir_atomico(self.ruta) as f:
+            json.dump(datos, f, **self.opciones)
+        # Si se corta aquí, las entradas del diario llevan la huella antigua y se ignoran
+        if os.path.exists(self.ruta_diario):
+            with open(self.ruta_diario, "wb") as f:
+                os.fsync(f.fileno())
+
+    def leer(self):
+        with bloqueo(self.ruta, compartido=True):
+            return self._leer()
+
+    def actualizar(self, cambio):
+        """Aplica un cambio; sin diario devuelve lo que devuelva aplicar()"""
+        if not self.diario:
+            with bloqueo(self.ruta):
+                datos = self._leer()
+                resultado = self.aplicar(datos, cambio)
+                self._escribir(datos)
+                return resultado
+
+        while True:
+            with bloqueo(self.ruta, compartido=True):
+                # Mientras haya bloqueo compartido nadie consolida, así que la huella no cambia
+                linea = json.dumps({"base": huella(self.ruta), "cambio": cambio}, ensure_ascii=False) + "\n"
+                descriptor = os.open(self.ruta_diario, os.O_RDWR | os.O_APPEND | os.O_CREAT, 0o644)
+                try:
+                    # Tras una línea rota, la nueva quedaría pegada a ella y el diario ya no se podría leer
+                    roto = linea_rota(descriptor)
+                    if not roto:
+                        os.write(descriptor, linea.encode("utf-8"))  # Una sola escritura: las líneas no se mezclan
+                        os.fsync(descriptor)
+                        tamano = os.fstat(descriptor).st_size
+                finally:
+                    os.close(descriptor)
+            if not roto:
+                break
+            # Cortarla necesita el bloqueo exclusivo: con el compartido otro proceso podría estar añadiendo
+            self._reparar_diario()
+        if tamano >= self.tam_diario:
+            self.consolidar()
+        return None
+
+    def _reparar_diario(self):
+        with bloqueo(self.ruta):
+            descriptor = os.open(self.ruta_diario, os.O_RDWR | os.O_CREAT, 0o644)
+            try:
+                quitar_linea_rota(descriptor)
+            finally:
+                os.close(descriptor)
+
+    def consolidar(self):
+        """Reescribe el JSON con los cambios del diario y lo vacía"""
+        with bloqueo(self.ruta):
+            try:
+                if os.path.getsize(self.ruta_diario) == 0:
+                    return  # Otro proceso ya lo ha consolidado
+            except FileNotFoundError:
+                return
+            self._escribir(self._leer())
+
+
+# ─── Prueba con varios procesos ───
+
+def _sumar(datos, cambio):
+    datos[cambio["clave"]] = datos.get(cambio["clave"], 0) + cambio["cantidad"]
+
+
+def _trabajador(ruta, diario, veces, clave):
+    archivo = ArchivoJSON(ruta, _sumar, diario=diario, inicial={}, tam_diario=64 * 1024)
+    for _ in range(veces):
+        archivo.actualizar({"clave": clave, "cantidad": 1})
+
+
+if __name__ == "__main__":
+    import time
+    from concurrent.futures import ProcessPoolExecutor
+
+    procesos, veces = 4, 500
+    with tempfile.TemporaryDirectory() as carpeta:
+        for diario in (False, True):
+            ruta = os.path.join(carpeta, f"contadores_{diario}.json")
+            inicio = time.perf_counter()
+            with ProcessPoolExecutor(procesos) as ejecutor:
+                list(ejecutor.map(_trabajador, [ruta] * procesos, [diario] * procesos,
+                                  [veces] * procesos, [f"p{n % 2}" for n in range(procesos)]))
+            segundos = time.perf_counter() - inicio
+            datos = ArchivoJSON(ruta, _sumar, diario=diario, inicial={}).leer()
+            print(f"diario={diario}: {datos} (esperado {procesos * veces} en total), "
+                  f"{procesos * veces / segundos:.0f} actualizaciones/s")
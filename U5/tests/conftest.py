@@ -0,0 +1,14 @@
+"""
+Las pruebas importan los módulos como lo hacen los main.py de cada sección:
+con la carpeta U5 y la de cada sección en sys.path.
+"""
+
+import os
+import sys
+
+CARPETA_U5 = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+for carpeta in ("", "03_ficheros_csv", "04_ficheros_json", "db"):
+    ruta = os.path.join(CARPETA_U5, carpeta) if carpeta else CARPETA_U5
+    if ruta not in sys.path:
+        sys.path.insert(0, ruta)
@@ -0,0 +1,26 @@
+"""Percentiles y reparto de peticiones del pool asíncrono"""
+
+import asyncio
+
+from acceso_async import PoolAsync, ejecutar_carga, percentil
+
+
+def test_percentil_por_rango_mas_cercano():
+    valores = list(range(1, 101))
+    assert percentil(valores, 50) == 50
+    assert percentil(valores, 99) == 99
+    assert percentil(valores, 100) == 100
+    assert percentil([1, 2, 3, 4], 50) == 2
+    assert percentil([7], 99) == 7
+    assert percentil([], 50) is None
+
+
+def test_errores_inesperados_no_paran_la_carga(tmp_path):
+    async def probar():
+        async with PoolAsync.sqlite(str(tmp_path / "u5.db"), tamano=2) as pool:
+            peticiones = [("consultar", "SELECT 1")] * 5 + [("no_existe",)] * 300 + [("consultar", "SELECT x")]
+            return await asyncio.wait_for(ejecutar_carga(pool, peticiones, tam_cola=4), timeout=10)
+
+    informe = asyncio.run(probar())
+    assert informe["peticiones"] == 306
+    assert informe["errores"] == {"AttributeError": 300, "OperationalError": 1}
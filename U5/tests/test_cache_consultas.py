@@ -0,0 +1,75 @@
+"""Las escrituras invalidan los resultados guardados de las tablas que tocan"""
+
+import pytest
+
+from cache_consultas import TODAS, CacheConsultas, tablas_de
+from carga_masiva import _load_data, cargar_csv
+from repositorio import Repositorio
+
+
+@pytest.mark.parametrize("sql, tablas", [
+    ("SELECT c.nombre FROM ciudades c, paises p WHERE c.pais = p.nombre", {"ciudades", "paises"}),
+    ("SELECT * FROM ciudades AS c , `paises` AS p", {"ciudades", "paises"}),
+    ("SELECT c.nombre FROM ciudades c LEFT JOIN paises p ON p.nombre = c.pais", {"ciudades", "paises"}),
+    ("SELECT * FROM paises WHERE nombre = 'FROM notas'", {"paises"}),
+    ("SELECT * FROM (SELECT * FROM notas) n, paises", {TODAS, "notas"}),
+    ("UPDATE productos SET stock = %s WHERE id = %s", {"productos"}),
+])
+def test_tablas_de(sql, tablas):
+    assert tablas_de(sql) == tablas
+
+
+@pytest.fixture
+def repo(tmp_path):
+    with Repositorio.sqlite(str(tmp_path / "u5.db"), cache=CacheConsultas()) as repo:
+        repo.crear_tablas()
+        repo.insertar("paises", [("Francia", "Europa", 68.0)])
+        repo.insertar("ciudades", [("París", "Francia", 2.1)])
+        yield repo
+
+
+CON_COMAS = "SELECT c.nombre, p.continente FROM ciudades c, paises p WHERE c.pais = p.nombre ORDER BY c.nombre"
+
+
+def test_join_con_comas(repo):
+    assert len(repo.consultar(CON_COMAS)) == 1
+    repo.ejecutar("INSERT INTO ciudades (nombre, pais, poblacion_millones) VALUES (%s, %s, %s)",
+                  ("Lyon", "Francia", 0.5))
+    assert [fila["nombre"] for fila in repo.consultar(CON_COMAS)] == ["Lyon", "París"]
+    repo.ejecutar("UPDATE paises SET continente = %s", ("Europa occidental",))
+    assert {fila["continente"] for fila in repo.consultar(CON_COMAS)} == {"Europa occidental"}
+    assert repo.cache.metricas()["invalidadas"] == 2
+
+
+def test_tablas_desconocidas_dependen_de_todo(repo):
+    sql = "SELECT COUNT(*) AS n FROM (SELECT nombre FROM ciudades) c"
+    assert repo.consultar(sql)[0]["n"] == 1
+    repo.insertar("ciudades", [("Lyon", "Francia", 0.5)])
+    assert repo.consultar(sql)[0]["n"] == 2
+
+
+def test_carga_masiva_invalida(repo, tmp_path):
+    sql = "SELECT COUNT(*) AS n FROM ciudades"
+    assert repo.consultar(sql)[0]["n"] == 1
+    ruta = tmp_path / "ciudades.csv"
+    ruta.write_text("Ciudad,País,Población\nLyon,Francia,0.5\nNiza,Francia,0.3\n", encoding="utf-8")
+    cargar_csv(repo, str(ruta), "ciudades")
+    assert repo.consultar(sql)[0]["n"] == 3
+
+
+class _Cursor:
+    def execute(self, sql, parametros):
+        pass
+
+    def close(self):
+        pass
+
+
+def test_load_data_invalida(repo, monkeypatch):
+    sql = "SELECT COUNT(*) AS n FROM ciudades"
+    repo.consultar(sql)
+    with monkeypatch.context() as parche:
+        parche.setattr(repo.backend, "cursor", lambda: _Cursor())  # LOAD DATA solo existe en MySQL
+        _load_data(repo, "ciudades", [("Lyon", "Francia", 0.5)])
+    repo.consultar(sql)
+    assert repo.cache.metricas()["invalidadas"] == 1
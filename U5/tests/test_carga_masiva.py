@@ -0,0 +1,38 @@
+"""Una carga cortada a mitad se reanuda sin repetir ni perder filas"""
+
+import pytest
+
+from carga_masiva import CONVERSIONES, cargar_csv
+from repositorio import Repositorio
+
+
+def _notas_con_huecos(ruta, filas):
+    with open(ruta, "w", newline="", encoding="utf-8") as f:
+        f.write("Alumno/a,Primera evaluación,Segunda evaluación,Tercera evaluación\n\n")
+        for n in range(filas):
+            f.write(f"alumno {n},{n % 10},{n % 7},{n % 5}\n")
+            if n % 3 == 0:
+                f.write("\n")  # Líneas vacías que no son filas
+
+
+def test_reanudar_con_lineas_vacias(tmp_path):
+    ruta = str(tmp_path / "notas.csv")
+    _notas_con_huecos(ruta, 100)
+
+    def falla_a_mitad(fila, convertir=CONVERSIONES["notas"]):
+        if fila[0] == "alumno 57":
+            raise RuntimeError("Corte simulado")
+        return convertir(fila)
+
+    with Repositorio.sqlite(str(tmp_path / "u5.db")) as repo:
+        repo.crear_tablas()
+        repo.vaciar("notas")
+        with pytest.raises(RuntimeError):
+            cargar_csv(repo, ruta, "notas", convertir=falla_a_mitad, tam_lote=10)
+        assert repo.consultar("SELECT COUNT(*) AS n FROM notas")[0]["n"] == 50
+
+        informe = cargar_csv(repo, ruta, "notas", tam_lote=10)
+        assert (informe["filas"], informe["total"]) == (50, 100)
+        alumnos = [fila["alumno"] for fila in repo.consultar("SELECT alumno FROM notas")]
+        assert sorted(alumnos) == sorted(f"alumno {n}" for n in range(100))
+        assert cargar_csv(repo, ruta, "notas")["filas"] == 0  # Ya completada
@@ -0,0 +1,73 @@
+"""volcados()/cargas() dan lo mismo que json con cualquier motor"""
+
+import dataclasses
+import datetime
+import enum
+import json
+import math
+import uuid
+
+import pytest
+
+from codec_json import MODOS, cargas, generar_datos, volcados
+
+DATOS_NO_FINITOS = {"nan": math.nan, "lista": [1.5, math.inf, {"menos": -math.inf}], "nulo": None}
+
+
+@pytest.mark.parametrize("opciones", MODOS.values(), ids=MODOS.keys())
+def test_no_finitos_como_json(opciones):
+    texto = volcados(DATOS_NO_FINITOS, **opciones)
+    assert texto == json.dumps(DATOS_NO_FINITOS, **opciones)
+    datos = cargas(texto)
+    assert math.isnan(datos["nan"])
+    assert datos["lista"][1] == math.inf and datos["lista"][2]["menos"] == -math.inf
+    assert datos["nulo"] is None
+
+
+@pytest.mark.parametrize("opciones", MODOS.values(), ids=MODOS.keys())
+def test_mismo_texto_que_json(opciones):
+    datos = generar_datos(50)
+    datos[0]["vacio"] = None
+    assert volcados(datos, **opciones) == json.dumps(datos, **opciones)
+    assert cargas(volcados(datos, **opciones)) == datos
+
+
+class _Texto(str):
+    pass
+
+
+class _Numero(int):
+    pass
+
+
+class _Color(enum.Enum):
+    ROJO = "rojo"
+
+
+@dataclasses.dataclass
+class _Punto:
+    x: int
+    y: int
+
+
+def _resultado(datos, motor, opciones):
+    try:
+        return volcados(datos, motor=motor, **opciones)
+    except TypeError as e:
+        return TypeError, str(e)
+
+
+@pytest.mark.parametrize("valor", [
+    datetime.datetime(2024, 5, 1, 12, 30), datetime.date(2024, 5, 1), uuid.UUID(int=7), _Punto(1, 2),
+    _Texto("hola"), _Numero(3), _Color.ROJO, {1: "clave int"}, 2 ** 70,
+], ids=lambda valor: type(valor).__name__)
+@pytest.mark.parametrize("opciones", MODOS.values(), ids=MODOS.keys())
+def test_tipos_no_json_igual_con_los_dos_motores(valor, opciones):
+    datos = [{"valor": valor}]
+    assert _resultado(datos, None, opciones) == _resultado(datos, "json", opciones)
+
+
+@pytest.mark.parametrize("opciones", MODOS.values(), ids=MODOS.keys())
+def test_floats_con_exponente(opciones):
+    datos = {"pequeno": 1e-7, "grande": 1e16, "normal": 0.1}
+    assert cargas(volcados(datos, **opciones)) == cargas(volcados(datos, motor="json", **opciones)) == datos
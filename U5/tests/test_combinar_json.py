@@ -0,0 +1,17 @@
+"""combinar_json: la salida puede ser una de las entradas"""
+
+import json
+
+from combinar_json import combinar_json
+
+
+def test_salida_igual_a_una_entrada(tmp_path):
+    a, b = str(tmp_path / "a.json"), str(tmp_path / "b.json")
+    with open(a, "w", encoding="utf-8") as f:
+        json.dump([{"id": 1}, {"id": 2}], f)
+    with open(b, "w", encoding="utf-8") as f:
+        json.dump([{"id": 2}, {"id": 3}], f)
+    informe = combinar_json([a, b], a, clave="id")
+    assert informe == {"ficheros": 2, "escritos": 3, "duplicados": 1}
+    with open(a, encoding="utf-8") as f:
+        assert json.load(f) == [{"id": 1}, {"id": 2}, {"id": 3}]
@@ -0,0 +1,102 @@
+"""Varios procesos actualizando el mismo JSON: no se pierde ningún cambio"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from almacen_catalogo import AlmacenCatalogo
+from codec_json import cargar, volcar
+from escritura_atomica import ArchivoJSON, _sumar, _trabajador
+
+PROCESOS, VECES = 4, 100
+
+
+def _contar(ruta, diario):
+    with ProcessPoolExecutor(PROCESOS) as ejecutor:
+        list(ejecutor.map(_trabajador, [ruta] * PROCESOS, [diario] * PROCESOS,
+                          [VECES] * PROCESOS, [f"p{n % 2}" for n in range(PROCESOS)]))
+    return ArchivoJSON(ruta, _sumar, diario=diario, inicial={}).leer()
+
+
+def test_archivo_json_sin_diario(tmp_path):
+    datos = _contar(str(tmp_path / "contadores.json"), diario=False)
+    assert datos == {"p0": PROCESOS * VECES // 2, "p1": PROCESOS * VECES // 2}
+
+
+def test_archivo_json_con_diario(tmp_path):
+    datos = _contar(str(tmp_path / "contadores.json"), diario=True)
+    assert datos == {"p0": PROCESOS * VECES // 2, "p1": PROCESOS * VECES // 2}
+
+
+def _catalogo(tmp_path):
+    ruta = str(tmp_path / "catalogo.json")
+    productos = [{"id": f"P{n:03}", "nombre": f"Producto {n}", "stock": 0, "disponible": False}
+                 for n in range(1, 4)]
+    with open(ruta, "w", encoding="utf-8") as f:
+        volcar({"tienda": "Prueba", "productos": productos}, f)
+    return ruta
+
+
+def _stock(ruta):
+    with open(ruta, "r", encoding="utf-8") as f:
+        return {producto["id"]: producto["stock"] for producto in cargar(f)["productos"]}
+
+
+def test_dos_almacenes_sobre_el_mismo_catalogo(tmp_path):
+    ruta = _catalogo(tmp_path)
+    a = AlmacenCatalogo(ruta)
+    b = AlmacenCatalogo(ruta)
+    a.actualizar_stock("P001", 50)
+    b.actualizar_stock("P002", 70)
+    assert b.obtener("P001")["stock"] == 50
+    a.cerrar()  # Instantánea de a: debe incluir el cambio de b
+    b.cerrar()
+    assert _stock(ruta) == {"P001": 50, "P002": 70, "P003": 0}
+
+
+def test_instantanea_de_otro_proceso(tmp_path):
+    ruta = _catalogo(tmp_path)
+    a = AlmacenCatalogo(ruta, cada=1)  # Instantánea en cada operación
+    b = AlmacenCatalogo(ruta)
+    b.actualizar_stock("P002", 70)
+    a.actualizar_stock("P001", 50)
+    b.actualizar_stock("P003", 5)
+    b.cerrar()
+    a.cerrar()
+    assert _stock(ruta) == {"P001": 50, "P002": 70, "P003": 5}
+    assert os.path.getsize(ruta[:-len(".json")] + ".diario.jsonl") == 0
+
+
+def _actualizar_muchos(ruta, producto_id, veces):
+    with AlmacenCatalogo(ruta, cada=7) as catalogo:
+        for n in range(1, veces + 1):
+            catalogo.actualizar_stock(producto_id, n)
+
+
+def test_almacenes_en_varios_procesos(tmp_path):
+    ruta = _catalogo(tmp_path)
+    ids = ["P001", "P002", "P003"]
+    with ProcessPoolExecutor(len(ids)) as ejecutor:
+        list(ejecutor.map(_actualizar_muchos, [ruta] * len(ids), ids, [40] * len(ids)))
+    assert _stock(ruta) == {"P001": 40, "P002": 40, "P003": 40}
+
+
+def test_actualizar_en_transaccion_devuelve_el_producto_cambiado(tmp_path):
+    ruta = _catalogo(tmp_path)
+    with AlmacenCatalogo(ruta) as catalogo:
+        with catalogo.transaccion():
+            catalogo.actualizar("P001", nombre="Teclado")
+            producto = catalogo.actualizar_stock("P001", 3)
+            assert producto == {"id": "P001", "nombre": "Teclado", "stock": 3, "disponible": True}
+            assert catalogo.obtener("P001")["stock"] == 0  # Aún no se ha guardado
+        assert catalogo.obtener("P001") == producto
+
+
+def test_diario_con_linea_rota(tmp_path):
+    ruta = str(tmp_path / "contadores.json")
+    archivo = ArchivoJSON(ruta, _sumar, diario=True, inicial={})
+    archivo.actualizar({"clave": "a", "cantidad": 1})
+    with open(archivo.ruta_diario, "ab") as f:
+        f.write(b'{"base": null, "cambio": {"clave"')  # Escritura cortada a medias
+    archivo.actualizar({"clave": "a", "cantidad": 1})
+    archivo.actualizar({"clave": "b", "cantidad": 1})
+    assert archivo.leer() == {"a": 2, "b": 1}
@@ -0,0 +1,23 @@
+"""conversor_csv_json: tipos de columna coherentes aunque la muestra no sea representativa"""
+
+import json
+
+import conversor_csv_json
+from conversor_csv_json import csv_a_json, inferir_tipo
+
+
+def test_ceros_a_la_izquierda_son_texto():
+    assert inferir_tipo(["007", "12"]) == "str"
+    assert inferir_tipo(["00.5", "1.5"]) == "str"
+    assert inferir_tipo(["0", "0.5", "-.5", "1e3"]) == "float"
+
+
+def test_columna_que_no_encaja_fuera_de_la_muestra(tmp_path, monkeypatch):
+    monkeypatch.setattr(conversor_csv_json, "MUESTRA", 2)
+    entrada, salida = str(tmp_path / "datos.csv"), str(tmp_path / "datos.json")
+    with open(entrada, "w", encoding="utf-8") as f:
+        f.write("codigo,cantidad\n1,2\n2,3\n007,4\n1_000,5\n")
+    informe = csv_a_json(entrada, salida, procesos=1)
+    assert informe["tipos"] == {"codigo": "str", "cantidad": "int"}
+    with open(salida, encoding="utf-8") as f:
+        assert [fila["codigo"] for fila in json.load(f)] == ["1", "2", "007", "1_000"]
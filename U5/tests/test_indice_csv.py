@@ -0,0 +1,88 @@
+"""El índice detecta cuándo el CSV ya no es el que indexó"""
+
+import io
+import os
+
+import indice_csv
+from indice_csv import IndiceCSV
+
+
+def _escribir(ruta, filas):
+    with open(ruta, "w", newline="", encoding="utf-8") as f:
+        f.write("Ciudad,País\n")
+        f.writelines(f"{ciudad},{pais}\n" for ciudad, pais in filas)
+
+
+def _ciudades(n):
+    return [(f"Ciudad{i:05}", f"País{i % 7}") for i in range(n)]
+
+
+def test_cambio_al_principio_del_csv(tmp_path):
+    ruta = str(tmp_path / "ciudades.csv")
+    filas = _ciudades(2000)  # Bastante más de 4 KB: el cambio queda lejos del final
+    _escribir(ruta, filas)
+    IndiceCSV(ruta, "Ciudad").construir()
+
+    filas[1] = ("Otras_00001", "País1")  # Mismo tamaño, distinto contenido
+    _escribir(ruta, filas)
+    indice = IndiceCSV(ruta, "Ciudad").abrir()
+    assert indice.buscar("Ciudad00001") == []
+    assert indice.buscar("Otras_00001") == [{"Ciudad": "Otras_00001", "País": "País1"}]
+
+
+def test_filas_anadidas_sin_reconstruir(tmp_path):
+    ruta = str(tmp_path / "ciudades.csv")
+    _escribir(ruta, _ciudades(10))
+    IndiceCSV(ruta, "Ciudad").construir()
+    with open(ruta, "a", newline="", encoding="utf-8") as f:
+        f.write("Nueva,País0\n")
+
+    indice = IndiceCSV(ruta, "Ciudad").abrir()
+    assert indice.meta["entradas"] == 10  # El índice en disco es el de antes
+    assert indice.buscar("Nueva") == [{"Ciudad": "Nueva", "País": "País0"}]
+    assert indice.buscar("Ciudad00003") == [{"Ciudad": "Ciudad00003", "País": "País3"}]
+
+
+def test_indice_que_no_cuadra_con_sus_datos(tmp_path):
+    ruta = str(tmp_path / "ciudades.csv")
+    _escribir(ruta, _ciudades(10))
+    indice = IndiceCSV(ruta, "Ciudad")
+    indice.construir()
+    with open(indice.ruta_indice, "ab") as f:
+        f.write(b'["Ciudad99999", 0]\n')
+
+    indice = IndiceCSV(ruta, "Ciudad").abrir()
+    assert os.path.getsize(indice.ruta_indice) == indice.meta["tamano_indice"]
+    assert indice.buscar("Ciudad00004") == [{"Ciudad": "Ciudad00004", "País": "País4"}]
+
+
+class _Lecturas(io.BytesIO):
+    """BytesIO que cuenta los bytes leídos"""
+
+    leidos = 0
+
+    def read(self, tam=-1):
+        datos = super().read(tam)
+        self.leidos += len(datos)
+        return datos
+
+
+def test_abrir_tras_anadir_no_relee_todo(tmp_path, monkeypatch):
+    monkeypatch.setattr(indice_csv, "TAM_MUESTRA", 1024)
+    ruta = str(tmp_path / "ciudades.csv")
+    filas = _ciudades(5000)  # Unos 100 KB: bastantes más bytes que los bloques sumados
+    _escribir(ruta, filas)
+    IndiceCSV(ruta, "Ciudad").construir()
+    with open(ruta, "rb") as f:
+        archivo = _Lecturas(f.read())
+    indice_csv._huella(archivo, len(archivo.getvalue()))
+    assert archivo.leidos <= indice_csv.MUESTRAS * 1024
+
+    filas[-1] = ("Otras_04999", "País1")  # El último bloque indexado siempre se comprueba
+    _escribir(ruta, filas)
+    with open(ruta, "a", newline="", encoding="utf-8") as f:
+        f.write("Nueva,País0\n")
+    indice = IndiceCSV(ruta, "Ciudad").abrir()
+    assert indice.buscar("Ciudad04999") == []
+    assert indice.buscar("Otras_04999") == [{"Ciudad": "Otras_04999", "País": "País1"}]
+    assert indice.buscar("Nueva") == [{"Ciudad": "Nueva", "País": "País0"}]
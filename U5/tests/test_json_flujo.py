@@ -0,0 +1,39 @@
+"""leer_array_json lee por trozos acotados por el elemento más grande, no por el fichero"""
+
+import io
+import json
+
+from json_flujo import TAM_TROZO, EscritorArrayJSON, leer_array_json
+
+
+class _Lecturas(io.StringIO):
+    """StringIO que recuerda la lectura más grande que se le ha pedido"""
+
+    maxima = 0
+
+    def read(self, tam=-1):
+        self.maxima = max(self.maxima, tam)
+        return super().read(tam)
+
+
+def test_lecturas_acotadas_en_un_array_grande():
+    elementos = [{"id": n, "nombre": f"elemento {n}", "valores": list(range(n % 50))} for n in range(60000)]
+    texto = io.StringIO()
+    with EscritorArrayJSON(texto, indent=2) as escritor:
+        escritor.escribir_todos(elementos)
+    archivo = _Lecturas(texto.getvalue())
+    assert len(texto.getvalue()) > 200 * TAM_TROZO
+
+    leidos = 0
+    for leido, esperado in zip(leer_array_json(archivo), elementos):
+        assert leido == esperado
+        leidos += 1
+    assert leidos == len(elementos)
+    assert archivo.maxima <= 2 * TAM_TROZO
+
+
+def test_elemento_mayor_que_el_trozo():
+    grande = {"texto": "x" * 100000}
+    archivo = _Lecturas(json.dumps([1, grande, 2.5e3, grande]))
+    assert list(leer_array_json(archivo, tam_trozo=1024)) == [1, grande, 2.5e3, grande]
+    assert archivo.maxima <= 256 * 1024  # Crece con el elemento grande, no con el fichero
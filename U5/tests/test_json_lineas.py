@@ -0,0 +1,56 @@
+"""Escrituras cortadas a medias y varios procesos añadiendo al mismo .jsonl"""
+
+from concurrent.futures import ProcessPoolExecutor
+
+from json_lineas import FSYNC_NUNCA, AlmacenJSONL
+
+
+def test_linea_rota_al_final(tmp_path):
+    ruta = str(tmp_path / "datos.jsonl")
+    with open(ruta, "wb") as f:
+        f.write(b'{"n":1}\n{"n":2}\n{"n":3, "nom')  # El proceso se cortó a mitad de línea
+
+    with AlmacenJSONL(ruta) as almacen:
+        assert list(almacen.leer()) == [{"n": 1}, {"n": 2}]
+        almacen.anadir({"n": 4})
+        assert list(almacen.leer()) == [{"n": 1}, {"n": 2}, {"n": 4}]
+    with open(ruta, "rb") as f:
+        assert f.read() == b'{"n":1}\n{"n":2}\n{"n":4}\n'
+
+
+def test_linea_rota_sin_ninguna_completa(tmp_path):
+    ruta = str(tmp_path / "datos.jsonl")
+    with open(ruta, "wb") as f:
+        f.write(b'{"n":')
+    with AlmacenJSONL(ruta) as almacen:
+        almacen.anadir_lote([{"n": 1}, {"n": 2}])
+        assert list(almacen.leer()) == [{"n": 1}, {"n": 2}]
+
+
+def test_linea_rota_de_otro_proceso(tmp_path):
+    ruta = str(tmp_path / "datos.jsonl")
+    with AlmacenJSONL(ruta) as almacen:
+        almacen.anadir({"n": 1})
+        with open(ruta, "ab") as f:
+            f.write(b'{"n":')  # Otro proceso se corta con este descriptor ya abierto
+        almacen.anadir({"n": 2})
+        assert list(almacen.leer()) == [{"n": 1}, {"n": 2}]
+
+
+def _anadir(ruta, proceso, veces):
+    with AlmacenJSONL(ruta, fsync=FSYNC_NUNCA) as almacen:
+        for n in range(veces):
+            almacen.anadir_lote([{"proceso": proceso, "n": n, "relleno": "x" * 100}] * 3)
+
+
+def test_varios_procesos_y_compactar(tmp_path):
+    ruta = str(tmp_path / "datos.jsonl")
+    procesos, veces = 4, 200
+    with ProcessPoolExecutor(procesos) as ejecutor:
+        futuros = [ejecutor.submit(_anadir, ruta, p, veces) for p in range(procesos)]
+        AlmacenJSONL(ruta).compactar()  # Mientras los demás siguen añadiendo
+        for futuro in futuros:
+            futuro.result()
+    registros = list(AlmacenJSONL(ruta).leer())
+    assert len(registros) == procesos * veces * 3
+    assert AlmacenJSONL(ruta).compactar(clave="proceso") == procesos